@@ -0,0 +1,108 @@
+// First-load JavaScript per route, checked against bundle-budgets.json.
+//
+// Runs after `next build` (postbuild). Reads the client reference manifests
+// Next writes for each app route, adds the shared root chunks, and reports the
+// gzipped size of everything a route loads before it is interactive. Chunks
+// behind dynamic import() are not counted; that is what the budgets reward.
+//
+//   node scripts/bundle-report.mjs           print the report
+//   node scripts/bundle-report.mjs --check   also exit 1 if a route is over budget
+
+import { existsSync, readFileSync, readdirSync, writeFileSync } from 'fs';
+import { join } from 'path';
+import { gzipSync } from 'zlib';
+import vm from 'vm';
+
+const root = process.cwd();
+const nextDir = join(root, '.next');
+const check = process.argv.includes('--check');
+
+if (!existsSync(nextDir)) {
+    console.error('[bundle-report] No .next directory; run `next build` first.');
+    process.exit(1);
+}
+
+const budgets = JSON.parse(readFileSync(join(root, 'bundle-budgets.json'), 'utf-8'));
+
+const readJson = (path) => (existsSync(path) ? JSON.parse(readFileSync(path, 'utf-8')) : null);
+
+const findManifests = (dir) =>
+    readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+        const path = join(dir, entry.name);
+        if (entry.isDirectory()) return findManifests(path);
+        return entry.name === 'page_client-reference-manifest.js' ? [path] : [];
+    });
+
+// "/latex/page" and route groups like "/(auth)/login/page" -> "/latex", "/login"
+const toRoute = (page) =>
+    page.replace(/\/page$/, '').replace(/\/\([^)]*\)/g, '') || '/';
+
+// Chunks shared by every route
+const buildManifest = readJson(join(nextDir, 'build-manifest.json')) ?? {};
+const sharedFiles = [...(buildManifest.polyfillFiles ?? []), ...(buildManifest.rootMainFiles ?? [])];
+
+// Route -> its own chunks, from the client reference manifests
+const routeFiles = new Map();
+const appDir = join(nextDir, 'server', 'app');
+for (const path of existsSync(appDir) ? findManifests(appDir) : []) {
+    const sandbox = {};
+    sandbox.globalThis = sandbox;
+    vm.runInNewContext(readFileSync(path, 'utf-8'), sandbox);
+    for (const [page, manifest] of Object.entries(sandbox.__RSC_MANIFEST ?? {})) {
+        const files = Object.values(manifest.entryJSFiles ?? {}).flat();
+        routeFiles.set(toRoute(page), files);
+    }
+}
+
+// Older builds: app-build-manifest.json lists the chunks per page directly
+const appBuildManifest = readJson(join(nextDir, 'app-build-manifest.json'));
+for (const [page, files] of Object.entries(appBuildManifest?.pages ?? {})) {
+    if (!page.endsWith('/page')) continue;
+    const route = toRoute(page);
+    routeFiles.set(route, [...new Set([...(routeFiles.get(route) ?? []), ...files])]);
+}
+
+if (routeFiles.size === 0) {
+    console.error('[bundle-report] No route manifests found under .next; is this an app router build?');
+    process.exit(1);
+}
+
+const sizeCache = new Map();
+const sizeOf = (file) => {
+    if (!sizeCache.has(file)) {
+        const path = join(nextDir, file);
+        const contents = existsSync(path) ? readFileSync(path) : Buffer.alloc(0);
+        sizeCache.set(file, { raw: contents.length, gzip: contents.length ? gzipSync(contents).length : 0 });
+    }
+    return sizeCache.get(file);
+};
+
+const kb = (bytes) => (bytes / 1024).toFixed(1);
+
+const rows = [...routeFiles.entries()]
+    .sort(([a], [b]) => a.localeCompare(b))
+    .map(([route, files]) => {
+        const all = [...new Set([...sharedFiles, ...files])].filter((file) => file.endsWith('.js'));
+        const raw = all.reduce((sum, file) => sum + sizeOf(file).raw, 0);
+        const gzip = all.reduce((sum, file) => sum + sizeOf(file).gzip, 0);
+        const budget = budgets.routes?.[route] ?? budgets.default;
+        return { route, chunks: all.length, raw, gzip, budget, over: gzip / 1024 > budget };
+    });
+
+const width = Math.max(...rows.map((row) => row.route.length), 5);
+console.log('\nFirst-load JS per route (gzip KB; budgets from bundle-budgets.json)\n');
+console.log(`${'Route'.padEnd(width)}  ${'Chunks'.padStart(6)}  ${'Raw KB'.padStart(8)}  ${'Gzip KB'.padStart(8)}  ${'Budget'.padStart(7)}`);
+for (const row of rows) {
+    const flag = row.over ? '  OVER' : '';
+    console.log(
+        `${row.route.padEnd(width)}  ${String(row.chunks).padStart(6)}  ${kb(row.raw).padStart(8)}  ${kb(row.gzip).padStart(8)}  ${String(row.budget).padStart(7)}${flag}`,
+    );
+}
+
+writeFileSync(join(nextDir, 'bundle-report.json'), JSON.stringify({ sharedFiles, routes: rows }, null, 2));
+
+const over = rows.filter((row) => row.over);
+if (over.length > 0) {
+    console.warn(`\n[bundle-report] ${over.length} route(s) over budget: ${over.map((row) => row.route).join(', ')}`);
+    if (check) process.exit(1);
+}
@@ -1,23 +1,57 @@
 import { groq } from '@ai-sdk/groq';
 import { streamText } from 'ai';
-import { buildSystemPrompt } from '@/lib/ai/contextBuilder';
+import { buildContextPrompt, getPolicyPrompt } from '@/lib/ai/contextBuilder';
+import { parseDocumentContext } from '@/lib/ai/documentContext';
+import { reportChatMetrics } from '@/lib/ai/chatMetrics';
 
 // Allow streaming responses up to 30 seconds
 export const maxDuration = 30;
 
 export async function POST(req: Request) {
-    const { messages, userProfile, currentContext } = await req.json();
+    const startedAt = performance.now();
+    const { messages, userProfile, currentContext = {} } = await req.json();
 
-    // Build the dynamic system prompt based on context
-    const systemPrompt = buildSystemPrompt(userProfile, currentContext);
+    let document;
+    if (currentContext.document !== undefined) {
+        document = parseDocumentContext(currentContext.document);
+        if (!document) return Response.json({ error: 'Invalid document context' }, { status: 400 });
+    }
 
+    // Static policy first (memoized, identical across requests), then the document context
+    const policy = getPolicyPrompt(userProfile, currentContext.docType);
+    const context = buildContextPrompt({ ...currentContext, document });
+    const promptBuildMs = performance.now() - startedAt;
+
+    let firstTokenAt: number | undefined;
     const result = streamText({
         model: groq('moonshotai/kimi-k2-instruct-0905'), // Updated as per user request
-        system: systemPrompt,
+        system: `${policy.prompt}${context}`,
         messages,
         temperature: 0.7,
         maxTokens: 1024,
+        onChunk: ({ chunk }) => {
+            if (firstTokenAt === undefined && chunk.type === 'text-delta') firstTokenAt = performance.now();
+        },
+        onFinish: ({ usage, finishReason }) => {
+            const finishedAt = performance.now();
+            const streamingSeconds = firstTokenAt === undefined ? 0 : (finishedAt - firstTokenAt) / 1000;
+            reportChatMetrics({
+                docType: currentContext.docType,
+                promptBuildMs,
+                policyCached: policy.cached,
+                policyChars: policy.prompt.length,
+                contextChars: context.length,
+                timeToFirstTokenMs: firstTokenAt === undefined ? undefined : firstTokenAt - startedAt,
+                totalMs: finishedAt - startedAt,
+                promptTokens: usage.promptTokens,
+                completionTokens: usage.completionTokens,
+                tokensPerSecond: streamingSeconds > 0 ? usage.completionTokens / streamingSeconds : undefined,
+                finishReason,
+            });
+        },
     });
 
-    return result.toDataStreamResponse();
+    return result.toDataStreamResponse({
+        headers: { 'Server-Timing': `prompt;dur=${promptBuildMs.toFixed(1)}` },
+    });
 }
@@ -5,7 +5,7 @@ import { Header } from '@/components/layout/Header';
 import { LayoutWrapper } from '@/components/layout/LayoutWrapper';
 import { ResizableSplitPane } from '@/components/ui/ResizableSplitPane';
 import { MonacoEditorWrapper } from '@/components/ui/MonacoEditorWrapper';
-import { LatexRenderer } from '@/components/latex/LatexRenderer';
+import { LatexRenderer, type LatexRendererHandle } from '@/components/latex/LatexRenderer';
 import { SymbolPalette } from '@/components/latex/SymbolPalette';
 import { useDocumentStore } from '@/store/useDocumentStore';
 import { useLanguageStore } from '@/store/useLanguageStore';
@@ -16,6 +16,8 @@ import { MobileSidebar } from '@/components/layout/MobileSidebar';
 
 export default function LatexPage() {
   const editorRef = useRef<Parameters<OnMount>[0] | null>(null);
+  const previewRef = useRef<LatexRendererHandle>(null);
+  const scrollFrame = useRef(0);
   const [mounted, setMounted] = React.useState(false);
   const [mobileMenuOpen, setMobileMenuOpen] = React.useState(false);
 
@@ -64,6 +66,16 @@ export default function LatexPage() {
 
   const handleEditorDidMount: OnMount = (editor) => {
     editorRef.current = editor;
+
+    // Keep the preview at the part of the document the editor shows
+    editor.onDidScrollChange((event) => {
+      if (!event.scrollTopChanged) return;
+      cancelAnimationFrame(scrollFrame.current);
+      scrollFrame.current = requestAnimationFrame(() => {
+        const topLine = editor.getVisibleRanges()[0]?.startLineNumber;
+        if (topLine) previewRef.current?.scrollToLine(topLine - 1);
+      });
+    });
   };
 
   const handleSymbolInsert = (symbol: string) => {
@@ -128,6 +140,7 @@ export default function LatexPage() {
                       onChange={handleEditorChange}
                       onMount={handleEditorDidMount}
                       options={{
+                        readOnly: activeDocument?.isContentLoaded === false, // Until the content has loaded
                         minimap: { enabled: false },
                         wordWrap: 'on',
                         lineHeight: 1.7,
@@ -143,7 +156,7 @@ export default function LatexPage() {
                   </div>
                 </div>
               }
-              right={<LatexRenderer content={latex} />}
+              right={<LatexRenderer ref={previewRef} content={latex} />}
             />
           </div>
         </div>
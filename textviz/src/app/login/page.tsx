@@ -213,6 +213,7 @@ export default function LoginPage() {
                                     <Mail className="absolute left-3 top-2.5 h-4 w-4 text-neutral-400" />
                                     <input
                                         type="email"
+                                        data-testid="login-email"
                                         value={email}
                                         onChange={(e) => setEmail(e.target.value)}
                                         className="w-full rounded-lg border border-neutral-200 bg-white py-2 pl-9 pr-3 text-sm outline-none focus:border-blue-500 focus:ring-1 focus:ring-blue-500 dark:border-neutral-700 dark:bg-neutral-900 dark:text-white"
@@ -228,6 +229,7 @@ export default function LoginPage() {
                                     <Lock className="absolute left-3 top-2.5 h-4 w-4 text-neutral-400" />
                                     <input
                                         type="password"
+                                        data-testid="login-password"
                                         value={password}
                                         onChange={(e) => setPassword(e.target.value)}
                                         className="w-full rounded-lg border border-neutral-200 bg-white py-2 pl-9 pr-3 text-sm outline-none focus:border-blue-500 focus:ring-1 focus:ring-blue-500 dark:border-neutral-700 dark:bg-neutral-900 dark:text-white"
@@ -258,6 +260,7 @@ export default function LoginPage() {
 
                             <Button
                                 type="submit"
+                                data-testid="login-submit"
                                 className="w-full bg-blue-500 hover:bg-blue-600 text-white"
                                 disabled={isLoading}
                             >
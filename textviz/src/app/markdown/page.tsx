@@ -89,7 +89,12 @@ export default function MarkdownPage() {
 
           {/* Milkdown Editor */}
           <div className="flex-1 overflow-hidden">
-            {activeDocument ? (
+            {activeDocument?.isContentLoaded === false ? (
+              // Milkdown reads its content once on mount, so wait for it
+              <div className="flex h-full items-center justify-center text-neutral-400">
+                Loading...
+              </div>
+            ) : activeDocument ? (
               <MathErrorBoundary>
                 <MilkdownEditor
                   key={activeDocument.id} // Re-mount on doc change to reset editor state
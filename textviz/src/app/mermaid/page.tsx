@@ -1,11 +1,11 @@
 "use client";
 
 import React, { useRef } from 'react';
+import dynamic from 'next/dynamic';
 import { Header } from '@/components/layout/Header';
 import { LayoutWrapper } from '@/components/layout/LayoutWrapper';
 import { ResizableSplitPane } from '@/components/ui/ResizableSplitPane';
 import { MonacoEditorWrapper } from '@/components/ui/MonacoEditorWrapper';
-import { MermaidRenderer } from '@/components/mermaid/MermaidRenderer';
 import { useDocumentStore } from '@/store/useDocumentStore';
 import { useLanguageStore } from '@/store/useLanguageStore';
 import { OnMount } from '@monaco-editor/react';
@@ -13,6 +13,12 @@ import { DocumentSidebar } from '@/components/layout/DocumentSidebar';
 import { EditorHeader } from '@/components/layout/EditorHeader';
 import { MobileSidebar } from '@/components/layout/MobileSidebar';
 
+// Keeps the preview (and Mermaid, loaded by its render service) out of the route's first load
+const MermaidRenderer = dynamic(
+  () => import('@/components/mermaid/MermaidRenderer').then((mod) => mod.MermaidRenderer),
+  { ssr: false }
+);
+
 export default function MermaidPage() {
   const editorRef = useRef<Parameters<OnMount>[0] | null>(null);
   const [mobileMenuOpen, setMobileMenuOpen] = React.useState(false);
@@ -114,6 +120,7 @@ export default function MermaidPage() {
                     onChange={handleEditorChange}
                     onMount={handleEditorDidMount}
                     options={{
+                      readOnly: activeDocument?.isContentLoaded === false, // Until the content has loaded
                       minimap: { enabled: false },
                       wordWrap: 'on',
                       lineHeight: 1.7,
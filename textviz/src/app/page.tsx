@@ -32,7 +32,7 @@ export default function Home() {
             </p>
             <div className="animate-in fade-in slide-in-from-bottom-4 duration-700 delay-300">
               <Link href="/markdown">
-                <button className="rounded-full bg-blue-600 px-8 py-4 text-sm font-semibold text-white shadow-lg transition-all hover:bg-blue-700 hover:scale-105 active:scale-95 hover:shadow-blue-500/25">
+                <button data-testid="home-get-started" className="rounded-full bg-blue-600 px-8 py-4 text-sm font-semibold text-white shadow-lg transition-all hover:bg-blue-700 hover:scale-105 active:scale-95 hover:shadow-blue-500/25">
                   {t.home.getStarted}
                 </button>
               </Link>
@@ -158,7 +158,7 @@ export default function Home() {
           <div className="container mx-auto px-4 max-w-4xl text-center">
             <h2 className="text-3xl font-bold mb-8 text-neutral-900 dark:text-neutral-100">Run your ideas.</h2>
             <Link href="/markdown">
-              <button className="rounded-full bg-neutral-900 dark:bg-white px-8 py-4 text-sm font-semibold text-white dark:text-neutral-900 shadow-lg transition-all hover:scale-105 active:scale-95">
+              <button data-testid="home-get-started-bottom" className="rounded-full bg-neutral-900 dark:bg-white px-8 py-4 text-sm font-semibold text-white dark:text-neutral-900 shadow-lg transition-all hover:scale-105 active:scale-95">
                 {t.home.getStarted}
               </button>
             </Link>
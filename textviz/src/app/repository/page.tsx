@@ -1,10 +1,11 @@
 "use client";
 
-import React, { useEffect, useState } from 'react';
+import React, { useEffect, useMemo, useState } from 'react';
 import Link from 'next/link';
 import { useRouter } from 'next/navigation';
 import { useDocumentStore, Document } from '@/store/useDocumentStore';
 import { useLanguageStore } from '@/store/useLanguageStore';
+import { useAppStore } from '@/store/useAppStore';
 import { Header } from '@/components/layout/Header';
 import {
     FileText,
@@ -15,20 +16,29 @@ import {
     Trash2,
     Clock,
     File,
-    Filter
+    Filter,
+    Download
 } from 'lucide-react';
 import { cn } from '@/lib/utils';
+import { documentPreview } from '@/lib/documents/preview';
+import type { SearchHit } from '@/lib/search/searchIndex';
 import { ConfirmDialog } from '@/components/ui/ConfirmDialog';
 
+// Coalesces fast typing; the search itself takes a few milliseconds.
+const SEARCH_DEBOUNCE_MS = 120;
+
 export default function RepositoryPage() {
     const router = useRouter();
     const [mounted, setMounted] = useState(false);
     const [searchQuery, setSearchQuery] = useState("");
     const [typeFilter, setTypeFilter] = useState<'all' | 'markdown' | 'latex' | 'mermaid' | 'json-builder'>('all');
     const [deleteId, setDeleteId] = useState<string | null>(null);
+    const [hits, setHits] = useState<SearchHit[] | null>(null);
+    const [exportProgress, setExportProgress] = useState<{ done: number; total: number } | null>(null);
 
-    const { documents, fetchDocuments, deleteDocument, setActiveDocument } = useDocumentStore();
+    const { documents, fetchDocuments, fetchMoreDocuments, hasMore, deleteDocument, setActiveDocument, searchDocuments, readDocumentContent } = useDocumentStore();
     const { t } = useLanguageStore();
+    const exportScale = useAppStore(state => state.exportScale);
 
     useEffect(() => {
         setMounted(true);
@@ -43,12 +53,34 @@ export default function RepositoryPage() {
         'json-builder': { icon: Braces, color: "text-orange-500", bg: "bg-orange-50 dark:bg-orange-900/20", label: t.nav.jsonBuilder },
     };
 
-    const filteredDocuments = documents.filter(doc => {
-        const matchesSearch = doc.title.toLowerCase().includes(searchQuery.toLowerCase()) ||
-            doc.content.toLowerCase().includes(searchQuery.toLowerCase());
-        const matchesType = typeFilter === 'all' || doc.type === typeFilter;
-        return matchesSearch && matchesType;
-    });
+    // Search runs in the document store (Web Worker index locally, Postgres full-text search remotely)
+    useEffect(() => {
+        const query = searchQuery.trim();
+        if (!query) {
+            setHits(null);
+            return;
+        }
+        let cancelled = false;
+        const timer = setTimeout(async () => {
+            const results = await searchDocuments(query);
+            if (!cancelled) setHits(results);
+        }, SEARCH_DEBOUNCE_MS);
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
+    }, [searchQuery, searchDocuments]);
+
+    const snippets = useMemo(() => new Map((hits ?? []).map(hit => [hit.id, hit.snippet])), [hits]);
+
+    const filteredDocuments = useMemo(() => {
+        const byId = new Map(documents.map(doc => [doc.id, doc]));
+        // Hits are already ranked; without a query, keep the most-recent-first listing
+        const matching = hits
+            ? hits.map(hit => byId.get(hit.id)).filter((doc): doc is Document => !!doc)
+            : documents;
+        return matching.filter(doc => typeFilter === 'all' || doc.type === typeFilter);
+    }, [documents, hits, typeFilter]);
 
     const handleCardClick = (doc: Document) => {
         setActiveDocument(doc.id);
@@ -67,6 +99,36 @@ export default function RepositoryPage() {
         }
     };
 
+    // Every document of the type, not just the listed pages, as one ZIP of PNGs
+    const exportAll = async (type: 'markdown' | 'latex' | 'mermaid') => {
+        setExportProgress({ done: 0, total: 0 });
+        try {
+            const store = useDocumentStore.getState;
+            let listed = -1;
+            while (store().hasMore[type] && store().documents.length !== listed) {
+                listed = store().documents.length;
+                await fetchMoreDocuments(type);
+            }
+            const [{ exportDocumentsZip }, { downloadBlob }, { collectDocuments }] = await Promise.all([
+                import('@/lib/export/batchExport'),
+                import('@/lib/export/exportImage'),
+                import('@/lib/export/collectDocuments'),
+            ]);
+            const { docs, failed: unreadable } = await collectDocuments(
+                store().getDocumentsByType(type),
+                doc => readDocumentContent(doc.id),
+            );
+            const { zip, failed: unrendered } = await exportDocumentsZip(docs, { scale: exportScale }, (done, total) => setExportProgress({ done, total }));
+            const failed = [...unreadable, ...unrendered];
+            downloadBlob(zip, `${type}-export.zip`);
+            if (failed.length > 0) alert(`${t.header.exportFailed}: ${failed.join(', ')}`);
+        } catch (error) {
+            console.error('Failed to export documents:', error);
+        } finally {
+            setExportProgress(null);
+        }
+    };
+
     if (!mounted) return null;
 
     return (
@@ -123,6 +185,20 @@ export default function RepositoryPage() {
                                 )
                             })}
                         </div>
+
+                        {typeFilter !== 'all' && typeFilter !== 'json-builder' && (
+                            <button
+                                onClick={() => exportAll(typeFilter)}
+                                disabled={!!exportProgress}
+                                data-testid="repository-export-all"
+                                className="inline-flex items-center justify-center gap-2 px-3 h-10 text-sm font-medium rounded-md border border-input hover:bg-muted transition-colors disabled:opacity-50 disabled:pointer-events-none self-start"
+                            >
+                                <Download className="h-4 w-4" />
+                                {exportProgress
+                                    ? `${t.header.exporting} ${exportProgress.done}/${exportProgress.total || '…'}`
+                                    : t.header.exportAll}
+                            </button>
+                        )}
                     </div>
                 </div>
 
@@ -160,7 +236,11 @@ export default function RepositoryPage() {
                                                 {doc.title}
                                             </h3>
                                             <p className="text-sm text-muted-foreground line-clamp-3 font-mono bg-muted/50 p-2 rounded-md h-[4.5rem]">
-                                                {doc.content}
+                                                {snippets.has(doc.id)
+                                                    ? snippets.get(doc.id)!.map((part, i) => part.match
+                                                        ? <mark key={i} className="bg-yellow-200/70 dark:bg-yellow-500/30 text-inherit rounded-sm">{part.text}</mark>
+                                                        : <React.Fragment key={i}>{part.text}</React.Fragment>)
+                                                    : documentPreview(doc)}
                                             </p>
                                         </div>
 
@@ -187,6 +267,17 @@ export default function RepositoryPage() {
                         </p>
                     </div>
                 )}
+
+                {Object.values(hasMore).some(Boolean) && (
+                    <div className="flex justify-center mt-8">
+                        <button
+                            onClick={() => fetchMoreDocuments(typeFilter === 'all' ? undefined : typeFilter)}
+                            className="px-4 py-2 text-sm font-medium rounded-md border border-input hover:bg-muted transition-colors"
+                        >
+                            {t.sidebar.loadMore}
+                        </button>
+                    </div>
+                )}
             </main>
 
             <ConfirmDialog
@@ -4,18 +4,20 @@ import React, { useRef } from 'react';
 import { Header } from '@/components/layout/Header';
 import { Button } from '@/components/ui/button';
 import { Trash2, RefreshCcw, Download, Upload } from 'lucide-react';
+import * as localDocuments from '@/lib/documents/localDocuments';
 
 export default function SettingsPage() {
   const fileInputRef = useRef<HTMLInputElement>(null);
 
-  const handleResetData = () => {
+  const handleResetData = async () => {
     if (confirm('Are you sure you want to reset all local data? This action cannot be undone.')) {
       localStorage.clear();
+      await localDocuments.clear();
       window.location.reload();
     }
   };
 
-  const handleExportData = () => {
+  const handleExportData = async () => {
     const data: Record<string, string | null> = {};
     for (let i = 0; i < localStorage.length; i++) {
       const key = localStorage.key(i);
@@ -23,6 +25,12 @@ export default function SettingsPage() {
         data[key] = localStorage.getItem(key);
       }
     }
+    // Documents are kept in IndexedDB; export them under the old key so importing
+    // the file restores them through the usual migration.
+    const docs = await localDocuments.loadAll();
+    if (docs.length > 0) {
+      data[localDocuments.LEGACY_STORAGE_KEY] = JSON.stringify(docs);
+    }
     const blob = new Blob([JSON.stringify(data, null, 2)], { type: 'application/json' });
     const url = URL.createObjectURL(blob);
     const a = document.createElement('a');
@@ -1,5 +1,5 @@
-import React from 'react';
-import ReactMarkdown from 'react-markdown';
+import React, { useMemo, useRef } from 'react';
+import ReactMarkdown, { type Components } from 'react-markdown';
 import remarkGfm from 'remark-gfm';
 import remarkMath from 'remark-math';
 import rehypeKatex from 'rehype-katex';
@@ -7,6 +7,25 @@ import { cn } from '@/lib/utils';
 import { Bot, User } from 'lucide-react';
 import 'katex/dist/katex.min.css';
 import { DocumentType } from '@/store/useDocumentStore';
+import { splitMarkdownBlocks, type MarkdownBlock as Block } from '@/lib/markdown/streamingBlocks';
+
+const REMARK_PLUGINS = [remarkGfm, remarkMath];
+const REHYPE_PLUGINS = [rehypeKatex];
+
+const copyToClipboard = (text: string) => {
+    navigator.clipboard.writeText(text);
+    // Could add toast here
+};
+
+// One top-level block of a message. Only blocks whose source changed render
+// again, so each streamed token re-parses just the block being written.
+const MarkdownBlock = React.memo(function MarkdownBlock({ source, components }: { source: string; components: Components }) {
+    return (
+        <ReactMarkdown remarkPlugins={REMARK_PLUGINS} rehypePlugins={REHYPE_PLUGINS} components={components}>
+            {source}
+        </ReactMarkdown>
+    );
+});
 
 interface ChatMessageProps {
     role: 'user' | 'assistant' | 'system' | 'data';
@@ -15,13 +34,100 @@ interface ChatMessageProps {
     activeDocType?: DocumentType;
 }
 
-export function ChatMessage({ role, content, onAction, activeDocType }: ChatMessageProps) {
+// Memoized by props: while a reply streams, earlier messages are not rendered again
+export const ChatMessage = React.memo(function ChatMessage({ role, content, onAction, activeDocType }: ChatMessageProps) {
     const isUser = role === 'user';
+    const previousBlocks = useRef<{ content: string; blocks: Block[] } | undefined>(undefined);
+
+    // Split incrementally: streamed text is only appended
+    const blocks = useMemo(() => {
+        const blocks = splitMarkdownBlocks(content, previousBlocks.current);
+        previousBlocks.current = { content, blocks };
+        return blocks;
+    }, [content]);
+
+    const components = useMemo<Components>(() => ({
+        // Unwrap pre to prevent default browser styling from forcing width
+        pre: ({ children }) => <>{children}</>,
+        p: ({ node, ...props }) => <p className="mb-2 last:mb-0 break-words whitespace-pre-wrap" {...props} />,
+        a: ({ node, ...props }) => <a className="text-blue-500 hover:underline" {...props} />,
+        code: ({ node, inline, className, children, ...props }: any) => {
+            const match = /language-(\w+)/.exec(className || '');
+            const language = match ? match[1] : '';
+            const codeContent = String(children).replace(/\n$/, '');
+
+            // Map language to DocType/Route
+            const langMap: Record<string, DocumentType> = {
+                'mermaid': 'mermaid',
+                'markdown': 'markdown',
+                'md': 'markdown',
+                'latex': 'latex',
+                'tex': 'latex',
+                'json': 'json-builder'
+            };
+            const targetType = langMap[language];
+
+            // Action Logic
+            const isContextMatch = activeDocType === targetType;
+            const canInsert = ['python', 'javascript', 'typescript', 'tsx', 'jsx', 'html', 'css', 'bash', 'shell'].includes(language) || isContextMatch;
+            const canNavigate = !isContextMatch && targetType && language !== '';
 
-    const handleCopy = (text: string) => {
-        navigator.clipboard.writeText(text);
-        // Could add toast here
-    };
+            // Use !inline to determine block mode
+            // This covers triple backticks and indented blocks
+            const isBlock = !inline;
+
+            return isBlock ? (
+                <div className="my-2 w-full max-w-full overflow-hidden rounded-lg border border-neutral-200 dark:border-neutral-800">
+                    <div className="flex items-center justify-between bg-neutral-100 px-3 py-1.5 dark:bg-neutral-800">
+                        <span className="text-xs font-medium text-neutral-500 dark:text-neutral-400 uppercase">{language || 'CODE'}</span>
+                        <div className="flex gap-2">
+                            <button
+                                type="button"
+                                onClick={() => copyToClipboard(codeContent)}
+                                className="text-[10px] text-neutral-500 hover:text-neutral-900 dark:hover:text-neutral-200"
+                            >
+                                Copy
+                            </button>
+
+                            {/* Smart Action Buttons */}
+                            {!isUser && onAction && (
+                                <>
+                                    {canNavigate && (
+                                        <button
+                                            type="button"
+                                            onClick={() => onAction('navigate', JSON.stringify({ type: targetType, prompt: '' }))}
+                                            className="text-[10px] font-bold text-green-600 hover:text-green-700 dark:text-green-400 dark:hover:text-green-300"
+                                        >
+                                            Go to Editor
+                                        </button>
+                                    )}
+                                    {canInsert && (
+                                        <button
+                                            type="button"
+                                            onClick={() => onAction('insert', codeContent)}
+                                            className="text-[10px] font-bold text-blue-600 hover:text-blue-700 dark:text-blue-400 dark:hover:text-blue-300"
+                                        >
+                                            Insert
+                                        </button>
+                                    )}
+                                </>
+                            )}
+                        </div>
+                    </div>
+                    {/* Wrapper for code to allow scroll */}
+                    <div className="w-full overflow-x-auto bg-neutral-50 p-3 dark:bg-neutral-900">
+                        <code className={cn("block min-w-max text-xs font-mono", className)} {...props}>
+                            {children}
+                        </code>
+                    </div>
+                </div>
+            ) : (
+                <code className="rounded bg-neutral-200/50 px-1 py-0.5 text-xs font-mono dark:bg-neutral-700/50" {...props}>
+                    {children}
+                </code>
+            );
+        }
+    }), [isUser, onAction, activeDocType]);
 
     const isNavSuggestion = content.startsWith('[NAV_SUGGESTION]');
 
@@ -69,95 +175,10 @@ export function ChatMessage({ role, content, onAction, activeDocType }: ChatMess
                     ? "bg-neutral-900 text-white dark:bg-white dark:text-neutral-900 rounded-tr-none prose-invert dark:prose-neutral"
                     : "bg-white border border-neutral-100 dark:bg-neutral-900 dark:border-neutral-800 rounded-tl-none"
             )}>
-                <ReactMarkdown
-                    remarkPlugins={[remarkGfm, remarkMath]}
-                    rehypePlugins={[rehypeKatex]}
-                    components={{
-                        // Unwrap pre to prevent default browser styling from forcing width
-                        pre: ({ children }) => <>{children}</>,
-                        p: ({ node, ...props }) => <p className="mb-2 last:mb-0 break-words whitespace-pre-wrap" {...props} />,
-                        a: ({ node, ...props }) => <a className="text-blue-500 hover:underline" {...props} />,
-                        code: ({ node, inline, className, children, ...props }: any) => {
-                            const match = /language-(\w+)/.exec(className || '');
-                            const language = match ? match[1] : '';
-                            const codeContent = String(children).replace(/\n$/, '');
-
-                            // Map language to DocType/Route
-                            const langMap: Record<string, DocumentType> = {
-                                'mermaid': 'mermaid',
-                                'markdown': 'markdown',
-                                'md': 'markdown',
-                                'latex': 'latex',
-                                'tex': 'latex',
-                                'json': 'json-builder'
-                            };
-                            const targetType = langMap[language];
-
-                            // Action Logic
-                            const isContextMatch = activeDocType === targetType;
-                            const canInsert = ['python', 'javascript', 'typescript', 'tsx', 'jsx', 'html', 'css', 'bash', 'shell'].includes(language) || isContextMatch;
-                            const canNavigate = !isContextMatch && targetType && language !== '';
-
-                            // Use !inline to determine block mode
-                            // This covers triple backticks and indented blocks
-                            const isBlock = !inline;
-
-                            return isBlock ? (
-                                <div className="my-2 w-full max-w-full overflow-hidden rounded-lg border border-neutral-200 dark:border-neutral-800">
-                                    <div className="flex items-center justify-between bg-neutral-100 px-3 py-1.5 dark:bg-neutral-800">
-                                        <span className="text-xs font-medium text-neutral-500 dark:text-neutral-400 uppercase">{language || 'CODE'}</span>
-                                        <div className="flex gap-2">
-                                            <button
-                                                type="button"
-                                                onClick={() => handleCopy(codeContent)}
-                                                className="text-[10px] text-neutral-500 hover:text-neutral-900 dark:hover:text-neutral-200"
-                                            >
-                                                Copy
-                                            </button>
-
-                                            {/* Smart Action Buttons */}
-                                            {!isUser && onAction && (
-                                                <>
-                                                    {canNavigate && (
-                                                        <button
-                                                            type="button"
-                                                            onClick={() => onAction('navigate', JSON.stringify({ type: targetType, prompt: '' }))}
-                                                            className="text-[10px] font-bold text-green-600 hover:text-green-700 dark:text-green-400 dark:hover:text-green-300"
-                                                        >
-                                                            Go to Editor
-                                                        </button>
-                                                    )}
-                                                    {canInsert && (
-                                                        <button
-                                                            type="button"
-                                                            onClick={() => onAction('insert', codeContent)}
-                                                            className="text-[10px] font-bold text-blue-600 hover:text-blue-700 dark:text-blue-400 dark:hover:text-blue-300"
-                                                        >
-                                                            Insert
-                                                        </button>
-                                                    )}
-                                                </>
-                                            )}
-                                        </div>
-                                    </div>
-                                    {/* Wrapper for code to allow scroll */}
-                                    <div className="w-full overflow-x-auto bg-neutral-50 p-3 dark:bg-neutral-900">
-                                        <code className={cn("block min-w-max text-xs font-mono", className)} {...props}>
-                                            {children}
-                                        </code>
-                                    </div>
-                                </div>
-                            ) : (
-                                <code className="rounded bg-neutral-200/50 px-1 py-0.5 text-xs font-mono dark:bg-neutral-700/50" {...props}>
-                                    {children}
-                                </code>
-                            );
-                        }
-                    }}
-                >
-                    {content}
-                </ReactMarkdown>
+                {blocks.map(block => (
+                    <MarkdownBlock key={block.start} source={block.source} components={components} />
+                ))}
             </div>
         </div >
     );
-}
+});
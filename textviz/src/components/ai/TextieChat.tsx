@@ -1,6 +1,6 @@
 'use client';
 
-import React, { useRef, useEffect } from 'react';
+import React, { useRef, useEffect, useCallback } from 'react';
 import { useChat } from 'ai/react';
 import { Message } from 'ai';
 import { useRouter, usePathname } from 'next/navigation';
@@ -8,11 +8,15 @@ import { useTextieStore } from '@/store/useTextieStore';
 import { useDocumentStore, DocumentType } from '@/store/useDocumentStore';
 import { cn } from '@/lib/utils';
 import { Bot, X, Send, Sparkles, Plus, Clock, Paperclip } from 'lucide-react';
-import { ChatMessage } from './ChatMessage';
 import { Button } from '@/components/ui/button';
 import { useLanguageStore } from '@/store/useLanguageStore';
 import { useChatHistoryStore } from '@/store/useChatHistoryStore';
 import { ChatHistoryModal } from './ChatHistoryModal';
+import { buildDocumentContext } from '@/lib/ai/documentContext';
+import dynamic from 'next/dynamic';
+
+// Markdown, math and KaTeX only load once there are messages to show; the chat is on every page
+const ChatMessage = dynamic(() => import('./ChatMessage').then((mod) => mod.ChatMessage));
 
 export function TextieChat() {
     const router = useRouter();
@@ -44,15 +48,24 @@ export function TextieChat() {
         docId: activeDoc?.id,
         docTitle: activeDoc?.title,
         docType: effectiveType,
-        contentPreview: activeDoc?.content?.slice(0, 5000) || '',
         cursorPosition: 0,
     };
 
     const { messages, input, handleInputChange, handleSubmit, isLoading, append, setInput, setMessages } = useChat({
         api: '/api/chat',
-        body: {
-            userProfile,
-            currentContext,
+        // Built per request: the sections sent depend on the message being answered
+        experimental_prepareRequestBody: ({ messages }) => {
+            const query = [...messages].reverse().find(message => message.role === 'user')?.content ?? '';
+            return {
+                messages,
+                userProfile,
+                currentContext: {
+                    ...currentContext,
+                    document: activeDoc
+                        ? buildDocumentContext(activeDoc.content ?? '', effectiveType, query)
+                        : undefined,
+                },
+            };
         },
     });
 
@@ -97,6 +110,45 @@ export function TextieChat() {
         if (inputRef.current) inputRef.current.focus();
     };
 
+    // Stable, so memoized ChatMessages that did not change skip rendering
+    const handleMessageAction = useCallback(async (action: 'copy' | 'insert' | 'navigate', content: string) => {
+        // Use direct store access to avoid stale closures
+        const currentStore = useDocumentStore.getState();
+        const currentActiveDoc = currentStore.getActiveDocument();
+
+        console.log('[TextieChat] onAction called:', action, 'ActiveDoc:', currentActiveDoc?.title);
+
+        if (action === 'navigate') {
+            try {
+                // content here is JSON string of {type, prompt}
+                const { type, prompt } = JSON.parse(content);
+                const newDoc = await currentStore.addDocument(type);
+                if (newDoc) {
+                    // Set pending action FIRST only if prompt exists
+                    if (prompt) {
+                        setPendingAction({ prompt, targetType: type });
+                    }
+                    // Then navigate
+                    console.log('[TextieChat] Navigating to:', `/${type}`);
+                    router.push(`/${type}`);
+                }
+            } catch (e) {
+                console.error('[TextieChat] Navigation Failed:', e);
+            }
+        }
+        if (action === 'insert') {
+            if (currentActiveDoc?.id) {
+                console.log('[TextieChat] Overwriting document:', currentActiveDoc.id);
+                // Overwrite content as requested
+                currentStore.updateDocument(currentActiveDoc.id, {
+                    content: content
+                });
+            } else {
+                console.warn('[TextieChat] Cannot insert: No active document found.');
+            }
+        }
+    }, [router]);
+
     const handleRestore = (restoredMessages: any[]) => {
         setMessages(restoredMessages);
         setHistoryOpen(false);
@@ -200,6 +252,7 @@ export function TextieChat() {
             <div className="fixed bottom-6 left-1/2 -translate-x-1/2 z-50 animate-in fade-in slide-in-from-bottom-4">
                 <button
                     onClick={toggleOpen}
+                    data-testid="textie-open"
                     className="group flex items-center gap-3 rounded-full bg-neutral-900 pr-6 pl-2 py-2 text-white shadow-2xl transition-all hover:-translate-y-1 hover:shadow-neutral-900/20 active:translate-y-0 dark:bg-white dark:text-neutral-900 dark:hover:shadow-white/10"
                 >
                     <div className="flex h-10 w-10 items-center justify-center rounded-full bg-blue-600">
@@ -241,6 +294,7 @@ export function TextieChat() {
                         size="icon"
                         className="h-8 w-8 rounded-full text-neutral-500 hover:text-neutral-900 dark:text-neutral-400 dark:hover:text-white"
                         onClick={() => setHistoryOpen(!historyOpen)}
+                        data-testid="textie-history"
                         title="History"
                     >
                         <Clock className="h-4 w-4" />
@@ -250,11 +304,12 @@ export function TextieChat() {
                         size="icon"
                         className="h-8 w-8 rounded-full text-neutral-500 hover:text-neutral-900 dark:text-neutral-400 dark:hover:text-white"
                         onClick={handleNewChat}
+                        data-testid="textie-new-chat"
                         title="New Chat"
                     >
                         <Plus className="h-4 w-4" />
                     </Button>
-                    <Button variant="ghost" size="icon" className="h-8 w-8 rounded-full hover:bg-red-100 hover:text-red-500 dark:hover:bg-red-900/30" onClick={toggleOpen}>
+                    <Button variant="ghost" size="icon" className="h-8 w-8 rounded-full hover:bg-red-100 hover:text-red-500 dark:hover:bg-red-900/30" onClick={toggleOpen} data-testid="textie-close">
                         <X className="h-4 w-4" />
                     </Button>
                 </div>
@@ -294,47 +349,7 @@ export function TextieChat() {
                             role={m.role as any}
                             content={m.content}
                             activeDocType={effectiveType}
-
-
-                            // ... inside return ...
-                            // ... inside return ...
-                            onAction={async (action, content) => {
-                                // Use direct store access to avoid stale closures
-                                const currentStore = useDocumentStore.getState();
-                                const currentActiveDoc = currentStore.getActiveDocument();
-
-                                console.log('[TextieChat] onAction called:', action, 'ActiveDoc:', currentActiveDoc?.title);
-
-                                if (action === 'navigate') {
-                                    try {
-                                        // content here is JSON string of {type, prompt}
-                                        const { type, prompt } = JSON.parse(content);
-                                        const newDoc = await currentStore.addDocument(type);
-                                        if (newDoc) {
-                                            // Set pending action FIRST only if prompt exists
-                                            if (prompt) {
-                                                setPendingAction({ prompt, targetType: type });
-                                            }
-                                            // Then navigate
-                                            console.log('[TextieChat] Navigating to:', `/${type}`);
-                                            router.push(`/${type}`);
-                                        }
-                                    } catch (e) {
-                                        console.error('[TextieChat] Navigation Failed:', e);
-                                    }
-                                }
-                                if (action === 'insert') {
-                                    if (currentActiveDoc?.id) {
-                                        console.log('[TextieChat] Overwriting document:', currentActiveDoc.id);
-                                        // Overwrite content as requested
-                                        currentStore.updateDocument(currentActiveDoc.id, {
-                                            content: content
-                                        });
-                                    } else {
-                                        console.warn('[TextieChat] Cannot insert: No active document found.');
-                                    }
-                                }
-                            }}
+                            onAction={handleMessageAction}
                         />
                     ))
                 )}
@@ -361,6 +376,7 @@ export function TextieChat() {
                     </Button>
                     <input
                         ref={inputRef}
+                        data-testid="textie-input"
                         className="flex-1 bg-transparent px-2 py-2 text-sm text-neutral-900 placeholder-neutral-400 focus:outline-none dark:text-white"
                         placeholder="Textie에게 메시지 보내기..."
                         value={input}
@@ -369,6 +385,7 @@ export function TextieChat() {
                     <Button
                         type="submit"
                         size="icon"
+                        data-testid="textie-send"
                         className="shrink-0 rounded-full bg-blue-600 text-white hover:bg-blue-700 disabled:opacity-50"
                         disabled={isLoading || !input.trim()}
                     >
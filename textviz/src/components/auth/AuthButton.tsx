@@ -15,7 +15,7 @@ export function AuthButton() {
     const [isSyncing, setIsSyncing] = useState(false);
     const supabase = createClient();
     const { t } = useLanguageStore();
-    const { fetchDocuments, syncLocalDocuments } = useDocumentStore();
+    const { fetchDocuments, syncLocalDocuments, flushPendingWrites, syncProgress } = useDocumentStore();
     const router = useRouter();
 
     useEffect(() => {
@@ -70,29 +70,32 @@ export function AuthButton() {
     };
 
     const handleLogout = async () => {
+        // Queued edits need the session to reach Supabase, so write them first.
+        await flushPendingWrites();
         await supabase.auth.signOut();
     };
 
     if (loading) {
-        return <Button variant="ghost" disabled size="sm" className="w-9 h-9 p-0"><span className="sr-only">Loading...</span></Button>;
+        return <Button variant="ghost" disabled size="sm" className="w-9 h-9 p-0" data-testid="auth-loading"><span className="sr-only">Loading...</span></Button>;
     }
 
     if (user) {
         return (
             <div className="flex items-center gap-2">
                 <div className="hidden md:flex flex-col items-end text-xs mr-1">
-                    <span className="font-medium">{user.user_metadata.full_name || user.email}</span>
+                    <span className="font-medium" data-testid="auth-user">{user.user_metadata.full_name || user.email}</span>
                 </div>
                 {isSyncing && (
                     <div className="flex items-center text-xs text-muted-foreground animate-pulse mr-2">
                         <RefreshCw className="h-3 w-3 mr-1 animate-spin" />
-                        Syncing...
+                        Syncing{syncProgress ? ` ${syncProgress.synced}/${syncProgress.total}` : ''}...
                     </div>
                 )}
                 <Button
                     variant="ghost"
                     size="sm"
                     onClick={handleLogout}
+                    data-testid="auth-logout"
                     className="h-9 w-9 p-0"
                     title="Sign out"
                 >
@@ -107,6 +110,7 @@ export function AuthButton() {
             variant="default"
             size="sm"
             onClick={handleLogin}
+            data-testid="auth-login"
             className="h-9 px-4"
         >
             <UserIcon className="h-4 w-4 mr-2" />
@@ -2,6 +2,7 @@
 
 import React, { useEffect, useState } from 'react';
 import { useDocumentStore } from '@/store/useDocumentStore';
+import { documentPreview } from '@/lib/documents/preview';
 import { useLanguageStore } from '@/store/useLanguageStore';
 import Link from 'next/link';
 import { FileText, Sigma, GitGraph, Clock } from 'lucide-react';
@@ -62,6 +63,7 @@ export function RecentFiles() {
             <Link
               key={item.href}
               href={item.href}
+              data-testid={`recent-file-${item.type}`}
               onClick={() => {
                 if (recentDoc) {
                   setActiveDocument(recentDoc.id);
@@ -77,7 +79,7 @@ export function RecentFiles() {
                 </span>}
               </div>
               <p className="text-xs text-muted-foreground line-clamp-3 font-mono bg-muted/30 p-2 rounded h-16 overflow-hidden">
-                {recentDoc?.content || `(${t.editor.empty})`}
+                {(recentDoc && documentPreview(recentDoc)) || `(${t.editor.empty})`}
               </p>
               <div className="text-[10px] text-muted-foreground mt-auto pt-2 truncate">
                 {recentDoc?.title || t.editor.untitled}
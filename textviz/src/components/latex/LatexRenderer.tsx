@@ -1,204 +1,111 @@
 "use client";
 
-import React, { useMemo, useEffect, useRef } from 'react';
-import katex from 'katex';
+import React, { forwardRef, useEffect, useImperativeHandle, useMemo, useLayoutEffect, useRef, useState } from 'react';
+import type { RenderedBlock } from '@/lib/latex/renderLatex';
+import { latexRenderClient } from '@/lib/latex/renderClient';
 import 'katex/dist/katex.min.css';
 
 interface LatexRendererProps {
   content: string;
 }
 
-// Parse content and render LaTeX math expressions
-function parseAndRenderLatex(content: string): { html: string; errors: string[] } {
-  if (!content) return { html: '', errors: [] };
-  
-  const errors: string[] = [];
-  let result = content;
-  
-  // Remove LaTeX comments (% to end of line, but not \%)
-  result = result.replace(/(?<!\\)%.*$/gm, '');
-  
-  // Remove preamble commands (before \begin{document} or if no document environment)
-  // These are configuration commands that don't render
-  result = result
-    // Document class and packages
-    .replace(/\\documentclass(\[[^\]]*\])?\{[^}]*\}/g, '')
-    .replace(/\\usepackage(\[[^\]]*\])?\{[^}]*\}/g, '')
-    // Page geometry and settings
-    .replace(/\\geometry\{[^}]*\}/g, '')
-    .replace(/\\hypersetup\{[\s\S]*?\}/g, '')
-    .replace(/\\pagestyle\{[^}]*\}/g, '')
-    .replace(/\\setlength\{[^}]*\}\{[^}]*\}/g, '')
-    .replace(/\\renewcommand\{[^}]*\}\{[^}]*\}/g, '')
-    .replace(/\\newcommand\{[^}]*\}(\[[^\]]*\])?\{[^}]*\}/g, '')
-    // Bibliography and index
-    .replace(/\\bibliographystyle\{[^}]*\}/g, '')
-    .replace(/\\bibliography\{[^}]*\}/g, '')
-    // Table of contents commands
-    .replace(/\\tableofcontents/g, '')
-    .replace(/\\listoffigures/g, '')
-    .replace(/\\listoftables/g, '')
-    // Label and ref (keep for now, just remove)
-    .replace(/\\label\{[^}]*\}/g, '')
-    .replace(/\\ref\{[^}]*\}/g, '[ref]')
-    .replace(/\\cite\{[^}]*\}/g, '[cite]')
-    // Input and include
-    .replace(/\\input\{[^}]*\}/g, '')
-    .replace(/\\include\{[^}]*\}/g, '');
-  
-  // Render display math: $$ ... $$ or \[ ... \]
-  result = result.replace(/\$\$([\s\S]*?)\$\$|\\\[([\s\S]*?)\\\]/g, (match, p1, p2) => {
-    const latex = p1 || p2;
-    try {
-      return `<div class="katex-display-wrapper">${katex.renderToString(latex.trim(), {
-        displayMode: true,
-        throwOnError: false,
-        trust: true,
-        strict: false,
-      })}</div>`;
-    } catch (e) {
-      errors.push(`Display math error: ${e}`);
-      return `<div class="latex-error">${match}</div>`;
+export interface LatexRendererHandle {
+  /** Scroll the preview to the output of a source line (0-based). */
+  scrollToLine: (line: number) => void;
+}
+
+// Quiet period after the last keystroke before the source goes to the worker
+const RENDER_DEBOUNCE_MS = 150;
+
+// Bring the container's children in line with `blocks`, reusing the node of
+// every block whose key is unchanged and only building nodes for new ones.
+function patchBlocks(container: HTMLElement, blocks: RenderedBlock[]) {
+  const existing = new Map<string, HTMLElement[]>();
+  for (const child of Array.from(container.children) as HTMLElement[]) {
+    const key = child.dataset.block ?? '';
+    existing.set(key, [...(existing.get(key) ?? []), child]);
+  }
+
+  let cursor = container.firstElementChild;
+  for (const block of blocks) {
+    let node = existing.get(block.key)?.shift();
+    if (!node) {
+      node = document.createElement('div');
+      node.className = 'latex-block';
+      node.dataset.block = block.key;
+      node.innerHTML = block.html;
     }
-  });
-  
-  // Render inline math: $ ... $ or \( ... \)
-  result = result.replace(/\$([^$\n]+?)\$|\\\(([^)]+?)\\\)/g, (match, p1, p2) => {
-    const latex = p1 || p2;
-    try {
-      return katex.renderToString(latex.trim(), {
-        displayMode: false,
-        throwOnError: false,
-        trust: true,
-        strict: false,
-      });
-    } catch (e) {
-      errors.push(`Inline math error: ${e}`);
-      return `<span class="latex-error">${match}</span>`;
+    node.dataset.line = String(block.line); // Lines above may have been added or removed
+    if (node === cursor) cursor = cursor.nextElementSibling;
+    else container.insertBefore(node, cursor);
+  }
+  existing.forEach(nodes => nodes.forEach(node => node.remove()));
+}
+
+// Element rendered from the source line closest above `line`
+function findLineElement(container: HTMLElement, line: number): HTMLElement | null {
+  const blocks = Array.from(container.children) as HTMLElement[];
+  let lo = 0;
+  let hi = blocks.length - 1;
+  let found = -1;
+  while (lo <= hi) {
+    const mid = (lo + hi) >> 1;
+    if (Number(blocks[mid].dataset.line) <= line) {
+      found = mid;
+      lo = mid + 1;
+    } else {
+      hi = mid - 1;
     }
-  });
-  
-  // Process text formatting FIRST (so nested commands like \title{\textbf{...}} work)
-  // Apply multiple times to handle nested formatting
-  for (let i = 0; i < 3; i++) {
-    result = result
-      .replace(/\\textbf\{([^{}]*)\}/g, '<strong>$1</strong>')
-      .replace(/\\textit\{([^{}]*)\}/g, '<em>$1</em>')
-      .replace(/\\underline\{([^{}]*)\}/g, '<u>$1</u>')
-      .replace(/\\emph\{([^{}]*)\}/g, '<em>$1</em>')
-      .replace(/\\texttt\{([^{}]*)\}/g, '<code>$1</code>')
-      .replace(/\\textrm\{([^{}]*)\}/g, '$1')
-      .replace(/\\textsf\{([^{}]*)\}/g, '$1')
-      .replace(/\\textsc\{([^{}]*)\}/g, '<span style="font-variant: small-caps">$1</span>');
   }
-  
-  // Convert LaTeX document structure to HTML
-  result = result
-    // Title, author, date from preamble
-    .replace(/\\title\{([^}]*)\}/g, '<h1 class="latex-title">$1</h1>')
-    .replace(/\\author\{([^}]*)\}/g, '<p class="latex-author">$1</p>')
-    .replace(/\\date\{([^}]*)\}/g, '<p class="latex-date">$1</p>')
-    .replace(/\\maketitle/g, '')
-    
-    // Document structure
-    .replace(/\\begin\{document\}/g, '')
-    .replace(/\\end\{document\}/g, '')
-    .replace(/\\documentclass(\[[^\]]*\])?\{[^}]*\}/g, '')
-    .replace(/\\usepackage(\[[^\]]*\])?\{[^}]*\}/g, '')
-    
-    // Sections
-    .replace(/\\section\*?\{([^}]*)\}/g, '<h2 class="latex-section">$1</h2>')
-    .replace(/\\subsection\*?\{([^}]*)\}/g, '<h3 class="latex-subsection">$1</h3>')
-    .replace(/\\subsubsection\*?\{([^}]*)\}/g, '<h4 class="latex-subsubsection">$1</h4>')
-    .replace(/\\paragraph\{([^}]*)\}/g, '<p class="latex-paragraph"><strong>$1</strong> ')
-    
-    // Lists
-    .replace(/\\begin\{itemize\}/g, '<ul class="latex-list">')
-    .replace(/\\end\{itemize\}/g, '</ul>')
-    .replace(/\\begin\{enumerate\}/g, '<ol class="latex-list">')
-    .replace(/\\end\{enumerate\}/g, '</ol>')
-    .replace(/\\item\s*/g, '<li>')
-    
-    // Environment blocks
-    .replace(/\\begin\{center\}/g, '<div class="text-center">')
-    .replace(/\\end\{center\}/g, '</div>')
-    .replace(/\\begin\{quote\}/g, '<blockquote class="latex-quote">')
-    .replace(/\\end\{quote\}/g, '</blockquote>')
-    .replace(/\\begin\{abstract\}/g, '<div class="latex-abstract"><h4>Abstract</h4>')
-    .replace(/\\end\{abstract\}/g, '</div>')
-    
-    // Equation environments (already rendered as math)
-    .replace(/\\begin\{equation\*?\}([\s\S]*?)\\end\{equation\*?\}/g, (_, eq) => {
-      try {
-        return `<div class="katex-display-wrapper">${katex.renderToString(eq.trim(), {
-          displayMode: true,
-          throwOnError: false,
-        })}</div>`;
-      } catch {
-        return `<div class="latex-error">${eq}</div>`;
-      }
-    })
-    .replace(/\\begin\{align\*?\}([\s\S]*?)\\end\{align\*?\}/g, (_, eq) => {
-      try {
-        // Convert align to aligned for KaTeX
-        const aligned = `\\begin{aligned}${eq}\\end{aligned}`;
-        return `<div class="katex-display-wrapper">${katex.renderToString(aligned.trim(), {
-          displayMode: true,
-          throwOnError: false,
-        })}</div>`;
-      } catch {
-        return `<div class="latex-error">${eq}</div>`;
-      }
-    })
-    
-    // Special characters
-    .replace(/\\&/g, '&amp;')
-    .replace(/\\%/g, '%')
-    .replace(/\\\$/g, '$')
-    .replace(/\\#/g, '#')
-    .replace(/\\_/g, '_')
-    .replace(/\\{/g, '{')
-    .replace(/\\}/g, '}')
-    .replace(/\\ldots/g, '…')
-    .replace(/\\cdots/g, '⋯')
-    .replace(/---/g, '—')
-    .replace(/--/g, '–')
-    .replace(/``/g, '"')
-    .replace(/''/g, '"')
-    
-    // Line breaks and spacing
-    .replace(/\\\\/g, '<br/>')
-    .replace(/\\newline/g, '<br/>')
-    .replace(/\\par\b/g, '</p><p>')
-    .replace(/\\vspace\{[^}]*\}/g, '<div style="margin: 1em 0;"></div>')
-    .replace(/\\hspace\{[^}]*\}/g, ' ')
-    .replace(/\\quad/g, '&emsp;')
-    .replace(/\\qquad/g, '&emsp;&emsp;')
-    .replace(/~/g, '&nbsp;')
-    
-    // Clean up remaining LaTeX commands
-    .replace(/\\[a-zA-Z]+(\{[^}]*\})?/g, '');
-  
-  // Wrap paragraphs (lines separated by blank lines)
-  result = result
-    .split(/\n\s*\n/)
-    .map(para => para.trim())
-    .filter(para => para.length > 0)
-    .map(para => {
-      // Don't wrap if it's already an HTML block element
-      if (para.match(/^<(h[1-6]|div|ul|ol|blockquote|p)/i)) {
-        return para;
-      }
-      return `<p>${para}</p>`;
-    })
-    .join('\n');
-  
-  return { html: result, errors };
+  if (found === -1) return null;
+
+  // Inside the block, data-line is relative to the block's first line
+  const block = blocks[found];
+  const offset = line - Number(block.dataset.line);
+  let target: HTMLElement = block;
+  block.querySelectorAll<HTMLElement>('[data-line]').forEach(el => {
+    if (Number(el.dataset.line) <= offset) target = el;
+  });
+  return target;
 }
 
-export function LatexRenderer({ content }: LatexRendererProps) {
+export const LatexRenderer = forwardRef<LatexRendererHandle, LatexRendererProps>(function LatexRenderer({ content }, ref) {
   const containerRef = useRef<HTMLDivElement>(null);
-  const { html, errors } = useMemo(() => parseAndRenderLatex(content), [content]);
+  const scrollRef = useRef<HTMLDivElement>(null);
+  const [blocks, setBlocks] = useState<RenderedBlock[]>([]);
+  const hasRendered = useRef(false);
+  const errors = useMemo(() => blocks.flatMap(block => block.errors), [blocks]);
+
+  // Rendering happens in a Web Worker. The debounce keeps running while a
+  // render is in flight, and a newer render supersedes it, so typing never
+  // waits on KaTeX.
+  useEffect(() => {
+    const timer = setTimeout(async () => {
+      const rendered = await latexRenderClient.render(content);
+      if (!rendered) return; // Superseded by newer content
+      hasRendered.current = true;
+      setBlocks(rendered);
+    }, hasRendered.current ? RENDER_DEBOUNCE_MS : 0);
+    return () => clearTimeout(timer);
+  }, [content]);
+
+  useLayoutEffect(() => {
+    if (containerRef.current) patchBlocks(containerRef.current, blocks);
+  }, [blocks]);
+
+  useImperativeHandle(ref, () => ({
+    scrollToLine: (line: number) => {
+      const container = containerRef.current;
+      const scroller = scrollRef.current;
+      if (!container || !scroller) return;
+      const target = findLineElement(container, line);
+      if (!target) {
+        scroller.scrollTop = 0;
+        return;
+      }
+      scroller.scrollTop += target.getBoundingClientRect().top - scroller.getBoundingClientRect().top - 24;
+    },
+  }), []);
 
   return (
     <div className="flex flex-col h-full bg-neutral-100 dark:bg-neutral-900 overflow-auto">
@@ -218,7 +125,7 @@ export function LatexRenderer({ content }: LatexRendererProps) {
       </div>
 
       {/* Paper-like preview */}
-      <div className="flex-1 overflow-auto p-6">
+      <div ref={scrollRef} className="flex-1 overflow-auto p-6">
         <div className="mx-auto max-w-3xl">
           <div 
             ref={containerRef}
@@ -228,139 +135,9 @@ export function LatexRenderer({ content }: LatexRendererProps) {
               padding: '3rem',
               minHeight: '600px',
             }}
-            dangerouslySetInnerHTML={{ __html: html }}
           />
         </div>
       </div>
-
-      {/* Inline styles for LaTeX rendering */}
-      <style jsx global>{`
-        .latex-document {
-          font-family: 'Computer Modern', 'Latin Modern', Georgia, 'Times New Roman', serif;
-          font-size: 1.1rem;
-          line-height: 1.8;
-        }
-        
-        .latex-document p {
-          margin-bottom: 1em;
-          text-align: justify;
-        }
-        
-        .latex-title {
-          font-size: 1.75rem;
-          font-weight: 600;
-          text-align: center;
-          margin-bottom: 0.5rem;
-          color: inherit;
-        }
-        
-        .latex-author {
-          text-align: center;
-          font-style: italic;
-          margin-bottom: 0.25rem;
-          color: inherit;
-          opacity: 0.8;
-        }
-        
-        .latex-date {
-          text-align: center;
-          margin-bottom: 2rem;
-          color: inherit;
-          opacity: 0.7;
-        }
-        
-        .latex-section {
-          font-size: 1.4rem;
-          font-weight: 600;
-          margin-top: 2rem;
-          margin-bottom: 1rem;
-          color: inherit;
-        }
-        
-        .latex-subsection {
-          font-size: 1.2rem;
-          font-weight: 600;
-          margin-top: 1.5rem;
-          margin-bottom: 0.75rem;
-          color: inherit;
-        }
-        
-        .latex-subsubsection {
-          font-size: 1.1rem;
-          font-weight: 600;
-          margin-top: 1.25rem;
-          margin-bottom: 0.5rem;
-          color: inherit;
-        }
-        
-        .latex-list {
-          margin: 1em 0;
-          padding-left: 2em;
-        }
-        
-        .latex-list li {
-          margin-bottom: 0.5em;
-        }
-        
-        .latex-quote {
-          margin: 1.5em 2em;
-          padding-left: 1em;
-          border-left: 3px solid #ccc;
-          font-style: italic;
-        }
-        
-        .latex-abstract {
-          margin: 2em 3em;
-          font-size: 0.95em;
-        }
-        
-        .latex-abstract h4 {
-          text-align: center;
-          font-weight: 600;
-          margin-bottom: 0.5em;
-        }
-        
-        .katex-display-wrapper {
-          margin: 1.5em 0;
-          text-align: center;
-        }
-        
-        .katex-display {
-          margin: 0 !important;
-        }
-        
-        .katex-display-wrapper .katex-display > .katex {
-          white-space: normal;
-        }
-        
-        .katex-display-wrapper .katex {
-          font-size: 1.1em;
-        }
-        
-        .latex-document .katex {
-          font-size: 1em;
-        }
-        
-        .latex-error {
-          background-color: #fef2f2;
-          border: 1px solid #fecaca;
-          border-radius: 4px;
-          padding: 0.25em 0.5em;
-          color: #dc2626;
-          font-family: monospace;
-          font-size: 0.9em;
-        }
-        
-        .dark .latex-error {
-          background-color: #450a0a;
-          border-color: #7f1d1d;
-          color: #f87171;
-        }
-        
-        .dark .latex-quote {
-          border-left-color: #525252;
-        }
-      `}</style>
     </div>
   );
-}
+});
@@ -6,6 +6,7 @@ import { FileText, GitGraph, Sigma, Plus, ChevronRight, Pencil, Trash2 } from "l
 import { useDocumentStore, DocumentType } from "@/store/useDocumentStore";
 import { useLanguageStore } from "@/store/useLanguageStore";
 import { cn } from "@/lib/utils";
+import { documentPreview, documentWordCount } from "@/lib/documents/preview";
 import { ConfirmDialog } from "@/components/ui/ConfirmDialog";
 
 type DocKind = "markdown" | "latex" | "mermaid";
@@ -46,11 +47,6 @@ function getPreview(content: string, maxLength = 60): string | null {
   return cleaned.length > maxLength ? cleaned.slice(0, maxLength) + '...' : cleaned;
 }
 
-function getWordCount(content: string): number {
-  if (!content?.trim()) return 0;
-  return content.trim().split(/\s+/).length;
-}
-
 export function DocumentSidebar({ active }: DocumentSidebarProps) {
   const [mounted, setMounted] = useState(false);
   const [editingId, setEditingId] = useState<string | null>(null);
@@ -67,6 +63,8 @@ export function DocumentSidebar({ active }: DocumentSidebarProps) {
   const updateDocument = useDocumentStore((state) => state.updateDocument);
   const activeDocumentId = useDocumentStore((state) => state.activeDocumentId);
   const setActiveDocument = useDocumentStore((state) => state.setActiveDocument);
+  const hasMore = useDocumentStore((state) => state.hasMore[active]);
+  const fetchMoreDocuments = useDocumentStore((state) => state.fetchMoreDocuments);
   const { t } = useLanguageStore();
 
   useEffect(() => setMounted(true), []);
@@ -158,6 +156,7 @@ export function DocumentSidebar({ active }: DocumentSidebarProps) {
             {!isCollapsed && (
               <button
                 onClick={handleNewDocument}
+                data-testid="sidebar-new-doc"
                 className="flex h-6 w-6 items-center justify-center rounded-md text-neutral-400 transition-colors hover:bg-neutral-100 hover:text-neutral-600 dark:hover:bg-neutral-800 dark:hover:text-neutral-300"
                 title={t.dialog.createNew}
               >
@@ -166,6 +165,7 @@ export function DocumentSidebar({ active }: DocumentSidebarProps) {
             )}
             <button
               onClick={() => setIsCollapsed(!isCollapsed)}
+              data-testid="sidebar-collapse"
               className="flex h-6 w-6 items-center justify-center rounded-md text-neutral-400 transition-colors hover:bg-neutral-100 hover:text-neutral-600 dark:hover:bg-neutral-800 dark:hover:text-neutral-300"
               title={isCollapsed ? "Expand" : "Collapse"}
             >
@@ -190,6 +190,7 @@ export function DocumentSidebar({ active }: DocumentSidebarProps) {
               ) : (
                 <button
                   onClick={handleNewDocument}
+                  data-testid="sidebar-new-doc"
                   className="flex h-8 w-8 items-center justify-center rounded-lg bg-neutral-50 text-neutral-400 hover:bg-neutral-100 dark:bg-neutral-800 dark:hover:bg-neutral-700"
                 >
                   <Plus className="h-4 w-4" />
@@ -202,8 +203,8 @@ export function DocumentSidebar({ active }: DocumentSidebarProps) {
                 const config = docConfig[active];
                 const Icon = config.icon;
                 const isActive = activeDocumentId === doc.id;
-                const wordCount = getWordCount(doc.content);
-                const preview = getPreview(doc.content);
+                const wordCount = documentWordCount(doc);
+                const preview = getPreview(documentPreview(doc));
                 const isEditing = editingId === doc.id;
 
                 if (isCollapsed) {
@@ -211,6 +212,7 @@ export function DocumentSidebar({ active }: DocumentSidebarProps) {
                     <button
                       key={doc.id}
                       onClick={() => setActiveDocument(doc.id)}
+                      data-testid="sidebar-doc"
                       className={cn(
                         "group flex w-full items-center justify-center rounded-lg p-2 transition-all duration-150",
                         isActive
@@ -233,6 +235,7 @@ export function DocumentSidebar({ active }: DocumentSidebarProps) {
                   <div
                     key={doc.id}
                     onClick={() => !isEditing && setActiveDocument(doc.id)}
+                    data-testid="sidebar-doc"
                     className={cn(
                       "group relative flex w-full flex-col gap-2 rounded-lg p-3 text-left transition-all duration-150 cursor-pointer",
                       isActive
@@ -315,6 +318,15 @@ export function DocumentSidebar({ active }: DocumentSidebarProps) {
                   </div>
                 );
               })}
+              {hasMore && !isCollapsed && (
+                <button
+                  onClick={() => fetchMoreDocuments(active)}
+                  data-testid="sidebar-load-more"
+                  className="w-full rounded-lg p-2 text-xs font-medium text-neutral-500 hover:bg-neutral-50 dark:hover:bg-neutral-800/50"
+                >
+                  {t.sidebar.loadMore}
+                </button>
+              )}
             </div>
           )}
         </div>
@@ -105,6 +105,7 @@ export function EditorHeader({ title, typeLabel, onTitleChange, onMobileMenuClic
                     <div className="flex items-center gap-2">
                         <input
                             ref={inputRef}
+                            data-testid="editor-title-input"
                             value={editName}
                             onChange={(e) => setEditName(e.target.value)}
                             onBlur={handleSave}
@@ -115,6 +116,7 @@ export function EditorHeader({ title, typeLabel, onTitleChange, onMobileMenuClic
                 ) : (
                     <div
                         onClick={handleStartEditing}
+                        data-testid="editor-title"
                         className="group flex items-center gap-2 cursor-pointer rounded hover:bg-neutral-200/50 px-2 py-0.5 -ml-2 transition-colors dark:hover:bg-neutral-800"
                         title="Click to rename (Auto-generates for Untitled docs)"
                     >
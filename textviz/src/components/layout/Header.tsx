@@ -5,11 +5,12 @@ import { Moon, Sun, Download, Languages } from 'lucide-react';
 import { useAppStore } from '@/store/useAppStore';
 import { useLanguageStore } from '@/store/useLanguageStore';
 import { useExportImage } from '@/hooks/useExportImage';
+import { EXPORT_SCALES } from '@/lib/export/constants';
 import { AuthButton } from '@/components/auth/AuthButton';
 
 export function Header() {
   const pathname = usePathname();
-  const { isDarkMode, toggleDarkMode } = useAppStore();
+  const { isDarkMode, toggleDarkMode, exportScale, setExportScale } = useAppStore();
   const { language, setLanguage, t } = useLanguageStore();
   const { downloadImage } = useExportImage();
 
@@ -38,7 +39,7 @@ export function Header() {
     <header className="sticky top-0 z-50 w-full border-b bg-background/95 backdrop-blur supports-[backdrop-filter]:bg-background/60">
       <div className="container mx-auto flex h-14 items-center px-4 md:px-6">
         <div className="mr-4 hidden md:flex">
-          <Link href="/" className="mr-6 flex items-center space-x-2">
+          <Link href="/" className="mr-6 flex items-center space-x-2" data-testid="header-home">
             <span className="hidden font-bold sm:inline-block text-2xl tracking-wide" style={{ fontFamily: 'var(--font-bona-nova-sc)' }}>
               TextViz
             </span>
@@ -48,6 +49,7 @@ export function Header() {
               <Link
                 key={item.href}
                 href={item.href}
+                data-testid={`header-nav${item.href.replace('/', '-')}`}
                 className={cn(
                   "transition-colors hover:text-foreground/80",
                   pathname === item.href ? "text-foreground" : "text-foreground/60"
@@ -64,9 +66,23 @@ export function Header() {
             {/* Optional: Add search or command menu here later */}
           </div>
           <nav className="flex items-center space-x-2">
+            {exportConfig && (
+              <select
+                value={exportScale}
+                onChange={(e) => setExportScale(Number(e.target.value))}
+                data-testid="header-export-scale"
+                title={t.header.exportScale}
+                className="h-9 rounded-md border border-input bg-transparent px-2 text-sm shadow-sm focus-visible:outline-none focus-visible:ring-1 focus-visible:ring-ring"
+              >
+                {EXPORT_SCALES.map(scale => (
+                  <option key={scale} value={scale}>{scale}x</option>
+                ))}
+              </select>
+            )}
             {exportConfig && (
               <button
                 onClick={() => downloadImage(exportConfig.id, exportConfig.name)}
+                data-testid="header-export"
                 className="inline-flex items-center justify-center rounded-md text-sm font-medium transition-colors focus-visible:outline-none focus-visible:ring-1 focus-visible:ring-ring disabled:pointer-events-none disabled:opacity-50 hover:bg-accent hover:text-accent-foreground h-9 px-3 mr-2 border border-input bg-transparent shadow-sm"
               >
                 <Download className="h-4 w-4 mr-2" />
@@ -76,6 +92,7 @@ export function Header() {
 
             <button
               onClick={toggleLanguage}
+              data-testid="header-language-toggle"
               className="inline-flex items-center justify-center rounded-md text-sm font-medium transition-colors focus-visible:outline-none focus-visible:ring-1 focus-visible:ring-ring disabled:pointer-events-none disabled:opacity-50 hover:bg-accent hover:text-accent-foreground h-9 py-2 w-9 px-0"
               title={language === 'en' ? '한국어' : 'English'}
             >
@@ -84,6 +101,7 @@ export function Header() {
             </button>
             <button
               onClick={toggleDarkMode}
+              data-testid="header-theme-toggle"
               className="inline-flex items-center justify-center rounded-md text-sm font-medium transition-colors focus-visible:outline-none focus-visible:ring-1 focus-visible:ring-ring disabled:pointer-events-none disabled:opacity-50 hover:bg-accent hover:text-accent-foreground h-9 py-2 w-9 px-0"
             >
               {isDarkMode ? (
@@ -2,22 +2,16 @@
 
 import React from 'react';
 import { Milkdown, MilkdownProvider, useEditor, useInstance } from '@milkdown/react';
-import { Editor, rootCtx, defaultValueCtx } from '@milkdown/core';
+import { Editor, rootCtx, defaultValueCtx, editorViewCtx } from '@milkdown/core';
+import { TextSelection } from '@milkdown/prose/state';
 import { commonmark } from '@milkdown/preset-commonmark';
 import { gfm } from '@milkdown/preset-gfm';
 import { nord } from '@milkdown/theme-nord';
 import { listener, listenerCtx } from '@milkdown/plugin-listener';
 import { history } from '@milkdown/plugin-history';
 import { clipboard } from '@milkdown/plugin-clipboard';
-import { prism } from '@milkdown/plugin-prism';
-import { math } from '@milkdown/plugin-math';
-import * as MathPlugin from '@milkdown/plugin-math';
-
-console.log('[DEBUG-MATH] exports:', MathPlugin);
-console.log('[DEBUG-MATH] keys:', Object.keys(MathPlugin));
-import { diagram } from '@milkdown/plugin-diagram';
 import { slashFactory } from '@milkdown/plugin-slash';
-import { Ctx } from '@milkdown/ctx';
+import { Ctx, type MilkdownPlugin } from '@milkdown/ctx';
 import { useAppStore } from '@/store/useAppStore';
 import {
     toggleStrongCommand,
@@ -39,6 +33,38 @@ interface MilkdownEditorProps {
     onChange: (markdown: string) => void;
 }
 
+type OptionalPlugin = 'math' | 'prism' | 'diagram';
+type LoadedPlugins = Partial<Record<OptionalPlugin, MilkdownPlugin | MilkdownPlugin[]>>;
+
+// Plugins that only matter once the document uses them. The editor is built
+// with the ones the initial content needs; another is loaded once its syntax
+// appears while editing. Milkdown cannot add plugins to a live editor, so such
+// a plugin is only added, by rebuilding the editor, once the editor has lost
+// focus.
+const OPTIONAL_PLUGINS: Record<OptionalPlugin, { test: RegExp; load: () => Promise<MilkdownPlugin | MilkdownPlugin[]> }> = {
+    math: { test: /\$/, load: () => import('@milkdown/plugin-math').then((mod) => mod.math) },
+    prism: { test: /^\s*(```|~~~)/m, load: () => import('@milkdown/plugin-prism').then((mod) => mod.prism) },
+    diagram: { test: /^\s*(```|~~~)\s*mermaid/m, load: () => import('@milkdown/plugin-diagram').then((mod) => mod.diagram) },
+};
+
+const OPTIONAL_PLUGIN_NAMES = Object.keys(OPTIONAL_PLUGINS) as OptionalPlugin[];
+const PLUGIN_CHECK_DELAY_MS = 500;
+
+const neededPlugins = (content: string) => OPTIONAL_PLUGIN_NAMES.filter((name) => OPTIONAL_PLUGINS[name].test.test(content));
+
+// Plugins that fail to load are left out; the editor works without them
+const loadPlugins = async (names: OptionalPlugin[]): Promise<LoadedPlugins> => {
+    const loaded = await Promise.all(names.map(async (name) => {
+        try {
+            return [name, await OPTIONAL_PLUGINS[name].load()] as const;
+        } catch (error) {
+            console.error('[MilkdownEditor] Failed to load plugin:', name, error);
+            return null;
+        }
+    }));
+    return Object.fromEntries(loaded.filter((entry) => entry !== null));
+};
+
 const ToolbarButton: React.FC<{
     label: string;
     onClick: () => void;
@@ -87,15 +113,22 @@ const MilkdownToolbar: React.FC = () => {
     );
 };
 
-const MilkdownEditorContent: React.FC<MilkdownEditorProps> = ({ content, onChange }) => {
+interface MilkdownEditorContentProps extends MilkdownEditorProps {
+    plugins: LoadedPlugins;
+    onFocusChange: (focused: boolean) => void;
+}
+
+const MilkdownEditorContent: React.FC<MilkdownEditorContentProps> = ({ content, onChange, plugins, onFocusChange }) => {
     const { isDarkMode } = useAppStore();
     const slash = React.useMemo(() => slashFactory('slash'), []);
     const [loading, getEditor] = useInstance();
 
     const lastEmittedContent = React.useRef(content);
+    const selection = React.useRef<{ anchor: number; head: number } | null>(null);
 
+    // Rebuilt (from the current content) when optional plugins are added, which only happens without focus
     const editor = useEditor((root) => {
-        return Editor.make()
+        const instance = Editor.make()
             .config((ctx: Ctx) => {
                 ctx.set(rootCtx, root);
                 ctx.set(defaultValueCtx, content);
@@ -109,6 +142,9 @@ const MilkdownEditorContent: React.FC<MilkdownEditorProps> = ({ content, onChang
                         onChange(markdown);
                     }
                 });
+                ctx.get(listenerCtx).selectionUpdated((ctx: Ctx, current) => {
+                    selection.current = { anchor: current.anchor, head: current.head };
+                });
             })
             .config(nord)
             .use(commonmark)
@@ -116,11 +152,10 @@ const MilkdownEditorContent: React.FC<MilkdownEditorProps> = ({ content, onChang
             .use(listener)
             .use(history)
             .use(clipboard)
-            .use(prism)
-            .use(math)
-            .use(diagram)
             .use(slash);
-    }, []);
+        Object.values(plugins).forEach((plugin) => plugin && instance.use(plugin));
+        return instance;
+    }, [plugins]);
 
     React.useEffect(() => {
         if (loading || !content) return;
@@ -136,8 +171,30 @@ const MilkdownEditorContent: React.FC<MilkdownEditorProps> = ({ content, onChang
         }
     }, [content, loading, getEditor]);
 
+    // Put the selection back after a rebuild, so the caret is where the user left it
+    React.useEffect(() => {
+        if (loading || !selection.current) return;
+        const { anchor, head } = selection.current;
+        getEditor()?.action((ctx: Ctx) => {
+            const view = ctx.get(editorViewCtx);
+            const { doc } = view.state;
+            const clamp = (pos: number) => Math.min(pos, doc.content.size);
+            view.dispatch(view.state.tr.setSelection(TextSelection.between(doc.resolve(clamp(anchor)), doc.resolve(clamp(head)))));
+        });
+    }, [plugins, loading, getEditor]);
+
+    const handleFocus = () => onFocusChange(true);
+    const handleBlur = (event: React.FocusEvent<HTMLDivElement>) => {
+        // Moving to the toolbar keeps focus within the editor
+        if (!event.currentTarget.contains(event.relatedTarget as Node | null)) onFocusChange(false);
+    };
+
     return (
-        <div className="milkdown-editor-wrapper flex h-full w-full flex-col overflow-hidden rounded-xl bg-white dark:bg-neutral-900">
+        <div
+            className="milkdown-editor-wrapper flex h-full w-full flex-col overflow-hidden rounded-xl bg-white dark:bg-neutral-900"
+            onFocus={handleFocus}
+            onBlur={handleBlur}
+        >
             <MilkdownToolbar />
             <div
                 className="prose h-full max-w-none overflow-auto p-8 dark:prose-invert focus:outline-none"
@@ -149,9 +206,59 @@ const MilkdownEditorContent: React.FC<MilkdownEditorProps> = ({ content, onChang
 };
 
 export const MilkdownEditor: React.FC<MilkdownEditorProps> = (props) => {
+    // In the editor, and loaded but not yet in it
+    const [plugins, setPlugins] = React.useState<LoadedPlugins | null>(null);
+    const [available, setAvailable] = React.useState<LoadedPlugins>({});
+    const [focused, setFocused] = React.useState(false);
+
+    // Only the initial content picks the plugins the editor is first built with
+    React.useEffect(() => {
+        let cancelled = false;
+        loadPlugins(neededPlugins(props.content)).then((loaded) => {
+            if (!cancelled) setPlugins(loaded);
+        });
+        return () => {
+            cancelled = true;
+        };
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, []);
+
+    // Then load a plugin once the content starts using it (checked after a pause in typing)
+    const requested = React.useRef(new Set<OptionalPlugin>());
+    const built = plugins !== null;
+    React.useEffect(() => {
+        if (!built) return;
+        const timer = setTimeout(() => {
+            const missing = neededPlugins(props.content).filter((name) => !plugins?.[name] && !requested.current.has(name));
+            if (missing.length === 0) return;
+            missing.forEach((name) => requested.current.add(name));
+            loadPlugins(missing).then((loaded) => {
+                missing.filter((name) => !loaded[name]).forEach((name) => requested.current.delete(name)); // Retry later
+                setAvailable((current) => ({ ...current, ...loaded }));
+            });
+        }, PLUGIN_CHECK_DELAY_MS);
+        return () => clearTimeout(timer);
+        // `plugins` only grows from `available`, which this effect fills
+        // eslint-disable-next-line react-hooks/exhaustive-deps
+    }, [built, props.content]);
+
+    // Rebuilding loses the caret and undo history, so never while the user is typing
+    React.useEffect(() => {
+        if (focused) return;
+        setPlugins((current) => {
+            if (!current) return current;
+            const added = neededPlugins(props.content).filter((name) => !current[name] && available[name]);
+            if (added.length === 0) return current;
+            return { ...current, ...Object.fromEntries(added.map((name) => [name, available[name]])) };
+        });
+    }, [focused, available, props.content]);
+
+    // Wait for the plugins the initial content needs, so the editor is built once
+    if (!plugins) return null;
+
     return (
         <MilkdownProvider>
-            <MilkdownEditorContent {...props} />
+            <MilkdownEditorContent {...props} plugins={plugins} onFocusChange={setFocused} />
         </MilkdownProvider>
     );
 };
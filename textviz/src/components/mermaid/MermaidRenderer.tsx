@@ -1,7 +1,7 @@
 "use client";
 
-import React, { useEffect, useRef, useState } from 'react';
-import mermaid from 'mermaid';
+import React, { useCallback, useEffect, useRef, useState } from 'react';
+import { mermaidRenderService } from '@/lib/mermaid/renderService';
 import { TransformWrapper, TransformComponent, type ReactZoomPanPinchRef } from 'react-zoom-pan-pinch';
 import { AlertCircle } from 'lucide-react';
 
@@ -13,88 +13,84 @@ export function MermaidRenderer({ content }: MermaidRendererProps) {
   const ref = useRef<HTMLDivElement>(null);
   const transformRef = useRef<ReactZoomPanPinchRef | null>(null);
   const [error, setError] = useState<string | null>(null);
+  const shownSvg = useRef('');
+
+  // Put a rendered SVG on screen, sized to fill the preview
+  const showSvg = useCallback((svg: string) => {
+    const container = ref.current;
+    if (!container || shownSvg.current === svg) return;
+    const wasEmpty = !shownSvg.current;
+    shownSvg.current = svg;
+    container.innerHTML = svg;
+
+    const svgEl = container.querySelector('svg');
+    if (svgEl) {
+      // Use the rendered viewBox to fill the preview container
+      const w = svgEl.getAttribute('width');
+      const h = svgEl.getAttribute('height');
+      const vb = svgEl.getAttribute('viewBox');
+
+      // Ensure viewBox exists
+      if (!vb && w && h) {
+        svgEl.setAttribute('viewBox', `0 0 ${parseFloat(w)} ${parseFloat(h)}`);
+      }
 
-  useEffect(() => {
-    mermaid.initialize({
-      startOnLoad: false,
-      theme: 'default',
-      securityLevel: 'loose',
-    });
+      // Force natural size
+      svgEl.removeAttribute('width');
+      svgEl.removeAttribute('height');
+      svgEl.style.width = 'auto';
+      svgEl.style.height = 'auto';
+      svgEl.style.maxWidth = 'none';
+      svgEl.style.maxHeight = 'none';
+      svgEl.style.display = 'block';
+      svgEl.setAttribute('preserveAspectRatio', 'xMidYMid meet');
+
+      // Center a new diagram; keep the user's zoom and pan while editing one
+      if (wasEmpty && transformRef.current) {
+        transformRef.current.centerView(1, 0);
+      }
+    }
   }, []);
 
   useEffect(() => {
-    const renderDiagram = async () => {
-      if (!ref.current) return;
-
-      try {
-        // Clear previous content
-        ref.current.innerHTML = '';
-
-        // Clean up content: Remove ```mermaid wrapper if present and backticks
-        let cleanContent = content
-          .replace(/```mermaid/g, '')
-          .replace(/```/g, '')
-          .trim();
-
-        if (!cleanContent) {
-          ref.current.innerHTML = '';
-          setError(null);
-          return;
-        }
-
-        // Validate syntax first
-        await mermaid.parse(cleanContent);
+    // Diagrams rendered before show at once, without the debounce
+    const cached = mermaidRenderService.peek(content);
+    if (cached !== undefined) {
+      showSvg(cached);
+      setError(null);
+    }
 
-        const { svg } = await mermaid.render(`mermaid-${Date.now()}`, cleanContent);
-        ref.current.innerHTML = svg;
-
-        const svgEl = ref.current.querySelector('svg');
-        if (svgEl) {
-          // Use the rendered viewBox to fill the preview container
-          const w = svgEl.getAttribute('width');
-          const h = svgEl.getAttribute('height');
-          const vb = svgEl.getAttribute('viewBox');
-
-          // Ensure viewBox exists
-          if (!vb && w && h) {
-            svgEl.setAttribute('viewBox', `0 0 ${parseFloat(w)} ${parseFloat(h)}`);
-          }
-
-          // Force natural size
-          svgEl.removeAttribute('width');
-          svgEl.removeAttribute('height');
-          svgEl.style.width = 'auto';
-          svgEl.style.height = 'auto';
-          svgEl.style.maxWidth = 'none';
-          svgEl.style.maxHeight = 'none';
-          svgEl.style.display = 'block';
-          svgEl.setAttribute('preserveAspectRatio', 'xMidYMid meet');
+    const renderDiagram = async () => {
+      const result = await mermaidRenderService.render(content);
+      if (result.status === 'stale') return; // A newer edit is on its way
 
-          // Reset transform to 1:1 and center
-          if (transformRef.current) {
-            transformRef.current.centerView(1, 0);
-          }
-        }
+      if (result.status === 'rendered') {
+        showSvg(result.svg);
         setError(null);
-      } catch (err) {
-        // Suppress console error for expected syntax errors during typing
-        const errorMessage = err instanceof Error ? err.message : "Syntax Error";
-        if (errorMessage.includes('Parse error') || errorMessage.includes('UnknownDiagramError')) {
-          console.warn("Mermaid Syntax Error (handled):", errorMessage);
-        } else {
-          console.error("Mermaid Render Error:", err);
-        }
+        return;
+      }
 
-        setError(errorMessage);
+      // Keep the previous diagram on screen under the error
+      const errorMessage = result.message;
+      if (errorMessage.includes('Parse error') || errorMessage.includes('UnknownDiagramError')) {
+        // Suppress console error for expected syntax errors during typing
+        console.warn("Mermaid Syntax Error (handled):", errorMessage);
+      } else {
+        console.error("Mermaid Render Error:", errorMessage);
       }
+      setError(errorMessage);
     };
 
+    if (cached !== undefined) {
+      renderDiagram(); // Cache hit; settles immediately and supersedes older renders
+      return;
+    }
     const timeoutId = setTimeout(() => {
       renderDiagram();
     }, 500); // Debounce rendering
 
     return () => clearTimeout(timeoutId);
-  }, [content]);
+  }, [content, showSvg]);
 
   return (
     <div
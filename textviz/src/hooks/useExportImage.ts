@@ -1,8 +1,11 @@
 import { useCallback } from 'react';
-import { toPng, toSvg } from 'html-to-image';
+import { useAppStore } from '@/store/useAppStore';
+import type { ExportFormat } from '@/lib/export/exportImage';
 
 export function useExportImage() {
-  const downloadImage = useCallback(async (elementId: string, filename: string, format: 'png' | 'svg' = 'png') => {
+  const exportScale = useAppStore(state => state.exportScale);
+
+  const downloadImage = useCallback(async (elementId: string, filename: string, format: ExportFormat = 'png') => {
     const node = document.getElementById(elementId);
     if (!node) {
       console.error(`Element with id '${elementId}' not found`);
@@ -10,23 +13,14 @@ export function useExportImage() {
     }
 
     try {
-      let dataUrl;
-      const options = { cacheBust: true, backgroundColor: '#ffffff' }; // Ensure white background
-
-      if (format === 'svg') {
-        dataUrl = await toSvg(node, options);
-      } else {
-        dataUrl = await toPng(node, options);
-      }
-
-      const link = document.createElement('a');
-      link.download = `${filename}.${format}`;
-      link.href = dataUrl;
-      link.click();
+      // Loaded on first export; the header (and this hook) is on every page
+      const { downloadBlob, exportElement } = await import('@/lib/export/exportImage');
+      const blob = await exportElement(node, { format, scale: exportScale });
+      downloadBlob(blob, `${filename}.${format}`);
     } catch (error) {
       console.error('Failed to export image:', error);
     }
-  }, []);
+  }, [exportScale]);
 
   return { downloadImage };
 }
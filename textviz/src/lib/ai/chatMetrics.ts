@@ -0,0 +1,51 @@
+// Per-request timing of /api/chat.
+//
+// The route reports one ChatMetrics per completed response. Listeners added
+// with onChatMetrics receive them (to forward to a metrics backend, say); in
+// development they are also logged.
+
+export interface ChatMetrics {
+    docType?: string;
+    /** Time spent building the system prompt, including resolving the document context. */
+    promptBuildMs: number;
+    /** Whether the static policy prefix came from the cache. */
+    policyCached: boolean;
+    policyChars: number;
+    contextChars: number;
+    /** From the start of the request to the first streamed text. */
+    timeToFirstTokenMs?: number;
+    totalMs: number;
+    promptTokens?: number;
+    completionTokens?: number;
+    /** Completion tokens over the time from the first token to the end. */
+    tokensPerSecond?: number;
+    finishReason?: string;
+}
+
+type ChatMetricsListener = (metrics: ChatMetrics) => void;
+
+const listeners = new Set<ChatMetricsListener>();
+
+/** Receive the metrics of every chat response; returns a function that unsubscribes. */
+export function onChatMetrics(listener: ChatMetricsListener): () => void {
+    listeners.add(listener);
+    return () => listeners.delete(listener);
+}
+
+export function reportChatMetrics(metrics: ChatMetrics) {
+    if (process.env.NODE_ENV === 'development') {
+        const round = (value?: number) => (value === undefined ? '-' : Math.round(value));
+        console.info(
+            `[chat] prompt ${round(metrics.promptBuildMs)}ms (policy ${metrics.policyCached ? 'cached' : 'built'}), ` +
+            `first token ${round(metrics.timeToFirstTokenMs)}ms, total ${round(metrics.totalMs)}ms, ` +
+            `${round(metrics.tokensPerSecond)} tok/s`
+        );
+    }
+    listeners.forEach(listener => {
+        try {
+            listener(metrics);
+        } catch (error) {
+            console.error('[chatMetrics] Listener failed:', error);
+        }
+    });
+}
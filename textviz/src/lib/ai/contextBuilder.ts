@@ -1,43 +1,83 @@
 import { UserProfile } from '@/store/useTextieStore';
+import { LruCache } from '@/lib/documents/lruCache';
+import type { DocumentContext } from './documentContext';
 
-interface CurrentContext {
+export interface CurrentContext {
     docId?: string;
     docTitle?: string;
     docType?: string;
-    contentPreview?: string;
+    document?: DocumentContext;
     cursorPosition?: number;
 }
 
-export function buildSystemPrompt(userProfile: UserProfile, context: CurrentContext): string {
-    // Axis 1: User Profile & Tone
-    const persona = `You are Textie (텍스티), a smart, context-aware documentation assistant.
-Your goal is to help the user write, refine, and visualize their ideas.
-You speak in a ${userProfile.tone} tone and primarily use ${userProfile.language === 'ko' ? 'Korean' : 'English'}.
-User Role: ${userProfile.role}${userProfile.customRole ? ` (${userProfile.customRole})` : ''}.
-`;
+// The sections picked for this message (see documentContext.ts), with the outline of the rest
+function formatDocument(document: DocumentContext | undefined): string {
+    if (!document || document.chunks.length === 0) return 'Content:\n(Empty)\n';
+
+    const outline = document.outline.length > 0
+        ? `Outline:\n${document.outline.map(heading => `- ${heading}`).join('\n')}\n`
+        : '';
+    const partial = document.chunks.length < document.totalChunks
+        ? ` (${document.chunks.length} of ${document.totalChunks} sections, chosen by relevance to the latest message; the rest are not shown)`
+        : '';
+    const sections = document.chunks
+        .map(chunk => `\`\`\`\n${chunk.text}\n\`\`\``)
+        .join('\n');
+    return `${outline}Content${partial}:\n${sections}\n`;
+}
+
+// Prompt layout: the policy (persona, rules, navigation logic) depends only on
+// the document type and the user profile, so it comes first and is built once
+// per combination. The per-request document context follows it. Requests for
+// the same kind of document then share a byte-identical prefix, which the
+// provider can serve from its prompt cache.
+
+const policyCache = new LruCache<string, string>({ maxEntries: 200 });
+
+// The document type and the profile fields the policy uses. Keyed by these
+// themselves rather than a hash, so two profiles can never share an entry.
+const policyKey = (profile: UserProfile, docType: string | undefined) => JSON.stringify([
+    docType ?? '', profile.tone, profile.language, profile.role, profile.customRole ?? '', profile.avoid ?? [], profile.expertise ?? [],
+]);
 
-    // Axis 2: Current Document Context
-    const docContext = context.docId
+/** The static part of the system prompt, memoized by docType and profile. */
+export function getPolicyPrompt(userProfile: UserProfile, docType: string | undefined): { prompt: string; cached: boolean } {
+    const key = policyKey(userProfile, docType);
+    const cached = policyCache.get(key);
+    if (cached !== undefined) return { prompt: cached, cached: true };
+    const prompt = buildPolicyPrompt(userProfile, docType);
+    policyCache.set(key, prompt);
+    return { prompt, cached: false };
+}
+
+/** The per-request part of the system prompt: what the user is working on. */
+export function buildContextPrompt(context: CurrentContext): string {
+    return context.docId
         ? `\n[Current Document Context]
 Title: ${context.docTitle || 'Untitled'}
 Type: ${context.docType || 'Markdown'}
-Content Preview:
-\`\`\`
-${context.contentPreview || '(Empty)'}
-\`\`\`
-`
+${formatDocument(context.document)}`
         : `\n[Current Context]
 User is not currently editing a specific document.
+`;
+}
+
+function buildPolicyPrompt(userProfile: UserProfile, docType: string | undefined): string {
+    // Axis 1: User Profile & Tone
+    const persona = `You are Textie (텍스티), a smart, context-aware documentation assistant.
+Your goal is to help the user write, refine, and visualize their ideas.
+You speak in a ${userProfile.tone} tone and primarily use ${userProfile.language === 'ko' ? 'Korean' : 'English'}.
+User Role: ${userProfile.role}${userProfile.customRole ? ` (${userProfile.customRole})` : ''}.
 `;
 
     // Axis 3: Policy & Rules
     // Dynamic rules based on doc type
     let rules = '\n[Rules & Guidelines]\n';
-    if (context.docType === 'mermaid') {
+    if (docType === 'mermaid') {
         rules += `- When asked for a diagram, generate ONLY valid Mermaid syntax inside a \`\`\`mermaid\`\`\` block.
 - Keep diagrams simple and clear unless asked for complexity.
 `;
-    } else if (context.docType === 'latex') {
+    } else if (docType === 'latex') {
         rules += `- When asked for math, use LaTeX syntax inside $$ ... $$ blocks.
 - Explain the formula briefly if the user seems to be learning.
 `;
@@ -63,7 +103,7 @@ User is not currently editing a specific document.
     // We define the "Domain" for each editor type to help the AI decide when to switch.
     rules += `
 [Context & Navigation Logic]
-You are currently observing a document of type: **${context.docType || 'None/LandingPage'}**.
+You are currently observing a document of type: **${docType || 'None/LandingPage'}**.
 
 **Domains:**
 - **Markdown**: General text, reports, blogs, summaries, lists, code snippets (Python/JS).
@@ -100,5 +140,5 @@ You are currently observing a document of type: **${context.docType || 'None/Lan
 - Current: Mermaid, User: "Add another node" -> WRONG: [NAV_SUGGESTION] mermaid. -> RIGHT: Generate Code.
 `;
 
-    return `${persona}${docContext}${rules}\nRemember: Respond quickly and accurately.`;
+    return `${persona}${rules}\nRemember: Respond quickly and accurately.\n`;
 }
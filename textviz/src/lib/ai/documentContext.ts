@@ -0,0 +1,232 @@
+// Picks the parts of the active document that Textie sees.
+//
+// The document is split into sections (Markdown headings, LaTeX sectioning
+// commands, Mermaid subgraphs), and long sections into chunks. The chunks are
+// scored against the user's message with BM25, and the best ones that fit in
+// CONTEXT_TOKEN_BUDGET are sent in document order, with an outline of all
+// headings. A document that fits the budget is sent whole.
+//
+// The selected chunks are sent in full with every message: the server keeps
+// nothing between requests, since consecutive requests may reach different
+// instances.
+
+import { tokenize } from '@/lib/search/searchIndex';
+
+export interface ContextChunk {
+    heading: string;
+    text: string;
+}
+
+export interface DocumentContext {
+    outline: string[];
+    chunks: ContextChunk[];
+    totalChunks: number;
+}
+
+interface Section {
+    heading: string;
+    text: string;
+}
+
+export const CONTEXT_TOKEN_BUDGET = 1500;
+const MAX_CHUNK_CHARS = 1600;
+const MAX_OUTLINE_ENTRIES = 40;
+const K1 = 1.2;
+const B = 0.75;
+
+/** Rough token count: about 4 characters per token for Latin text, fewer for Hangul and other scripts. */
+export const estimateTokens = (text: string) => {
+    const ascii = text.match(/[\x00-\x7f]/g)?.length ?? 0;
+    return Math.ceil(ascii / 4 + (text.length - ascii) / 1.5);
+};
+
+const MARKDOWN_HEADING = /^#{1,6}\s+(.*)$/;
+const LATEX_SECTION = /^\s*\\(?:part|chapter|section|subsection|subsubsection)\*?\{([^}]*)\}/;
+const MERMAID_SUBGRAPH = /^\s*subgraph\b\s*(.*)$/;
+
+function splitMarkdown(content: string): Section[] {
+    const sections: Section[] = [];
+    let current: Section = { heading: '', text: '' };
+    let inFence = false;
+    for (const line of content.split('\n')) {
+        if (/^\s*(```|~~~)/.test(line)) inFence = !inFence;
+        const heading = inFence ? null : line.match(MARKDOWN_HEADING);
+        if (heading) {
+            sections.push(current);
+            current = { heading: heading[1].trim(), text: '' };
+        }
+        current.text += `${line}\n`;
+    }
+    sections.push(current);
+    return sections;
+}
+
+function splitLatex(content: string): Section[] {
+    const sections: Section[] = [];
+    let current: Section = { heading: '', text: '' };
+    for (const line of content.split('\n')) {
+        const heading = line.match(LATEX_SECTION);
+        if (heading) {
+            sections.push(current);
+            current = { heading: heading[1].trim(), text: '' };
+        }
+        current.text += `${line}\n`;
+    }
+    sections.push(current);
+    return sections;
+}
+
+// Top-level subgraphs become sections; everything outside them stays together.
+function splitMermaid(content: string): Section[] {
+    const outside: Section = { heading: '', text: '' };
+    const sections: Section[] = [outside];
+    let current: Section | null = null;
+    let depth = 0;
+    for (const line of content.split('\n')) {
+        const subgraph = line.match(MERMAID_SUBGRAPH);
+        if (subgraph) {
+            if (depth++ === 0) {
+                current = { heading: `subgraph ${subgraph[1].trim()}`, text: '' };
+                sections.push(current);
+            }
+        } else if (depth > 0 && /^\s*end\s*$/.test(line)) {
+            depth--;
+            current!.text += `${line}\n`;
+            if (depth === 0) current = null;
+            continue;
+        }
+        (current ?? outside).text += `${line}\n`;
+    }
+    return sections;
+}
+
+// Lines of `text`, with lines longer than MAX_CHUNK_CHARS broken at spaces
+function splitLines(text: string): string[] {
+    return text.split('\n').flatMap(line => {
+        const pieces: string[] = [];
+        while (line.length > MAX_CHUNK_CHARS) {
+            const space = line.lastIndexOf(' ', MAX_CHUNK_CHARS);
+            const end = space > MAX_CHUNK_CHARS / 2 ? space : MAX_CHUNK_CHARS;
+            pieces.push(line.slice(0, end));
+            line = line.slice(end).trimStart();
+        }
+        pieces.push(line);
+        return pieces;
+    });
+}
+
+/** Split long sections at line breaks into chunks of at most MAX_CHUNK_CHARS. */
+function chunkSections(sections: Section[]): Section[] {
+    const chunks: Section[] = [];
+    for (const section of sections) {
+        const text = section.text.trim();
+        if (!text) continue;
+        let part = '';
+        for (const line of splitLines(text)) {
+            if (part && part.length + line.length + 1 > MAX_CHUNK_CHARS) {
+                chunks.push({ heading: section.heading, text: part });
+                part = '';
+            }
+            part = part ? `${part}\n${line}` : line;
+        }
+        if (part) chunks.push({ heading: section.heading, text: part });
+    }
+    return chunks;
+}
+
+export function splitDocument(content: string, docType?: string): Section[] {
+    const sections = docType === 'latex' ? splitLatex(content)
+        : docType === 'mermaid' ? splitMermaid(content)
+        : docType === 'markdown' ? splitMarkdown(content)
+        : [{ heading: '', text: content }];
+    return chunkSections(sections);
+}
+
+/** BM25 score of every chunk for `query`; query words match as prefixes, as in document search. */
+export function scoreChunks(chunks: Section[], query: string): number[] {
+    const words = [...new Set(tokenize(query))];
+    const scores = chunks.map(() => 0);
+    if (words.length === 0 || chunks.length === 0) return scores;
+
+    const termCounts = chunks.map(chunk => {
+        const counts = new Map<string, number>();
+        for (const token of tokenize(`${chunk.heading}\n${chunk.text}`)) counts.set(token, (counts.get(token) ?? 0) + 1);
+        return counts;
+    });
+    const lengths = termCounts.map(counts => [...counts.values()].reduce((sum, n) => sum + n, 0));
+    const avgLength = lengths.reduce((sum, n) => sum + n, 0) / chunks.length || 1;
+
+    for (const word of words) {
+        const tfs = termCounts.map(counts => {
+            let tf = 0;
+            counts.forEach((n, term) => {
+                if (term.startsWith(word)) tf += n;
+            });
+            return tf;
+        });
+        const df = tfs.filter(tf => tf > 0).length;
+        if (df === 0) continue;
+        const idf = Math.log(1 + (chunks.length - df + 0.5) / (df + 0.5));
+        tfs.forEach((tf, i) => {
+            if (tf === 0) return;
+            const norm = tf + K1 * (1 - B + B * (lengths[i] / avgLength));
+            scores[i] += idf * (tf * (K1 + 1)) / norm;
+        });
+    }
+    return scores;
+}
+
+/**
+ * Indexes of the chunks to send, in document order: the best-scoring ones
+ * that fit in `budget` tokens. The opening chunk (title, preamble or diagram
+ * type) comes first when it is short; without any match, the document is
+ * taken from the top.
+ */
+export function selectChunks(chunks: Section[], query: string, budget = CONTEXT_TOKEN_BUDGET): number[] {
+    const sizes = chunks.map(chunk => estimateTokens(chunk.text));
+    if (sizes.reduce((sum, n) => sum + n, 0) <= budget) return chunks.map((_, i) => i);
+
+    const scores = scoreChunks(chunks, query);
+    const order = chunks
+        .map((_, i) => i)
+        .filter(i => scores[i] > 0)
+        .sort((a, b) => scores[b] - scores[a] || a - b);
+    if (order.length === 0) order.push(...chunks.keys());
+    if (chunks.length > 0 && sizes[0] <= budget / 4) order.unshift(0);
+
+    const selected = new Set<number>();
+    let used = 0;
+    for (const i of order) {
+        if (selected.has(i) || used + sizes[i] > budget) continue;
+        selected.add(i);
+        used += sizes[i];
+    }
+    return [...selected].sort((a, b) => a - b);
+}
+
+/** The context of a message: the sections of `content` most relevant to `query`, and the outline. */
+export function buildDocumentContext(content: string, docType: string | undefined, query: string): DocumentContext {
+    const chunks = splitDocument(content, docType);
+    const outline = chunks
+        .map(chunk => chunk.heading)
+        .filter((heading, i, all) => heading && heading !== all[i - 1])
+        .slice(0, MAX_OUTLINE_ENTRIES);
+    return {
+        outline,
+        chunks: selectChunks(chunks, query).map(i => chunks[i]),
+        totalChunks: chunks.length,
+    };
+}
+
+/** Check a context received from a client; returns undefined when it is malformed or over the budget. */
+export function parseDocumentContext(value: unknown): DocumentContext | undefined {
+    const context = value as Partial<DocumentContext> | null | undefined;
+    const isChunk = (chunk: unknown) => typeof (chunk as ContextChunk)?.heading === 'string'
+        && typeof (chunk as ContextChunk)?.text === 'string';
+    if (!Array.isArray(context?.outline) || !context.outline.every(heading => typeof heading === 'string')) return undefined;
+    if (!Array.isArray(context.chunks) || !context.chunks.every(isChunk)) return undefined;
+    if (typeof context.totalChunks !== 'number') return undefined;
+    const tokens = context.chunks.reduce((sum, chunk) => sum + estimateTokens(chunk.text), 0);
+    if (tokens > CONTEXT_TOKEN_BUDGET) return undefined;
+    return { outline: context.outline, chunks: context.chunks, totalChunks: context.totalChunks };
+}
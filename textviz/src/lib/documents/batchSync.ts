@@ -0,0 +1,84 @@
+// Uploads items in batches with a cap on concurrent requests.
+//
+// Batches are limited by item count and by approximate payload size, so a
+// few very large documents do not end up in one oversized request. A failed
+// batch does not stop the others; its items are reported back for a retry.
+
+export interface SyncProgress {
+  total: number;
+  synced: number;
+  failed: number;
+}
+
+export interface BatchSyncOptions<T> {
+  upload: (batch: T[]) => Promise<void>;
+  /** Called after each batch with the items it covered, e.g. to record them as synced. */
+  onBatchDone?: (batch: T[]) => Promise<void> | void;
+  onProgress?: (progress: SyncProgress) => void;
+  sizeOf?: (item: T) => number;
+  batchSize?: number;
+  maxBatchBytes?: number;
+  concurrency?: number;
+}
+
+export const makeBatches = <T>(
+  items: T[],
+  batchSize: number,
+  maxBatchBytes: number,
+  sizeOf: (item: T) => number,
+): T[][] => {
+  const batches: T[][] = [];
+  let current: T[] = [];
+  let bytes = 0;
+  for (const item of items) {
+    const size = sizeOf(item);
+    if (current.length > 0 && (current.length >= batchSize || bytes + size > maxBatchBytes)) {
+      batches.push(current);
+      current = [];
+      bytes = 0;
+    }
+    current.push(item);
+    bytes += size;
+  }
+  if (current.length > 0) batches.push(current);
+  return batches;
+};
+
+export async function syncInBatches<T>(items: T[], options: BatchSyncOptions<T>) {
+  const {
+    upload,
+    onBatchDone,
+    onProgress,
+    sizeOf = () => 0,
+    batchSize = 100,
+    maxBatchBytes = 2 * 1024 * 1024,
+    concurrency = 3,
+  } = options;
+
+  const batches = makeBatches(items, batchSize, maxBatchBytes, sizeOf);
+  const progress: SyncProgress = { total: items.length, synced: 0, failed: 0 };
+  const synced: T[] = [];
+  const failed: T[] = [];
+  onProgress?.({ ...progress });
+
+  let next = 0;
+  const worker = async () => {
+    while (next < batches.length) {
+      const batch = batches[next++];
+      try {
+        await upload(batch);
+        await onBatchDone?.(batch);
+        synced.push(...batch);
+        progress.synced += batch.length;
+      } catch (error) {
+        console.error('[batchSync] Batch failed:', error);
+        failed.push(...batch);
+        progress.failed += batch.length;
+      }
+      onProgress?.({ ...progress });
+    }
+  };
+
+  await Promise.all(Array.from({ length: Math.min(concurrency, batches.length) }, worker));
+  return { synced, failed };
+}
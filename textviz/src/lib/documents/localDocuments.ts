@@ -0,0 +1,228 @@
+// IndexedDB storage for documents in local (signed-out) mode.
+//
+// Metadata and content live in separate object stores, one record per
+// document each, so renaming or editing a document only rewrites that
+// document's records instead of the whole collection, and listing documents
+// reads only the metadata (which carries a short preview and word count). Documents saved by
+// older versions under the `textviz-documents` localStorage key are moved
+// into IndexedDB the first time the database is opened. Browsers without
+// IndexedDB fall back to that key.
+
+import type { Document } from '@/store/useDocumentStore';
+import { countWords, makePreview } from './preview';
+
+export const LEGACY_STORAGE_KEY = 'textviz-documents';
+
+const DB_NAME = 'textviz';
+const DB_VERSION = 2; // 2: preview and wordCount in metadata records
+const META_STORE = 'documents';
+const CONTENT_STORE = 'contents';
+
+export type DocumentMeta = Omit<Document, 'content' | 'isContentLoaded'>;
+type ContentRecord = { id: string; content: string };
+export type DocumentPatch = Partial<Pick<Document, 'title' | 'content' | 'metadata' | 'updatedAt'>>;
+
+const hasIndexedDB = () => typeof indexedDB !== 'undefined';
+
+const summarize = (content: string) => ({ preview: makePreview(content), wordCount: countWords(content) });
+
+const splitDocument = ({ content, ...meta }: Document): [DocumentMeta, ContentRecord] => {
+  delete meta.isContentLoaded; // UI state, not stored
+  return [{ ...meta, ...summarize(content) }, { id: meta.id, content }];
+};
+
+const requestResult = <T>(request: IDBRequest<T>) =>
+  new Promise<T>((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+
+const transactionDone = (tx: IDBTransaction) =>
+  new Promise<void>((resolve, reject) => {
+    tx.oncomplete = () => resolve();
+    tx.onerror = () => reject(tx.error);
+    tx.onabort = () => reject(tx.error);
+  });
+
+// Legacy single-key storage
+const readLegacy = (): Document[] => {
+  const stored = localStorage.getItem(LEGACY_STORAGE_KEY);
+  return stored ? JSON.parse(stored) : [];
+};
+
+const writeLegacy = (docs: Document[]) => {
+  localStorage.setItem(LEGACY_STORAGE_KEY, JSON.stringify(docs));
+};
+
+const migrateLegacy = async (db: IDBDatabase) => {
+  const legacy = readLegacy();
+  if (legacy.length > 0) {
+    const tx = db.transaction([META_STORE, CONTENT_STORE], 'readwrite');
+    for (const doc of legacy) {
+      const [meta, content] = splitDocument({ ...doc, isLocal: true });
+      tx.objectStore(META_STORE).put(meta);
+      tx.objectStore(CONTENT_STORE).put(content);
+    }
+    await transactionDone(tx);
+    console.log('[localDocuments] Migrated', legacy.length, 'documents from localStorage');
+  }
+  // Only removed once the copy is committed, so a failed migration is retried on the next load.
+  localStorage.removeItem(LEGACY_STORAGE_KEY);
+};
+
+let dbPromise: Promise<IDBDatabase> | null = null;
+
+const openDatabase = (): Promise<IDBDatabase> => {
+  dbPromise ??= new Promise<IDBDatabase>((resolve, reject) => {
+    const request = indexedDB.open(DB_NAME, DB_VERSION);
+    request.onupgradeneeded = (event) => {
+      const db = request.result;
+      if (!db.objectStoreNames.contains(META_STORE)) db.createObjectStore(META_STORE, { keyPath: 'id' });
+      if (!db.objectStoreNames.contains(CONTENT_STORE)) db.createObjectStore(CONTENT_STORE, { keyPath: 'id' });
+
+      if (event.oldVersion === 1) {
+        // Version 1 metadata has no preview or word count; derive them from the content.
+        const tx = request.transaction!;
+        const metas = tx.objectStore(META_STORE);
+        const cursorRequest = tx.objectStore(CONTENT_STORE).openCursor();
+        cursorRequest.onsuccess = () => {
+          const cursor = cursorRequest.result;
+          if (!cursor) return;
+          const { id, content } = cursor.value as ContentRecord;
+          const get = metas.get(id);
+          get.onsuccess = () => {
+            if (get.result) metas.put({ ...get.result, ...summarize(content) });
+          };
+          cursor.continue();
+        };
+      }
+    };
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  }).then(async db => {
+    await migrateLegacy(db);
+    return db;
+  });
+  dbPromise.catch(() => {
+    dbPromise = null; // Let the next call try again
+  });
+  return dbPromise;
+};
+
+const byUpdatedDesc = (a: { updatedAt: number }, b: { updatedAt: number }) => b.updatedAt - a.updatedAt;
+
+/** Metadata of all local documents, most recently updated first; content is not loaded. */
+export const listMeta = async (): Promise<Document[]> => {
+  if (typeof window === 'undefined') return [];
+  if (!hasIndexedDB()) return readLegacy().sort(byUpdatedDesc);
+
+  const db = await openDatabase();
+  const tx = db.transaction(META_STORE, 'readonly');
+  const metas = await requestResult(tx.objectStore(META_STORE).getAll() as IDBRequest<DocumentMeta[]>);
+  return metas
+    .map(meta => ({ ...meta, content: '', isContentLoaded: false }))
+    .sort(byUpdatedDesc);
+};
+
+export const getContent = async (id: string): Promise<string | null> => {
+  if (!hasIndexedDB()) return readLegacy().find(d => d.id === id)?.content ?? null;
+
+  const db = await openDatabase();
+  const tx = db.transaction(CONTENT_STORE, 'readonly');
+  const record = await requestResult(tx.objectStore(CONTENT_STORE).get(id) as IDBRequest<ContentRecord | undefined>);
+  return record?.content ?? null;
+};
+
+/** All local documents with their content, most recently updated first. */
+export const loadAll = async (): Promise<Document[]> => {
+  if (typeof window === 'undefined') return [];
+  if (!hasIndexedDB()) return readLegacy();
+
+  const db = await openDatabase();
+  const tx = db.transaction([META_STORE, CONTENT_STORE], 'readonly');
+  const [metas, contents] = await Promise.all([
+    requestResult(tx.objectStore(META_STORE).getAll() as IDBRequest<DocumentMeta[]>),
+    requestResult(tx.objectStore(CONTENT_STORE).getAll() as IDBRequest<ContentRecord[]>),
+  ]);
+  const contentById = new Map(contents.map(c => [c.id, c.content]));
+  return metas
+    .map(meta => ({ ...meta, content: contentById.get(meta.id) ?? '' }))
+    .sort(byUpdatedDesc);
+};
+
+export const put = async (doc: Document) => {
+  if (!hasIndexedDB()) {
+    writeLegacy([doc, ...readLegacy().filter(d => d.id !== doc.id)]);
+    return;
+  }
+  const db = await openDatabase();
+  const tx = db.transaction([META_STORE, CONTENT_STORE], 'readwrite');
+  const [meta, content] = splitDocument(doc);
+  tx.objectStore(META_STORE).put(meta);
+  tx.objectStore(CONTENT_STORE).put(content);
+  await transactionDone(tx);
+};
+
+/** Apply a partial update, touching only the records the patch changes. */
+export const update = async (id: string, patch: DocumentPatch) => {
+  if (!hasIndexedDB()) {
+    writeLegacy(readLegacy().map(d => (d.id === id ? { ...d, ...patch } : d)));
+    return;
+  }
+  const db = await openDatabase();
+  const { content, ...rest } = patch;
+  const metaPatch = content !== undefined ? { ...rest, ...summarize(content) } : rest;
+  const stores = content !== undefined ? [META_STORE, CONTENT_STORE] : [META_STORE];
+  const tx = db.transaction(stores, 'readwrite');
+  const done = transactionDone(tx);
+
+  if (content !== undefined) {
+    tx.objectStore(CONTENT_STORE).put({ id, content });
+  }
+  if (Object.keys(metaPatch).length > 0) {
+    const metaStore = tx.objectStore(META_STORE);
+    const meta = await requestResult(metaStore.get(id) as IDBRequest<DocumentMeta | undefined>);
+    if (meta) metaStore.put({ ...meta, ...metaPatch });
+  }
+  await done;
+};
+
+export const remove = async (id: string) => {
+  if (!hasIndexedDB()) {
+    writeLegacy(readLegacy().filter(d => d.id !== id));
+    return;
+  }
+  const db = await openDatabase();
+  const tx = db.transaction([META_STORE, CONTENT_STORE], 'readwrite');
+  tx.objectStore(META_STORE).delete(id);
+  tx.objectStore(CONTENT_STORE).delete(id);
+  await transactionDone(tx);
+};
+
+/** Delete several documents in one transaction, e.g. those a sync has uploaded. */
+export const removeMany = async (ids: string[]) => {
+  if (!hasIndexedDB()) {
+    const removed = new Set(ids);
+    writeLegacy(readLegacy().filter(d => !removed.has(d.id)));
+    return;
+  }
+  const db = await openDatabase();
+  const tx = db.transaction([META_STORE, CONTENT_STORE], 'readwrite');
+  for (const id of ids) {
+    tx.objectStore(META_STORE).delete(id);
+    tx.objectStore(CONTENT_STORE).delete(id);
+  }
+  await transactionDone(tx);
+};
+
+export const clear = async () => {
+  if (!hasIndexedDB()) {
+    localStorage.removeItem(LEGACY_STORAGE_KEY);
+    return;
+  }
+  const db = await openDatabase();
+  const tx = db.transaction([META_STORE, CONTENT_STORE], 'readwrite');
+  tx.objectStore(META_STORE).clear();
+  tx.objectStore(CONTENT_STORE).clear();
+  await transactionDone(tx);
+};
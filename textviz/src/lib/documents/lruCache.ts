@@ -0,0 +1,72 @@
+// Least-recently-used cache bounded by entry count and, optionally, total size.
+// Relies on Map keeping insertion order: the first key is the least recently used.
+
+export interface LruCacheOptions<K, V> {
+  maxEntries: number;
+  /** Upper bound on the summed `sizeOf` of all entries. */
+  maxSize?: number;
+  sizeOf?: (value: V) => number;
+  /** Called for entries pushed out by newer ones (not for delete or clear). */
+  onEvict?: (key: K, value: V) => void;
+}
+
+export class LruCache<K, V> {
+  private entries = new Map<K, V>();
+  private totalSize = 0;
+
+  constructor(private readonly options: LruCacheOptions<K, V>) {}
+
+  get size() {
+    return this.entries.size;
+  }
+
+  /** Look up `key` and mark it most recently used. */
+  get(key: K): V | undefined {
+    const value = this.entries.get(key);
+    if (value === undefined) return undefined;
+    this.entries.delete(key);
+    this.entries.set(key, value);
+    return value;
+  }
+
+  /** Look up `key` without touching its recency. */
+  peek(key: K): V | undefined {
+    return this.entries.get(key);
+  }
+
+  set(key: K, value: V) {
+    this.delete(key);
+    this.entries.set(key, value);
+    this.totalSize += this.sizeOf(value);
+    this.evict();
+  }
+
+  delete(key: K) {
+    const value = this.entries.get(key);
+    if (value === undefined) return;
+    this.entries.delete(key);
+    this.totalSize -= this.sizeOf(value);
+  }
+
+  clear() {
+    this.entries.clear();
+    this.totalSize = 0;
+  }
+
+  private sizeOf(value: V) {
+    return this.options.sizeOf ? this.options.sizeOf(value) : 0;
+  }
+
+  private evict() {
+    const { maxEntries, maxSize = Infinity, onEvict } = this.options;
+    // The newest entry always stays, even if it alone exceeds maxSize.
+    while (this.entries.size > 1 && (this.entries.size > maxEntries || this.totalSize > maxSize)) {
+      const oldest = this.entries.keys().next();
+      if (oldest.done) break;
+      const key = oldest.value;
+      const value = this.entries.get(key)!;
+      this.delete(key);
+      onEvict?.(key, value);
+    }
+  }
+}
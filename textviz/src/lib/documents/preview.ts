@@ -0,0 +1,19 @@
+import type { Document } from '@/store/useDocumentStore';
+
+// Stored with each document's metadata so listings can show a snippet and a
+// word count without loading the content.
+export const PREVIEW_LENGTH = 240;
+
+export const makePreview = (content: string) => content.slice(0, PREVIEW_LENGTH);
+
+export const countWords = (content: string) => {
+  const trimmed = content.trim();
+  return trimmed ? trimmed.split(/\s+/).length : 0;
+};
+
+/** Snippet for listings: from the content when it is loaded, else the stored preview. */
+export const documentPreview = (doc: Document) =>
+  doc.isContentLoaded === false ? doc.preview ?? '' : makePreview(doc.content);
+
+export const documentWordCount = (doc: Document) =>
+  doc.isContentLoaded === false ? doc.wordCount ?? 0 : countWords(doc.content);
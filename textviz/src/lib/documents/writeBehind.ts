@@ -0,0 +1,126 @@
+// Write-behind queue for document edits.
+//
+// Editors call updateDocument on every change. Instead of persisting each
+// call, patches are merged per document and written later: after the user
+// pauses (idle), at least every `maxWaitMs` while they keep typing, and right
+// away when the tab is hidden or unloaded. Each document has at most one
+// write in flight; edits made during that write are sent by the next flush.
+
+export interface WriteBehindOptions {
+  /** Quiet period after the last edit before a flush is scheduled. */
+  debounceMs?: number;
+  /** Upper bound on how long an edit may sit unwritten during continuous typing. */
+  maxWaitMs?: number;
+  /** Delay before retrying a failed write. */
+  retryMs?: number;
+}
+
+export type PersistFn<P> = (id: string, patch: P) => Promise<void>;
+
+export class WriteBehindQueue<P extends object> {
+  private pending = new Map<string, P>();
+  private inFlight = new Map<string, Promise<void>>();
+  private debounceTimer: ReturnType<typeof setTimeout> | null = null;
+  private maxWaitTimer: ReturnType<typeof setTimeout> | null = null;
+  private readonly debounceMs: number;
+  private readonly maxWaitMs: number;
+  private readonly retryMs: number;
+
+  constructor(private readonly persist: PersistFn<P>, options: WriteBehindOptions = {}) {
+    this.debounceMs = options.debounceMs ?? 800;
+    this.maxWaitMs = options.maxWaitMs ?? 5000;
+    this.retryMs = options.retryMs ?? 3000;
+
+    if (typeof window !== 'undefined') {
+      const flushNow = () => { void this.flush(); };
+      document.addEventListener('visibilitychange', () => {
+        if (document.visibilityState === 'hidden') flushNow();
+      });
+      window.addEventListener('pagehide', flushNow);
+      window.addEventListener('beforeunload', flushNow);
+    }
+  }
+
+  /** Merge `patch` into the document's pending changes and schedule a flush. */
+  enqueue(id: string, patch: P) {
+    this.pending.set(id, { ...this.pending.get(id), ...patch } as P);
+    this.schedule();
+  }
+
+  /** Changes not yet handed to `persist` for a document, if any. */
+  peek(id: string): P | undefined {
+    return this.pending.get(id);
+  }
+
+  /** Whether anything (for one document, or any) is queued or being written. */
+  hasPending(id?: string) {
+    if (id !== undefined) return this.pending.has(id) || this.inFlight.has(id);
+    return this.pending.size > 0 || this.inFlight.size > 0;
+  }
+
+  /** Drop queued changes, e.g. when the document is deleted. */
+  discard(id: string) {
+    this.pending.delete(id);
+  }
+
+  /**
+   * Write queued changes (all documents, or just `id`) and wait for them,
+   * including writes that were already in flight.
+   */
+  async flush(id?: string): Promise<void> {
+    if (id === undefined) this.clearTimers();
+    const ids = id === undefined ? [...new Set([...this.pending.keys(), ...this.inFlight.keys()])] : [id];
+    await Promise.all(ids.map(docId => this.flushOne(docId)));
+  }
+
+  private async flushOne(id: string): Promise<void> {
+    // Wait for the running write first; its successor picks up whatever queued meanwhile.
+    const running = this.inFlight.get(id);
+    if (running) await running;
+    if (this.inFlight.has(id)) return this.flushOne(id);
+
+    const patch = this.pending.get(id);
+    if (!patch) return;
+    this.pending.delete(id);
+
+    const write = this.persist(id, patch)
+      .catch(error => {
+        console.error('[writeBehind] Failed to persist document:', id, error);
+        // Keep the failed changes underneath anything edited since, and try again later.
+        this.pending.set(id, { ...patch, ...this.pending.get(id) } as P);
+        this.schedule(this.retryMs);
+      })
+      .finally(() => {
+        this.inFlight.delete(id);
+      });
+    this.inFlight.set(id, write);
+    await write;
+  }
+
+  private schedule(delay = this.debounceMs) {
+    if (typeof window === 'undefined') return;
+
+    if (this.debounceTimer) clearTimeout(this.debounceTimer);
+    this.debounceTimer = setTimeout(() => this.flushWhenIdle(), delay);
+
+    if (!this.maxWaitTimer) {
+      this.maxWaitTimer = setTimeout(() => { void this.flush(); }, this.maxWaitMs);
+    }
+  }
+
+  private flushWhenIdle() {
+    this.debounceTimer = null;
+    if (typeof window.requestIdleCallback === 'function') {
+      window.requestIdleCallback(() => { void this.flush(); }, { timeout: 1000 });
+    } else {
+      void this.flush();
+    }
+  }
+
+  private clearTimers() {
+    if (this.debounceTimer) clearTimeout(this.debounceTimer);
+    if (this.maxWaitTimer) clearTimeout(this.maxWaitTimer);
+    this.debounceTimer = null;
+    this.maxWaitTimer = null;
+  }
+}
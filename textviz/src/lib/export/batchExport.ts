@@ -0,0 +1,97 @@
+// Exports many documents into one ZIP, one image per document.
+//
+// Documents are rendered without their editor page: Mermaid through the
+// shared render service (and its SVG cache), LaTeX with the block renderer,
+// and Markdown as static markup of the preview component. HTML output is laid
+// out in a hidden host element just long enough to be measured and serialized.
+// Loaded on demand from the repository page.
+
+import { createElement } from 'react';
+import 'katex/dist/katex.min.css';
+import type { DocumentType } from '@/store/useDocumentStore';
+import { mermaidRenderService } from '@/lib/mermaid/renderService';
+import { exportElement, exportSvgMarkup, type ExportOptions } from './exportImage';
+import { createZip, type ZipEntry } from './zip';
+
+export interface BatchDocument {
+  title: string;
+  type: DocumentType;
+  content: string;
+}
+
+const PAGE_WIDTH = 768; // Matches the LaTeX preview's paper width
+
+async function renderHtml(doc: BatchDocument): Promise<string | null> {
+  if (doc.type === 'latex') {
+    const { renderLatexBlocks } = await import('@/lib/latex/renderLatex');
+    const blocks = renderLatexBlocks(doc.content)
+      .map(block => `<div class="latex-block">${block.html}</div>`)
+      .join('');
+    return `<div class="latex-document bg-white rounded-lg text-neutral-900" style="padding: 3rem">${blocks}</div>`;
+  }
+  if (doc.type === 'markdown') {
+    const [{ renderToStaticMarkup }, { MarkdownRenderer }] = await Promise.all([
+      import('react-dom/server'),
+      import('@/components/markdown/MarkdownRenderer'),
+    ]);
+    return renderToStaticMarkup(createElement(MarkdownRenderer, { content: doc.content }));
+  }
+  return null;
+}
+
+async function exportDocument(doc: BatchDocument, options: ExportOptions): Promise<Blob | null> {
+  if (doc.type === 'mermaid') {
+    const result = await mermaidRenderService.render(doc.content);
+    if (result.status !== 'rendered' || !result.svg) return null;
+    return exportSvgMarkup(result.svg, options);
+  }
+
+  const html = await renderHtml(doc);
+  if (html === null) return null;
+  const host = document.createElement('div');
+  host.setAttribute('aria-hidden', 'true');
+  host.style.cssText = `position: fixed; left: -100000px; top: 0; width: ${PAGE_WIDTH}px;`;
+  host.innerHTML = html;
+  document.body.appendChild(host);
+  try {
+    return await exportElement(host.firstElementChild as HTMLElement, options);
+  } finally {
+    host.remove();
+  }
+}
+
+const fileName = (title: string, extension: string, used: Set<string>) => {
+  const base = title.replace(/[\\/:*?"<>|\u0000-\u001f]+/g, '_').trim() || 'untitled';
+  let name = `${base}.${extension}`;
+  for (let n = 2; used.has(name.toLowerCase()); n++) name = `${base} (${n}).${extension}`;
+  used.add(name.toLowerCase());
+  return name;
+};
+
+/**
+ * Render `docs` to images and pack them into a ZIP. Documents that fail to
+ * render (such as diagrams with syntax errors) are left out and reported.
+ */
+export async function exportDocumentsZip(
+  docs: BatchDocument[],
+  options: ExportOptions = {},
+  onProgress?: (done: number, total: number) => void,
+): Promise<{ zip: Blob; failed: string[] }> {
+  const format = options.format ?? 'png';
+  const entries: ZipEntry[] = [];
+  const failed: string[] = [];
+  const used = new Set<string>();
+
+  for (const [i, doc] of docs.entries()) {
+    try {
+      const blob = await exportDocument(doc, options);
+      if (blob) entries.push({ name: fileName(doc.title, format, used), data: new Uint8Array(await blob.arrayBuffer()) });
+      else failed.push(doc.title);
+    } catch (error) {
+      console.warn(`[batchExport] Could not export "${doc.title}":`, error);
+      failed.push(doc.title);
+    }
+    onProgress?.(i + 1, docs.length);
+  }
+  return { zip: createZip(entries), failed };
+}
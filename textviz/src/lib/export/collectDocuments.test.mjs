@@ -0,0 +1,37 @@
+import assert from 'node:assert/strict';
+import { describe, it } from 'node:test';
+import { LruCache } from '../documents/lruCache.ts';
+import { collectDocuments } from './collectDocuments.ts';
+
+const makeDocs = (count) => Array.from({ length: count }, (_, i) => ({ id: `doc-${i}`, title: `Doc ${i}` }));
+
+describe('collectDocuments', () => {
+  it('keeps every document when the store can only hold 20 of them', async () => {
+    // Like useDocumentStore: loading a document into a 20-entry cache unloads the oldest
+    const loaded = new Map();
+    const cache = new LruCache({ maxEntries: 20, onEvict: (id) => loaded.delete(id) });
+    const readContent = async (doc) => {
+      const content = `content of ${doc.id}`;
+      cache.set(doc.id, content);
+      loaded.set(doc.id, content);
+      return content;
+    };
+
+    const docs = makeDocs(25);
+    const result = await collectDocuments(docs, readContent);
+    assert.equal(loaded.size, 20);
+    assert.deepEqual(result.failed, []);
+    assert.deepEqual(result.docs, docs.map((doc) => ({ ...doc, content: `content of ${doc.id}` })));
+  });
+
+  it('reports documents that could not be loaded', async () => {
+    const readContent = async (doc) => {
+      if (doc.id === 'doc-1') return null;
+      if (doc.id === 'doc-2') throw new Error('offline');
+      return 'text';
+    };
+    const result = await collectDocuments(makeDocs(4), readContent);
+    assert.deepEqual(result.docs.map((doc) => doc.id), ['doc-0', 'doc-3']);
+    assert.deepEqual(result.failed, ['Doc 1', 'Doc 2']);
+  });
+});
@@ -0,0 +1,24 @@
+// Gathers the content of the documents to export, one at a time.
+//
+// Each document keeps the content read for it, rather than having it read back
+// from the store later: the store only holds a bounded number of loaded
+// documents, so loading many unloads the first ones again.
+
+export async function collectDocuments<T extends { title: string }>(
+  docs: T[],
+  readContent: (doc: T) => Promise<string | null>,
+): Promise<{ docs: (T & { content: string })[]; failed: string[] }> {
+  const collected: (T & { content: string })[] = [];
+  const failed: string[] = [];
+  for (const doc of docs) {
+    try {
+      const content = await readContent(doc);
+      if (content === null) failed.push(doc.title);
+      else collected.push({ ...doc, content });
+    } catch (error) {
+      console.warn(`[collectDocuments] Could not load "${doc.title}":`, error);
+      failed.push(doc.title);
+    }
+  }
+  return { docs: collected, failed };
+}
@@ -0,0 +1,5 @@
+// Export settings shown in the header. Kept apart from exportImage.ts, which
+// pages only load when something is exported.
+
+export const DEFAULT_EXPORT_SCALE = 2;
+export const EXPORT_SCALES = [1, 2, 3, 4];
@@ -0,0 +1,25 @@
+// Encodes export PNGs off the main thread.
+//
+// The main thread decodes the SVG (which needs the DOM) into an ImageBitmap
+// at the target size and transfers it here; drawing onto an OffscreenCanvas
+// and PNG encoding, the slow part for large scales, happen in this worker.
+
+import type { RasterizeRequest, RasterizeResponse } from './exportImage';
+
+self.onmessage = async (event: MessageEvent<RasterizeRequest>) => {
+  const { id, bitmap, background } = event.data;
+  let response: RasterizeResponse;
+  try {
+    const canvas = new OffscreenCanvas(bitmap.width, bitmap.height);
+    const context = canvas.getContext('2d')!;
+    context.fillStyle = background;
+    context.fillRect(0, 0, canvas.width, canvas.height);
+    context.drawImage(bitmap, 0, 0);
+    response = { id, blob: await canvas.convertToBlob({ type: 'image/png' }) };
+  } catch (error) {
+    response = { id, error: error instanceof Error ? error.message : String(error) };
+  } finally {
+    bitmap.close();
+  }
+  self.postMessage(response);
+};
@@ -0,0 +1,250 @@
+// Image export for the previews.
+//
+// - Mermaid diagrams are already SVG: the markup is serialized as it is and
+//   only given explicit dimensions, with no cloning or style inlining.
+// - HTML previews (LaTeX, Markdown) are serialized into an SVG <foreignObject>
+//   together with the page's CSS. Fonts are inlined as data URLs once per
+//   @font-face rule and reused by every later export.
+// - PNGs are the SVG drawn at `scale` times its CSS size. Encoding runs in
+//   export.worker.ts on an OffscreenCanvas, or on the main thread without one.
+
+import { DEFAULT_EXPORT_SCALE } from './constants';
+
+export type ExportFormat = 'png' | 'svg';
+
+export interface ExportOptions {
+  format?: ExportFormat;
+  /** Output pixels per CSS pixel (PNG only). */
+  scale?: number;
+}
+
+export interface SvgImage {
+  svg: string;
+  width: number;
+  height: number;
+}
+
+export type RasterizeRequest = { id: number; bitmap: ImageBitmap; background: string };
+export type RasterizeResponse = { id: number; blob: Blob } | { id: number; error: string };
+
+const BACKGROUND = '#ffffff';
+const MAX_CANVAS_AREA = 16384 * 16384; // Larger canvases fail to allocate
+const XHTML_NS = 'http://www.w3.org/1999/xhtml';
+
+const escapeAttribute = (value: string) =>
+  value.replace(/&/g, '&amp;').replace(/"/g, '&quot;').replace(/</g, '&lt;');
+
+const toDataUrl = (blob: Blob) => new Promise<string>((resolve, reject) => {
+  const reader = new FileReader();
+  reader.onload = () => resolve(reader.result as string);
+  reader.onerror = () => reject(reader.error);
+  reader.readAsDataURL(blob);
+});
+
+const fetchDataUrl = async (url: string) => {
+  const response = await fetch(url);
+  if (!response.ok) throw new Error(`${response.status} ${url}`);
+  return toDataUrl(await response.blob());
+};
+
+/** Give SVG markup explicit dimensions from its viewBox, `scale` times its size. */
+export function sizeSvg(markup: string, scale = 1): SvgImage {
+  const doc = new DOMParser().parseFromString(markup, 'image/svg+xml');
+  const svg = doc.documentElement;
+  if (svg.localName !== 'svg' || doc.getElementsByTagName('parsererror').length) {
+    throw new Error('Invalid SVG');
+  }
+
+  const viewBox = svg.getAttribute('viewBox')?.trim().split(/[\s,]+/).map(Number);
+  const width = viewBox?.[2] || parseFloat(svg.getAttribute('width') ?? '') || 0;
+  const height = viewBox?.[3] || parseFloat(svg.getAttribute('height') ?? '') || 0;
+  if (!width || !height) throw new Error('SVG has no size');
+
+  const size = { width: Math.ceil(width * scale), height: Math.ceil(height * scale) };
+  if (!viewBox) svg.setAttribute('viewBox', `0 0 ${width} ${height}`);
+  svg.setAttribute('width', String(size.width));
+  svg.setAttribute('height', String(size.height));
+  svg.setAttribute('style', `background-color: ${BACKGROUND}`); // Drops the preview's sizing
+  return { svg: new XMLSerializer().serializeToString(svg), ...size };
+}
+
+// Inlined @font-face rules, keyed by stylesheet URL and rule text
+const fontFaces = new Map<string, Promise<string>>();
+
+const inlineFontFace = (rule: CSSFontFaceRule, base: string) => {
+  const key = `${base}|${rule.cssText}`;
+  let inlined = fontFaces.get(key);
+  if (!inlined) {
+    inlined = (async () => {
+      const src = rule.style.getPropertyValue('src');
+      const match = src.match(/url\((['"]?)([^'")]+)\1\)\s*format\(['"]?woff2['"]?\)/) ?? src.match(/url\((['"]?)([^'")]+)\1\)/);
+      if (!match || match[2].startsWith('data:')) return rule.cssText;
+
+      const dataUrl = await fetchDataUrl(new URL(match[2], base).href);
+      const declarations = Array.from(rule.style)
+        .filter(property => property !== 'src')
+        .map(property => `${property}: ${rule.style.getPropertyValue(property)};`);
+      return `@font-face { ${declarations.join(' ')} src: url("${dataUrl}"); }`;
+    })();
+    inlined.catch(error => {
+      console.warn('[exportImage] Could not inline font:', error);
+      fontFaces.delete(key); // Retry on the next export
+    });
+    fontFaces.set(key, inlined);
+  }
+  return inlined.catch(() => '');
+};
+
+/** The page's CSS, with fonts inlined. KaTeX's fonts are only included for `katex` content. */
+async function pageCss(withKatex: boolean): Promise<string> {
+  const rules: string[] = [];
+  const fonts: Promise<string>[] = [];
+  for (const sheet of Array.from(document.styleSheets)) {
+    let sheetRules: CSSRuleList;
+    try {
+      sheetRules = sheet.cssRules;
+    } catch {
+      continue; // Cross-origin stylesheet
+    }
+    for (const rule of Array.from(sheetRules)) {
+      if (rule instanceof CSSFontFaceRule) {
+        const isKatex = rule.style.getPropertyValue('font-family').includes('KaTeX');
+        if (withKatex || !isKatex) fonts.push(inlineFontFace(rule, sheet.href ?? document.baseURI));
+      } else if (!(rule instanceof CSSImportRule)) {
+        rules.push(rule.cssText);
+      }
+    }
+  }
+  return [...(await Promise.all(fonts)), ...rules].join('\n');
+}
+
+/** Replace the sources of <img> elements with data URLs; SVG images cannot load them. */
+async function inlineImages(element: HTMLElement, markup: string) {
+  const sources = new Set(Array.from(element.querySelectorAll('img'), img => img.getAttribute('src') ?? ''));
+  for (const src of sources) {
+    if (!src || src.startsWith('data:')) continue;
+    try {
+      const dataUrl = await fetchDataUrl(new URL(src, document.baseURI).href);
+      markup = markup.split(`src="${escapeAttribute(src)}"`).join(`src="${dataUrl}"`);
+    } catch (error) {
+      console.warn('[exportImage] Could not inline image:', error);
+    }
+  }
+  return markup;
+}
+
+/** Serialize an HTML element and the page's CSS into an SVG of the element's size. */
+export async function htmlToSvg(element: HTMLElement, scale = 1): Promise<SvgImage> {
+  const width = Math.ceil(element.scrollWidth);
+  const height = Math.ceil(element.scrollHeight);
+  const [css, markup] = await Promise.all([
+    pageCss(!!element.querySelector('.katex')),
+    inlineImages(element, new XMLSerializer().serializeToString(element)),
+  ]);
+  const size = { width: Math.ceil(width * scale), height: Math.ceil(height * scale) };
+  const svg =
+    `<svg xmlns="http://www.w3.org/2000/svg" width="${size.width}" height="${size.height}" viewBox="0 0 ${width} ${height}">` +
+    `<foreignObject x="0" y="0" width="100%" height="100%">` +
+    `<div xmlns="${XHTML_NS}" style="width: ${width}px; height: ${height}px; background: ${BACKGROUND}">` +
+    `<style>${css.replace(/&/g, '&amp;').replace(/</g, '&lt;')}</style>${markup}</div>` +
+    `</foreignObject></svg>`;
+  return { svg, ...size };
+}
+
+class RasterizeClient {
+  private worker: Worker | null = null;
+  private workerFailed = false;
+  private nextId = 0;
+  private waiting = new Map<number, (response: RasterizeResponse | null) => void>();
+
+  async rasterize(image: SvgImage): Promise<Blob> {
+    if (image.width * image.height > MAX_CANVAS_AREA) throw new Error('Image is too large; lower the export scale');
+
+    const img = new Image(image.width, image.height);
+    img.src = `data:image/svg+xml;charset=utf-8,${encodeURIComponent(image.svg)}`;
+    await img.decode();
+
+    const worker = typeof OffscreenCanvas !== 'undefined' && typeof createImageBitmap !== 'undefined' ? this.getWorker() : null;
+    if (worker) {
+      try {
+        const bitmap = await createImageBitmap(img);
+        const id = ++this.nextId;
+        const response = await new Promise<RasterizeResponse | null>(resolve => {
+          this.waiting.set(id, resolve);
+          const request: RasterizeRequest = { id, bitmap, background: BACKGROUND };
+          worker.postMessage(request, [bitmap]);
+        });
+        if (response && 'blob' in response) return response.blob;
+        if (response) console.warn('[exportImage] Worker could not encode the PNG:', response.error);
+      } catch (error) {
+        console.warn('[exportImage] Encoding the PNG on the main thread:', error);
+      }
+    }
+    return this.rasterizeOnMainThread(img, image);
+  }
+
+  private rasterizeOnMainThread(img: HTMLImageElement, image: SvgImage) {
+    const canvas = document.createElement('canvas');
+    canvas.width = image.width;
+    canvas.height = image.height;
+    const context = canvas.getContext('2d')!;
+    context.fillStyle = BACKGROUND;
+    context.fillRect(0, 0, canvas.width, canvas.height);
+    context.drawImage(img, 0, 0, image.width, image.height);
+    return new Promise<Blob>((resolve, reject) => {
+      canvas.toBlob(blob => (blob ? resolve(blob) : reject(new Error('PNG encoding failed'))), 'image/png');
+    });
+  }
+
+  private getWorker() {
+    if (this.worker || this.workerFailed) return this.worker;
+    try {
+      this.worker = new Worker(new URL('./export.worker.ts', import.meta.url), { type: 'module' });
+      this.worker.onmessage = (event: MessageEvent<RasterizeResponse>) => {
+        const resolve = this.waiting.get(event.data.id);
+        this.waiting.delete(event.data.id);
+        resolve?.(event.data);
+      };
+      this.worker.onerror = (event) => {
+        console.warn('[exportImage] Export worker failed, encoding on the main thread:', event.message);
+        this.worker?.terminate();
+        this.worker = null;
+        this.workerFailed = true;
+        this.waiting.forEach(resolve => resolve(null));
+        this.waiting.clear();
+      };
+    } catch (error) {
+      console.warn('[exportImage] Web Worker unavailable, encoding on the main thread:', error);
+      this.workerFailed = true;
+    }
+    return this.worker;
+  }
+}
+
+const rasterizeClient = new RasterizeClient();
+
+const toBlob = async (toSvg: (scale: number) => Promise<SvgImage> | SvgImage, { format = 'png', scale = DEFAULT_EXPORT_SCALE }: ExportOptions) => {
+  if (format === 'svg') return new Blob([(await toSvg(1)).svg], { type: 'image/svg+xml' });
+  return rasterizeClient.rasterize(await toSvg(scale));
+};
+
+/** Export SVG markup, such as a rendered Mermaid diagram. */
+export const exportSvgMarkup = (markup: string, options: ExportOptions = {}) =>
+  toBlob(scale => sizeSvg(markup, scale), options);
+
+/** Export a rendered element. A preview holding a single SVG is exported as that SVG. */
+export const exportElement = (element: HTMLElement, options: ExportOptions = {}) => {
+  const svg = element.childElementCount === 1 ? element.querySelector(':scope > svg') : null;
+  if (svg) return exportSvgMarkup(new XMLSerializer().serializeToString(svg), options);
+  return toBlob(scale => htmlToSvg(element, scale), options);
+};
+
+/** Save `blob` as a download named `filename`. */
+export function downloadBlob(blob: Blob, filename: string) {
+  const url = URL.createObjectURL(blob);
+  const link = document.createElement('a');
+  link.download = filename;
+  link.href = url;
+  link.click();
+  setTimeout(() => URL.revokeObjectURL(url), 0);
+}
@@ -0,0 +1,87 @@
+// Minimal ZIP writer for batch exports.
+//
+// Entries are stored uncompressed: PNGs are already compressed, and exports
+// are downloaded once, so DEFLATE would cost time for little gain.
+
+export interface ZipEntry {
+  name: string;
+  data: Uint8Array;
+}
+
+const CRC_TABLE = (() => {
+  const table = new Uint32Array(256);
+  for (let n = 0; n < 256; n++) {
+    let c = n;
+    for (let k = 0; k < 8; k++) c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1;
+    table[n] = c >>> 0;
+  }
+  return table;
+})();
+
+export const crc32 = (data: Uint8Array): number => {
+  let crc = 0xffffffff;
+  for (let i = 0; i < data.length; i++) crc = CRC_TABLE[(crc ^ data[i]) & 0xff] ^ (crc >>> 8);
+  return (crc ^ 0xffffffff) >>> 0;
+};
+
+// MS-DOS date and time fields
+const dosDateTime = (date: Date) => ({
+  time: (date.getHours() << 11) | (date.getMinutes() << 5) | (date.getSeconds() >> 1),
+  date: ((date.getFullYear() - 1980) << 9) | ((date.getMonth() + 1) << 5) | date.getDate(),
+});
+
+/** Pack `entries` into a ZIP archive. */
+export function createZip(entries: ZipEntry[], modified = new Date()): Blob {
+  const encoder = new TextEncoder();
+  const { time, date } = dosDateTime(modified);
+  const parts: BlobPart[] = [];
+  const central: Uint8Array[] = [];
+  let offset = 0;
+
+  for (const entry of entries) {
+    const name = encoder.encode(entry.name);
+    const crc = crc32(entry.data);
+    const size = entry.data.length;
+
+    const local = new DataView(new ArrayBuffer(30));
+    local.setUint32(0, 0x04034b50, true); // Local file header signature
+    local.setUint16(4, 20, true); // Version needed
+    local.setUint16(6, 0x0800, true); // UTF-8 names
+    local.setUint16(8, 0, true); // Stored
+    local.setUint16(10, time, true);
+    local.setUint16(12, date, true);
+    local.setUint32(14, crc, true);
+    local.setUint32(18, size, true);
+    local.setUint32(22, size, true);
+    local.setUint16(26, name.length, true);
+    parts.push(local.buffer, name, entry.data);
+
+    const header = new DataView(new ArrayBuffer(46 + name.length));
+    header.setUint32(0, 0x02014b50, true); // Central directory header signature
+    header.setUint16(4, 20, true); // Version made by
+    header.setUint16(6, 20, true);
+    header.setUint16(8, 0x0800, true);
+    header.setUint16(10, 0, true);
+    header.setUint16(12, time, true);
+    header.setUint16(14, date, true);
+    header.setUint32(16, crc, true);
+    header.setUint32(20, size, true);
+    header.setUint32(24, size, true);
+    header.setUint16(28, name.length, true);
+    header.setUint32(42, offset, true);
+    new Uint8Array(header.buffer).set(name, 46);
+    central.push(new Uint8Array(header.buffer));
+
+    offset += 30 + name.length + size;
+  }
+
+  const centralSize = central.reduce((sum, header) => sum + header.length, 0);
+  const end = new DataView(new ArrayBuffer(22));
+  end.setUint32(0, 0x06054b50, true); // End of central directory signature
+  end.setUint16(8, entries.length, true);
+  end.setUint16(10, entries.length, true);
+  end.setUint32(12, centralSize, true);
+  end.setUint32(16, offset, true);
+
+  return new Blob([...parts, ...central, end.buffer], { type: 'application/zip' });
+}
@@ -0,0 +1,10 @@
+// Fast non-cryptographic string hash (32-bit FNV-1a) for cache keys.
+// Collisions are possible, so caches keyed by it compare the source on a hit.
+export const hashString = (text: string) => {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < text.length; i++) {
+    hash ^= text.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return (hash >>> 0).toString(36);
+};
@@ -4,6 +4,10 @@ export interface Translations {
   // Header
   header: {
     export: string;
+    exportScale: string;
+    exportAll: string;
+    exporting: string;
+    exportFailed: string;
   };
 
   // Navigation
@@ -25,6 +29,7 @@ export interface Translations {
     synced: string;
     document: string;
     documents_plural: string;
+    loadMore: string;
   };
 
   // Editor
@@ -128,6 +133,10 @@ export const translations: Record<Language, Translations> = {
   en: {
     header: {
       export: 'Export',
+      exportScale: 'PNG resolution',
+      exportAll: 'Export all',
+      exporting: 'Exporting',
+      exportFailed: 'Could not export',
     },
     nav: {
       markdown: 'Markdown',
@@ -145,6 +154,7 @@ export const translations: Record<Language, Translations> = {
       synced: 'Synced',
       document: 'document',
       documents_plural: 'documents',
+      loadMore: 'Load more',
     },
     editor: {
       autoSaved: 'Auto-saved',
@@ -234,6 +244,10 @@ export const translations: Record<Language, Translations> = {
   ko: {
     header: {
       export: '내보내기',
+      exportScale: 'PNG 해상도',
+      exportAll: '모두 내보내기',
+      exporting: '내보내는 중',
+      exportFailed: '내보내지 못한 문서',
     },
     nav: {
       markdown: '마크다운',
@@ -251,6 +265,7 @@ export const translations: Record<Language, Translations> = {
       synced: '동기화됨',
       document: '개 문서',
       documents_plural: '개 문서',
+      loadMore: '더 보기',
     },
     editor: {
       autoSaved: '자동 저장됨',
@@ -0,0 +1,29 @@
+// Memoized KaTeX rendering.
+//
+// A document usually repeats the same symbols and formulas, and an edit only
+// touches a few of them, so rendered HTML is kept per (latex, displayMode).
+// renderToString errors are not cached; callers handle them as before.
+
+import katex from 'katex';
+import { LruCache } from '@/lib/documents/lruCache';
+
+const cache = new LruCache<string, string>({
+  maxEntries: 2000,
+  maxSize: 4 * 1024 * 1024, // Characters of HTML
+  sizeOf: html => html.length,
+});
+
+export function renderMath(latex: string, displayMode: boolean): string {
+  const key = (displayMode ? 'D' : 'I') + latex;
+  let html = cache.get(key);
+  if (html === undefined) {
+    html = katex.renderToString(latex, {
+      displayMode,
+      throwOnError: false,
+      trust: true,
+      strict: false,
+    });
+    cache.set(key, html);
+  }
+  return html;
+}
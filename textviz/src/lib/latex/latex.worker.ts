@@ -0,0 +1,34 @@
+// Renders the LaTeX preview off the main thread.
+//
+// A long render yields every SLICE_MS so newer jobs can arrive; once one has,
+// the older job stops and posts nothing. The block and KaTeX caches live here,
+// so they carry over from one job to the next.
+
+import { renderCachedBlock, resolveBlocks, splitBlocks, type CachedBlock } from './renderLatex';
+import type { LatexRenderRequest, LatexRenderResponse } from './renderClient';
+
+const SLICE_MS = 12;
+
+let latestId = 0;
+
+const yieldToMessages = () => new Promise(resolve => setTimeout(resolve, 0));
+
+self.onmessage = async (event: MessageEvent<LatexRenderRequest>) => {
+  const { id, content } = event.data;
+  latestId = id;
+
+  const sources = content ? splitBlocks(content) : [];
+  const parsed: CachedBlock[] = [];
+  let sliceStart = performance.now();
+  for (const { source } of sources) {
+    parsed.push(renderCachedBlock(source));
+    if (performance.now() - sliceStart > SLICE_MS) {
+      await yieldToMessages();
+      if (id !== latestId) return; // Superseded by newer content
+      sliceStart = performance.now();
+    }
+  }
+  const blocks = resolveBlocks(parsed, sources.map(block => block.line));
+  const response: LatexRenderResponse = { id, blocks };
+  self.postMessage(response);
+};
@@ -0,0 +1,574 @@
+// Single-pass LaTeX to HTML converter for the preview.
+//
+// A scanner walks the source once and a small recursive-descent parser emits
+// HTML as it goes, so the cost is linear in the length of the block. Commands
+// and environments are looked up in tables. Math is handed to KaTeX as raw
+// source. Unknown commands keep the text of their arguments.
+//
+// Top-level elements carry `data-line`, their line within the block, so the
+// preview can be mapped back to the editor. Anything that depends on the rest
+// of the document (equation numbers, \ref and \cite) is left as a placeholder
+// and filled in by resolveBlocks in renderLatex.ts.
+
+import { renderMath } from './katexCache';
+
+export interface ParsedLabel {
+  name: string;
+  /** HTML a \ref shows: the enclosing heading, when the block has one. */
+  text?: string;
+  /** Index among the block's numbered equations, for labels inside one. */
+  equation?: number;
+}
+
+export interface ParsedBlock {
+  html: string;
+  errors: string[];
+  labels: ParsedLabel[];
+  /** Numbered equations in the block; their numbers depend on earlier blocks. */
+  equations: number;
+  /** HTML of the block's last heading, for labels in the blocks after it. */
+  lastHeading?: string;
+  hasPlaceholders: boolean;
+}
+
+// Placeholders left for resolveBlocks: EQUATION_NUMBER on its own, and
+// REF_START + kind + ':' + names + REF_END for \ref (r), \eqref (e) and \cite (c).
+export const EQUATION_NUMBER = '\uE004';
+export const REF_START = '\uE002';
+export const REF_END = '\uE003';
+
+const HTML_ESCAPES: Record<string, string> = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' };
+const TEXT_REPLACEMENTS: Record<string, string> = { ...HTML_ESCAPES, '---': '—', '--': '–', '``': '"', "''": '"' };
+
+export const escapeHtml = (text: string) => text.replace(/[&<>"]/g, c => HTML_ESCAPES[c]);
+const escapeText = (text: string) => text.replace(/---|--|``|''|[&<>"]/g, m => TEXT_REPLACEMENTS[m]);
+
+const safeUrl = (url: string) => (/^(https?:|mailto:|#)/i.test(url.trim()) ? escapeHtml(url.trim()) : '#');
+const safeColor = (color: string) => (/^(#[0-9a-f]{3,8}|[a-z]+)$/i.test(color.trim()) ? color.trim() : 'inherit');
+
+// Inline formatting: \name{arg} -> open + arg + close
+const FORMATTING: Record<string, [string, string]> = {
+  textbf: ['<strong>', '</strong>'],
+  textit: ['<em>', '</em>'],
+  textsl: ['<em>', '</em>'],
+  emph: ['<em>', '</em>'],
+  underline: ['<u>', '</u>'],
+  texttt: ['<code>', '</code>'],
+  textsc: ['<span style="font-variant: small-caps">', '</span>'],
+  textrm: ['', ''],
+  textsf: ['', ''],
+  textup: ['', ''],
+  textnormal: ['', ''],
+  mbox: ['', ''],
+};
+
+// Block-level commands with one argument: \name{arg} -> <tag class="...">arg</tag>
+const HEADINGS: Record<string, [string, string]> = {
+  title: ['h1', 'latex-title'],
+  chapter: ['h2', 'latex-section'],
+  section: ['h2', 'latex-section'],
+  subsection: ['h3', 'latex-subsection'],
+  subsubsection: ['h4', 'latex-subsubsection'],
+  author: ['p', 'latex-author'],
+  date: ['p', 'latex-date'],
+};
+const LABELLED_HEADINGS = new Set(['chapter', 'section', 'subsection', 'subsubsection']);
+
+const SYMBOLS: Record<string, string> = {
+  ldots: '…',
+  dots: '…',
+  cdots: '⋯',
+  quad: '&emsp;',
+  qquad: '&emsp;&emsp;',
+  newline: '<br/>',
+  linebreak: '<br/>',
+  textbackslash: '\\',
+  S: '§',
+  P: '¶',
+  copyright: '©',
+  dag: '†',
+  ddag: '‡',
+  LaTeX: 'LaTeX',
+  TeX: 'TeX',
+  '&': '&amp;',
+  '%': '%',
+  '$': '$',
+  '#': '#',
+  '_': '_',
+  '{': '{',
+  '}': '}',
+  ' ': ' ',
+  ',': '&thinsp;',
+  ';': ' ',
+  '@': '',
+  '/': '',
+  '-': '',
+};
+
+// Commands that produce no output: name -> [optional args, required args]
+const IGNORED: Record<string, [number, number]> = {
+  documentclass: [1, 1],
+  usepackage: [1, 1],
+  RequirePackage: [1, 1],
+  geometry: [0, 1],
+  hypersetup: [0, 1],
+  pagestyle: [0, 1],
+  thispagestyle: [0, 1],
+  pagenumbering: [0, 1],
+  setlength: [0, 2],
+  addtolength: [0, 2],
+  setcounter: [0, 2],
+  addtocounter: [0, 2],
+  newcommand: [2, 2], // \newcommand{\name}[n][default]{body}
+  renewcommand: [2, 2],
+  providecommand: [2, 2],
+  newenvironment: [2, 3],
+  renewenvironment: [2, 3],
+  bibliographystyle: [0, 1],
+  bibliography: [0, 1],
+  graphicspath: [0, 1],
+  includegraphics: [1, 1],
+  input: [0, 1],
+  include: [0, 1],
+  maketitle: [0, 0],
+  tableofcontents: [0, 0],
+  listoffigures: [0, 0],
+  listoftables: [0, 0],
+  noindent: [0, 0],
+  indent: [0, 0],
+  centering: [0, 0],
+  newpage: [0, 0],
+  clearpage: [0, 0],
+  pagebreak: [0, 0],
+  hfill: [0, 0],
+  vfill: [0, 0],
+  small: [0, 0],
+  large: [0, 0],
+  Large: [0, 0],
+  normalsize: [0, 0],
+  footnotesize: [0, 0],
+  appendix: [0, 0],
+  begingroup: [0, 0],
+  endgroup: [0, 0],
+};
+
+const REFERENCES: Record<string, string> = { ref: 'r', autoref: 'r', cref: 'r', pageref: 'r', eqref: 'e', cite: 'c', citep: 'c', citet: 'c' };
+
+// Math environments rendered by KaTeX: name -> KaTeX environment wrapping the body ('' for none)
+const MATH_ENVIRONMENTS: Record<string, string> = {
+  equation: '',
+  displaymath: '',
+  align: 'aligned',
+  alignat: 'alignedat',
+  flalign: 'aligned',
+  eqnarray: 'aligned',
+  gather: 'gathered',
+  multline: 'gathered',
+};
+const isNumbered = (env: string) => !env.endsWith('*') && env !== 'displaymath';
+
+// Flow environments: name -> [open, close]; content is parsed into paragraphs
+const FLOW_ENVIRONMENTS: Record<string, [string, string]> = {
+  center: ['<div class="text-center"', '</div>'],
+  flushleft: ['<div style="text-align: left"', '</div>'],
+  flushright: ['<div style="text-align: right"', '</div>'],
+  quote: ['<blockquote class="latex-quote"', '</blockquote>'],
+  quotation: ['<blockquote class="latex-quote"', '</blockquote>'],
+  abstract: ['<div class="latex-abstract"', '</div>'],
+  figure: ['<div class="latex-figure"', '</div>'],
+  table: ['<div class="latex-figure"', '</div>'],
+};
+
+const LISTS: Record<string, string> = { itemize: 'ul', enumerate: 'ol', description: 'ul' };
+
+// Everything except characters the parser must look at
+const TEXT_RUN = /[^\\{}$%~\n\]]+/y;
+const BLANK_LINES = /\n[ \t]*(?:\n[ \t]*)+/y;
+const LETTERS = /[a-zA-Z]+\*?/y;
+
+type Stop = { group?: '}' | ']'; env?: string; item?: boolean };
+type StopReason = 'group' | 'end' | 'item' | 'eof';
+
+class Parser {
+  private pos = 0;
+  private out: string[] = [];
+  private flow = true; // Inline content goes into paragraphs
+  private paraOpen = false;
+  private lineStarts: number[] = [0];
+  private lineCursor = 0;
+  private lastHeading: string | undefined;
+
+  readonly errors: string[] = [];
+  readonly labels: ParsedLabel[] = [];
+  equations = 0;
+  hasPlaceholders = false;
+
+  constructor(private readonly src: string) {
+    for (let i = src.indexOf('\n'); i !== -1; i = src.indexOf('\n', i + 1)) this.lineStarts.push(i + 1);
+  }
+
+  parse(): ParsedBlock {
+    this.sequence(true, {});
+    return {
+      html: this.out.join(''),
+      errors: this.errors,
+      labels: this.labels,
+      equations: this.equations,
+      lastHeading: this.lastHeading,
+      hasPlaceholders: this.hasPlaceholders,
+    };
+  }
+
+  // --- Output helpers ---
+
+  /** Line of the current position; positions only move forward. */
+  private line() {
+    while (this.lineCursor + 1 < this.lineStarts.length && this.lineStarts[this.lineCursor + 1] <= this.pos) {
+      this.lineCursor++;
+    }
+    return this.lineCursor;
+  }
+
+  private inline(html: string) {
+    if (this.flow && !this.paraOpen) {
+      this.out.push(`<p data-line="${this.line()}">`);
+      this.paraOpen = true;
+    }
+    this.out.push(html);
+  }
+
+  private block(html: string) {
+    this.closeParagraph();
+    this.out.push(html);
+  }
+
+  private closeParagraph() {
+    if (this.paraOpen) {
+      this.out.push('</p>');
+      this.paraOpen = false;
+    }
+  }
+
+  /** Run `parse` and return what it emitted instead of emitting it. */
+  private capture(parse: () => void) {
+    const start = this.out.length;
+    parse();
+    return this.out.splice(start).join('');
+  }
+
+  // --- Scanning helpers ---
+
+  private skipSpaces() {
+    while (this.pos < this.src.length && (this.src[this.pos] === ' ' || this.src[this.pos] === '\t' || this.src[this.pos] === '\n')) {
+      this.pos++;
+    }
+  }
+
+  /** Raw text of a balanced `open ... close` group at the cursor, or null if there is none. */
+  private rawGroup(open = '{', close = '}'): string | null {
+    const start = this.pos;
+    this.skipSpaces();
+    if (this.src[this.pos] !== open) {
+      this.pos = start;
+      return null;
+    }
+    let depth = 0;
+    for (let i = this.pos; i < this.src.length; i++) {
+      const ch = this.src[i];
+      if (ch === '\\') i++;
+      else if (ch === open) depth++;
+      else if (ch === close && --depth === 0) {
+        const text = this.src.slice(this.pos + 1, i);
+        this.pos = i + 1;
+        return text;
+      }
+    }
+    this.pos = start;
+    return null;
+  }
+
+  private skipArgs([optional, required]: [number, number]) {
+    for (let i = 0; i < optional; i++) this.rawGroup('[', ']');
+    for (let i = 0; i < required; i++) {
+      if (this.rawGroup() === null) this.rawGroup('[', ']');
+    }
+  }
+
+  /** Render the next argument, `{...}` or a single character, in inline mode. */
+  private argument(): string {
+    this.skipSpaces();
+    if (this.src[this.pos] === '{') {
+      this.pos++;
+      return this.capture(() => this.sequence(false, { group: '}' }));
+    }
+    if (this.pos >= this.src.length) return '';
+    if (this.src[this.pos] === '\\') return this.capture(() => this.sequence(false, {}, 1));
+    return escapeText(this.src[this.pos++]);
+  }
+
+  /** Render an optional `[...]` argument, or return null if there is none. */
+  private optionalArgument(): string | null {
+    if (this.src[this.pos] !== '[') return null;
+    this.pos++;
+    return this.capture(() => this.sequence(false, { group: ']' }));
+  }
+
+  /** Raw text up to `delimiter` (skipping escaped ones), consumed with it; null if absent. */
+  private rawUntil(delimiter: string, stopAtBlankLine = false): string | null {
+    for (let i = this.src.indexOf(delimiter, this.pos); i !== -1; i = this.src.indexOf(delimiter, i + 1)) {
+      if (this.src[i - 1] === '\\' && delimiter[0] !== '\\') continue;
+      const text = this.src.slice(this.pos, i);
+      if (stopAtBlankLine && /\n[ \t]*\n/.test(text)) return null;
+      this.pos = i + delimiter.length;
+      return text;
+    }
+    return null;
+  }
+
+  // --- Parsing ---
+
+  /**
+   * Parse until `stop` (or `limit` tokens). `flow` selects paragraph mode;
+   * the caller's paragraph state is restored afterwards.
+   */
+  private sequence(flow: boolean, stop: Stop, limit = Infinity): StopReason {
+    const outer = { flow: this.flow, paraOpen: this.paraOpen };
+    this.flow = flow;
+    this.paraOpen = false;
+    let reason: StopReason = 'eof';
+
+    for (let tokens = 0; tokens < limit && this.pos < this.src.length; tokens++) {
+      const ch = this.src[this.pos];
+      if (ch === '\\') {
+        const result = this.command(stop);
+        if (result) {
+          reason = result;
+          break;
+        }
+      } else if (ch === '{') {
+        this.pos++;
+        this.inline(this.capture(() => this.sequence(false, { group: '}' })));
+      } else if (ch === '}' || ch === ']') {
+        this.pos++;
+        if (stop.group === ch) {
+          reason = 'group';
+          break;
+        }
+        if (ch === ']') this.inline(']');
+      } else if (ch === '$') {
+        this.dollarMath();
+      } else if (ch === '%') {
+        const end = this.src.indexOf('\n', this.pos);
+        this.pos = end === -1 ? this.src.length : end;
+      } else if (ch === '~') {
+        this.pos++;
+        this.inline('&nbsp;');
+      } else if (ch === '\n') {
+        BLANK_LINES.lastIndex = this.pos;
+        if (BLANK_LINES.test(this.src)) {
+          this.pos = BLANK_LINES.lastIndex;
+          if (this.flow) this.closeParagraph();
+          else this.inline(' ');
+        } else {
+          this.pos++;
+          if (this.paraOpen || !this.flow) this.out.push('\n');
+        }
+      } else {
+        TEXT_RUN.lastIndex = this.pos;
+        TEXT_RUN.test(this.src);
+        const text = this.src.slice(this.pos, TEXT_RUN.lastIndex);
+        this.pos = TEXT_RUN.lastIndex;
+        if (this.paraOpen || !this.flow || text.trim()) this.inline(escapeText(text));
+      }
+    }
+
+    this.closeParagraph();
+    this.flow = outer.flow;
+    this.paraOpen = outer.paraOpen;
+    return reason;
+  }
+
+  /** Handle the command at the cursor; returns a stop reason if it ends the sequence. */
+  private command(stop: Stop): StopReason | null {
+    this.pos++; // Backslash
+    LETTERS.lastIndex = this.pos;
+    let name: string;
+    if (LETTERS.test(this.src)) {
+      name = this.src.slice(this.pos, LETTERS.lastIndex);
+      this.pos = LETTERS.lastIndex;
+    } else {
+      name = this.src[this.pos++] ?? '';
+    }
+    const base = name.endsWith('*') ? name.slice(0, -1) : name;
+
+    if (name === '\\') {
+      this.rawGroup('[', ']');
+      this.inline('<br/>');
+    } else if (name === '[') {
+      this.displayMath('\\]', '\\[');
+    } else if (name === '(') {
+      const latex = this.rawUntil('\\)');
+      this.inline(latex === null ? '\\(' : this.math(latex, false, '\\(', '\\)'));
+    } else if (name === 'begin') {
+      this.environment(this.rawGroup() ?? '');
+    } else if (name === 'end') {
+      const env = this.rawGroup() ?? '';
+      if (stop.env === env) return 'end';
+    } else if (name === 'item') {
+      if (stop.item) return 'item';
+      this.inline('• ');
+    } else if (name === 'par') {
+      this.closeParagraph();
+    } else if (name === 'paragraph' || name === 'subparagraph') {
+      this.closeParagraph();
+      const title = this.argument();
+      this.inline(`<strong class="latex-paragraph">${title}</strong> `);
+    } else if (base in HEADINGS) {
+      this.heading(base);
+    } else if (name in FORMATTING) {
+      const [open, close] = FORMATTING[name];
+      this.inline(open + this.argument() + close);
+    } else if (name in SYMBOLS) {
+      this.inline(SYMBOLS[name]);
+    } else if (base in IGNORED) {
+      this.skipArgs(IGNORED[base]);
+    } else if (base in REFERENCES) {
+      this.rawGroup('[', ']');
+      const names = this.rawGroup() ?? '';
+      this.hasPlaceholders = true;
+      this.inline(`${REF_START}${REFERENCES[base]}:${names}${REF_END}`);
+    } else if (name === 'label') {
+      const label = (this.rawGroup() ?? '').trim();
+      this.labels.push({ name: label, text: this.lastHeading });
+      this.out.push(`<span id="latex-label-${escapeHtml(label)}" class="latex-anchor"></span>`);
+    } else if (base === 'vspace') {
+      this.rawGroup();
+      this.block(`<div style="margin: 1em 0;" data-line="${this.line()}"></div>`);
+    } else if (base === 'hspace') {
+      this.rawGroup();
+      this.inline(' ');
+    } else if (name === 'verb') {
+      const delimiter = this.src[this.pos++] ?? '';
+      const code = this.rawUntil(delimiter) ?? '';
+      this.inline(`<code>${escapeHtml(code)}</code>`);
+    } else if (name === 'href') {
+      const url = this.rawGroup() ?? '';
+      this.inline(`<a href="${safeUrl(url)}" target="_blank" rel="noopener noreferrer">${this.argument()}</a>`);
+    } else if (name === 'url') {
+      const url = this.rawGroup() ?? '';
+      this.inline(`<a href="${safeUrl(url)}" target="_blank" rel="noopener noreferrer">${escapeHtml(url)}</a>`);
+    } else if (name === 'textcolor') {
+      const color = this.rawGroup() ?? '';
+      this.inline(`<span style="color: ${safeColor(color)}">${this.argument()}</span>`);
+    } else if (name === 'footnote') {
+      this.inline(`<span class="latex-footnote">(${this.argument()})</span>`);
+    } else if (name === 'caption') {
+      this.block(`<p class="latex-caption" data-line="${this.line()}">${this.argument()}</p>`);
+    } else if (/^[a-zA-Z]/.test(name)) {
+      // Unknown command: drop the name, keep the text of its arguments
+      while (this.src[this.pos] === '{') this.inline(this.argument());
+    }
+    return null;
+  }
+
+  private heading(name: string) {
+    const [tag, className] = HEADINGS[name];
+    this.closeParagraph();
+    const line = this.line();
+    this.rawGroup('[', ']'); // Short title for the table of contents
+    const content = this.argument();
+    if (LABELLED_HEADINGS.has(name)) this.lastHeading = content;
+    this.block(`<${tag} class="${className}" data-line="${line}">${content}</${tag}>`);
+  }
+
+  private environment(env: string) {
+    const base = env.replace(/\*$/, '');
+    const line = this.line();
+
+    if (base === 'document') return; // \begin and \end{document} only delimit the body
+    if (base in MATH_ENVIRONMENTS) {
+      this.mathEnvironment(env, base, line);
+    } else if (base in LISTS) {
+      this.list(env, LISTS[base], line, base === 'description');
+    } else if (env === 'verbatim' || env === 'lstlisting') {
+      this.rawGroup('[', ']');
+      const code = this.rawUntil(`\\end{${env}}`) ?? '';
+      this.block(`<pre class="latex-verbatim" data-line="${line}">${escapeHtml(code.replace(/^\n/, ''))}</pre>`);
+    } else {
+      // Flow environments, and unknown ones (content kept, markup dropped)
+      const [open, close] = FLOW_ENVIRONMENTS[base] ?? ['<div', '</div>'];
+      this.block(`${open} data-line="${line}">`);
+      if (base === 'abstract') this.out.push('<h4>Abstract</h4>');
+      this.sequence(true, { env });
+      this.out.push(close);
+    }
+  }
+
+  private list(env: string, tag: string, line: number, description: boolean) {
+    this.block(`<${tag} class="latex-list${description ? ' latex-description' : ''}" data-line="${line}">`);
+    let reason = this.sequence(false, { env, item: true }); // Anything before the first \item
+    while (reason === 'item') {
+      const label = this.optionalArgument();
+      this.out.push(label !== null ? `<li><strong>${label}</strong> ` : '<li>');
+      reason = this.sequence(false, { env, item: true });
+      this.out.push('</li>');
+    }
+    this.out.push(`</${tag}>`);
+  }
+
+  private mathEnvironment(env: string, base: string, line: number) {
+    let body = this.rawUntil(`\\end{${env}}`);
+    if (body === null) {
+      this.inline(escapeText(`\\begin{${env}}`));
+      return;
+    }
+    const numbered = isNumbered(env);
+    body = body.replace(/\\label\{([^}]*)\}/g, (_, label: string) => {
+      this.labels.push({ name: label.trim(), equation: numbered ? this.equations : undefined, text: this.lastHeading });
+      return '';
+    });
+    const wrapper = MATH_ENVIRONMENTS[base];
+    const latex = wrapper ? `\\begin{${wrapper}}${body}\\end{${wrapper}}` : body;
+    let html = this.math(latex, true, `\\begin{${env}}`, `\\end{${env}}`);
+    if (numbered) {
+      html += `<span class="latex-eqno">(${EQUATION_NUMBER})</span>`;
+      this.equations++;
+      this.hasPlaceholders = true;
+    }
+    this.block(`<div class="katex-display-wrapper" data-line="${line}">${html}</div>`);
+  }
+
+  private dollarMath() {
+    if (this.src.startsWith('$$', this.pos)) {
+      this.pos += 2;
+      this.displayMath('$$', '$$');
+      return;
+    }
+    this.pos++;
+    const latex = this.rawUntil('$', true);
+    this.inline(latex === null ? '$' : this.math(latex, false, '$', '$'));
+  }
+
+  private displayMath(close: string, open: string) {
+    const line = this.line();
+    const latex = this.rawUntil(close);
+    if (latex === null) {
+      this.inline(escapeText(open));
+      return;
+    }
+    this.block(`<div class="katex-display-wrapper" data-line="${line}">${this.math(latex, true, open, close)}</div>`);
+  }
+
+  private math(latex: string, displayMode: boolean, open: string, close: string) {
+    try {
+      return renderMath(latex.trim(), displayMode);
+    } catch (e) {
+      this.errors.push(`${displayMode ? 'Display' : 'Inline'} math error: ${e}`);
+      const tag = displayMode ? 'div' : 'span';
+      return `<${tag} class="latex-error">${escapeHtml(open + latex + close)}</${tag}>`;
+    }
+  }
+}
+
+/** Convert one block of LaTeX source to HTML. */
+export const parseLatex = (source: string): ParsedBlock => new Parser(source).parse();
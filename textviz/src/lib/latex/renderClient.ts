@@ -0,0 +1,69 @@
+// Main-thread side of the LaTeX preview renderer.
+//
+// Jobs go to latex.worker.ts; only the newest one matters. Starting a job
+// resolves every older one with null, and the worker abandons them at its
+// next yield. Without Web Workers, rendering falls back to the main thread,
+// and only then is the renderer (and KaTeX) loaded into the page.
+
+import type { RenderedBlock } from './renderLatex';
+
+export type LatexRenderRequest = { id: number; content: string };
+export type LatexRenderResponse = { id: number; blocks: RenderedBlock[] };
+
+const renderOnMainThread = async (content: string) => {
+  const { renderLatexBlocks } = await import('./renderLatex');
+  return renderLatexBlocks(content);
+};
+
+class LatexRenderClient {
+  private worker: Worker | null = null;
+  private workerFailed = false;
+  private nextId = 0;
+  private waiting = new Map<number, { content: string; resolve: (blocks: RenderedBlock[] | null) => void }>();
+
+  /** Render `content`; resolves with null if a newer render starts first. */
+  render(content: string): Promise<RenderedBlock[] | null> {
+    const id = ++this.nextId;
+    this.waiting.forEach(job => job.resolve(null));
+    this.waiting.clear();
+
+    const worker = this.getWorker();
+    if (!worker) return renderOnMainThread(content);
+
+    return new Promise(resolve => {
+      this.waiting.set(id, { content, resolve });
+      const request: LatexRenderRequest = { id, content };
+      worker.postMessage(request);
+    });
+  }
+
+  private getWorker() {
+    if (this.worker || this.workerFailed) return this.worker;
+    try {
+      this.worker = new Worker(new URL('./latex.worker.ts', import.meta.url), { type: 'module' });
+      this.worker.onmessage = (event: MessageEvent<LatexRenderResponse>) => {
+        const job = this.waiting.get(event.data.id);
+        this.waiting.delete(event.data.id);
+        job?.resolve(event.data.blocks);
+      };
+      this.worker.onerror = (event) => {
+        console.warn('[renderClient] LaTeX worker failed, rendering on the main thread:', event.message);
+        this.useMainThread();
+      };
+    } catch (error) {
+      console.warn('[renderClient] Web Worker unavailable, rendering on the main thread:', error);
+      this.workerFailed = true;
+    }
+    return this.worker;
+  }
+
+  private useMainThread() {
+    this.worker?.terminate();
+    this.worker = null;
+    this.workerFailed = true;
+    this.waiting.forEach(job => renderOnMainThread(job.content).then(job.resolve));
+    this.waiting.clear();
+  }
+}
+
+export const latexRenderClient = new LatexRenderClient();
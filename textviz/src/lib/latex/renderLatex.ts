@@ -0,0 +1,151 @@
+// LaTeX source to HTML, one block at a time.
+//
+// The source is split into blocks: paragraphs, sectioning commands, and
+// environments or display math (kept whole even across blank lines). Each
+// block is parsed on its own (see parseLatex.ts) and cached by its hash, so an
+// edit re-renders only the block being typed in. resolveBlocks then fills in
+// what spans blocks (equation numbers, \ref and \cite), which is cheap.
+// LatexRenderer patches just the DOM nodes of the blocks whose key changed.
+
+import { LruCache } from '@/lib/documents/lruCache';
+import { hashString } from '@/lib/hash';
+import { EQUATION_NUMBER, escapeHtml, parseLatex, REF_END, REF_START, type ParsedBlock } from './parseLatex';
+
+export interface SourceBlock {
+  source: string;
+  /** First line of the block in the document, 0-based. */
+  line: number;
+}
+
+export interface RenderedBlock {
+  /** Hash and length of the block source (and its resolved references); identifies the block's DOM node. */
+  key: string;
+  line: number;
+  html: string;
+  errors: string[];
+}
+
+export type CachedBlock = ParsedBlock & { key: string };
+
+const SECTION_START = /^\s*\\(chapter|section|subsection|subsubsection|paragraph)\*?\{/;
+const ENVIRONMENT = /\\(begin|end)\{([^}]*)\}/g;
+
+const stripComment = (line: string) => line.replace(/(?<!\\)%.*$/, '');
+
+/** Split the source into independently renderable blocks. */
+export function splitBlocks(content: string): SourceBlock[] {
+  const blocks: SourceBlock[] = [];
+  let current: string[] = [];
+  let start = 0;
+  let depth = 0; // Open environments, not counting `document`
+  let inDisplayMath = false; // Inside $$ ... $$ or \[ ... \]
+
+  const flush = () => {
+    if (current.some(line => line.trim())) blocks.push({ source: current.join('\n'), line: start });
+    current = [];
+  };
+
+  content.split('\n').forEach((line, index) => {
+    const code = stripComment(line);
+    const atTopLevel = depth === 0 && !inDisplayMath;
+
+    if (atTopLevel && !code.trim()) {
+      flush();
+      return;
+    }
+    if (atTopLevel && SECTION_START.test(code)) flush();
+    if (current.length === 0) start = index;
+    current.push(line);
+
+    for (const [, kind, name] of code.matchAll(ENVIRONMENT)) {
+      if (name === 'document') continue;
+      depth = Math.max(0, depth + (kind === 'begin' ? 1 : -1));
+    }
+    const dollars = code.match(/(?<!\\)\$\$/g)?.length ?? 0;
+    if (dollars % 2 === 1) inDisplayMath = !inDisplayMath;
+    if (/\\\[/.test(code) && !/\\\]/.test(code)) inDisplayMath = true;
+    else if (/\\\]/.test(code) && !/\\\[/.test(code)) inDisplayMath = false;
+  });
+  flush();
+  return blocks;
+}
+
+const blockCache = new LruCache<string, CachedBlock & { source: string }>({
+  maxEntries: 5000,
+  maxSize: 16 * 1024 * 1024, // Characters of source and HTML
+  sizeOf: block => block.source.length + block.html.length,
+});
+
+/** Parse one block from splitBlocks, or return its cached output if unchanged. */
+export function renderCachedBlock(source: string): CachedBlock {
+  const key = `${hashString(source)}-${source.length}`;
+  const cached = blockCache.get(key);
+  if (cached && cached.source === source) return cached;
+
+  const block = { ...parseLatex(source), key, source };
+  blockCache.set(key, block);
+  return block;
+}
+
+const PLACEHOLDER = new RegExp(`${EQUATION_NUMBER}|${REF_START}([rec]):([^${REF_END}]*)${REF_END}`, 'g');
+
+/**
+ * Number equations and citations across the document and fill in \ref, \eqref
+ * and \cite. Only blocks with placeholders are rewritten; their key gains a
+ * hash of the substituted values so the DOM node is replaced when those change.
+ */
+export function resolveBlocks(blocks: CachedBlock[], lines: number[]): RenderedBlock[] {
+  const labels = new Map<string, { text: string; equation: boolean }>();
+  const firstEquation: number[] = [];
+  let equations = 0;
+  let heading: string | undefined;
+  for (const block of blocks) {
+    firstEquation.push(equations);
+    for (const label of block.labels) {
+      if (label.equation !== undefined) {
+        labels.set(label.name, { text: String(equations + label.equation + 1), equation: true });
+      } else {
+        labels.set(label.name, { text: label.text ?? heading ?? '??', equation: false });
+      }
+    }
+    equations += block.equations;
+    heading = block.lastHeading ?? heading;
+  }
+
+  const citations = new Map<string, number>();
+  return blocks.map((block, i) => {
+    const { key, html, errors } = block;
+    if (!block.hasPlaceholders) return { key, line: lines[i], html, errors };
+
+    let equation = firstEquation[i];
+    const values: string[] = [];
+    const resolved = html.replace(PLACEHOLDER, (_match, kind?: string, names = '') => {
+      let value: string;
+      if (!kind) {
+        value = String(++equation);
+      } else if (kind === 'c') {
+        const numbers = names.split(',').map((name: string) => {
+          const citation = name.trim();
+          if (!citations.has(citation)) citations.set(citation, citations.size + 1);
+          return citations.get(citation);
+        });
+        value = `[${numbers.join(', ')}]`;
+      } else {
+        const name = names.trim();
+        const label = labels.get(name);
+        const text = !label ? '??' : kind === 'e' || label.equation ? `(${label.text})` : label.text;
+        value = `<a class="latex-ref" href="#latex-label-${escapeHtml(encodeURIComponent(name))}">${text}</a>`;
+      }
+      values.push(value);
+      return value;
+    });
+    return { key: `${key}.${hashString(values.join('|'))}`, line: lines[i], html: resolved, errors };
+  });
+}
+
+/** Render every block of `content`, reusing cached output for unchanged blocks. */
+export function renderLatexBlocks(content: string): RenderedBlock[] {
+  if (!content) return [];
+  const blocks = splitBlocks(content);
+  return resolveBlocks(blocks.map(block => renderCachedBlock(block.source)), blocks.map(block => block.line));
+}
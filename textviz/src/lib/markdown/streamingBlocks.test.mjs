@@ -0,0 +1,112 @@
+import assert from 'node:assert/strict';
+import { describe, it } from 'node:test';
+import { splitMarkdownBlocks } from './streamingBlocks.ts';
+
+const sources = (content) => splitMarkdownBlocks(content).map((block) => block.source);
+
+// Feed `content` one character at a time, as a streamed reply arrives
+const stream = (content) => {
+  let previous;
+  for (let i = 1; i <= content.length; i++) {
+    const prefix = content.slice(0, i);
+    const blocks = splitMarkdownBlocks(prefix, previous);
+    assert.deepEqual(blocks, splitMarkdownBlocks(prefix), `after ${JSON.stringify(prefix)}`);
+    previous = { content: prefix, blocks };
+  }
+  return previous.blocks;
+};
+
+const REPLY = [
+  '# Title',
+  '',
+  'Some *text*.',
+  '',
+  '- one',
+  '',
+  '  more about one',
+  '- two',
+  '',
+  '```js',
+  'const a = 1;',
+  '',
+  'const b = 2;',
+  '```',
+  '',
+  '$$',
+  'x^2',
+  '',
+  'y',
+  '$$',
+  '',
+  'See [the docs][1] and a note[^n].',
+  '',
+  'Unrelated.',
+  '',
+  '[1]: https://example.com',
+  '[^n]: The note.',
+].join('\n');
+
+describe('splitMarkdownBlocks', () => {
+  it('splits at blank lines', () => {
+    assert.deepEqual(sources('# Title\n\nOne\ntwo\n\n\nThree\n'), ['# Title', 'One\ntwo', 'Three']);
+  });
+
+  it('records where each block starts', () => {
+    const content = 'One\n\nTwo';
+    for (const block of splitMarkdownBlocks(content)) {
+      assert.equal(content.slice(block.start, block.start + block.source.length), block.source);
+    }
+  });
+
+  it('keeps fenced code together', () => {
+    assert.deepEqual(sources('```\na\n\nb\n```\n\nafter'), ['```\na\n\nb\n```', 'after']);
+    assert.deepEqual(sources('~~~~\n```\n\n~~~~'), ['~~~~\n```\n\n~~~~']);
+  });
+
+  it('keeps an unclosed fence open to the end', () => {
+    assert.deepEqual(sources('```py\nx = 1\n\ny = 2'), ['```py\nx = 1\n\ny = 2']);
+  });
+
+  it('keeps $$ math together', () => {
+    assert.deepEqual(sources('$$\na\n\nb\n$$\n\nafter'), ['$$\na\n\nb\n$$', 'after']);
+    assert.deepEqual(sources('$$x$$\n\nafter'), ['$$x$$', 'after']);
+  });
+
+  it('keeps loose lists and indented continuations together', () => {
+    assert.deepEqual(sources('- a\n\n- b\n\n  more b\n\nafter'), ['- a\n\n- b\n\n  more b', 'after']);
+    assert.deepEqual(sources('1. a\n\n2. b'), ['1. a\n\n2. b']);
+  });
+
+  it('merges reference definitions with the blocks that use them', () => {
+    assert.deepEqual(sources('Intro\n\nA [link][Docs].\n\nMiddle\n\n[docs]: https://example.com\n\nEnd'), [
+      'Intro',
+      'A [link][Docs].\n\nMiddle\n\n[docs]: https://example.com',
+      'End',
+    ]);
+  });
+
+  it('merges footnotes, whichever comes first', () => {
+    assert.deepEqual(sources('Claim[^1].\n\n[^1]: Source.'), ['Claim[^1].\n\n[^1]: Source.']);
+    assert.deepEqual(sources('[^1]: Source.\n\nClaim[^1].\n\nEnd'), ['[^1]: Source.\n\nClaim[^1].', 'End']);
+  });
+
+  it('leaves unused definitions alone', () => {
+    assert.deepEqual(sources('Text\n\n[1]: https://example.com'), ['Text', '[1]: https://example.com']);
+  });
+
+  it('gives the same blocks incrementally as from scratch', () => {
+    assert.deepEqual(stream(REPLY), splitMarkdownBlocks(REPLY));
+    assert.deepEqual(stream('-\n- x\n\n  y\n-'), splitMarkdownBlocks('-\n- x\n\n  y\n-'));
+  });
+
+  it('keeps the starts of finished blocks while streaming', () => {
+    const before = splitMarkdownBlocks('One\n\nTwo\n\nThr');
+    const after = splitMarkdownBlocks('One\n\nTwo\n\nThree', { content: 'One\n\nTwo\n\nThr', blocks: before });
+    assert.deepEqual(after.map((block) => block.start), before.map((block) => block.start));
+  });
+
+  it('ignores a previous result that is not a prefix', () => {
+    const previous = { content: 'Old\n\ntext', blocks: splitMarkdownBlocks('Old\n\ntext') };
+    assert.deepEqual(splitMarkdownBlocks('New\n\nreply', previous), splitMarkdownBlocks('New\n\nreply'));
+  });
+});
@@ -0,0 +1,128 @@
+// Splits Markdown into top-level blocks for incremental rendering.
+//
+// While a reply streams in, text is only ever appended, so every block but
+// the last is final: ChatMessage renders each block on its own and only the
+// last one changes with new tokens. Blocks end at blank lines outside fenced
+// code and $$ math. A blank line does not end the block when the next line is
+// indented (a list item's continuation) or continues a list, so lists and
+// their items stay in one piece.
+//
+// Reference-style links and footnotes only resolve within one parse, so a
+// block with a definition (`[1]: url`, `[^1]: note`) is merged with the
+// blocks that use its label, and everything between them.
+
+export interface MarkdownBlock {
+  /** Offset of the block in the source; stable while text is appended. */
+  start: number;
+  source: string;
+}
+
+const FENCE = /^ {0,3}(`{3,}|~{3,})/;
+const MATH_FENCE = /^\s*\$\$/;
+const LIST_ITEM = /^ {0,3}([-*+]|\d{1,9}[.)])\s/;
+const DEFINITION = /^ {0,3}\[(\^?[^\]\s][^\]]*)\]:/gm;
+
+/**
+ * Split `content` into blocks. Given the result for a prefix of `content`
+ * (`previous`), only its last two blocks are scanned again.
+ */
+export function splitMarkdownBlocks(
+  content: string,
+  previous?: { content: string; blocks: MarkdownBlock[] },
+): MarkdownBlock[] {
+  return mergeDefinitions(content, splitBlocks(content, previous));
+}
+
+function splitBlocks(
+  content: string,
+  previous?: { content: string; blocks: MarkdownBlock[] },
+): MarkdownBlock[] {
+  let blocks: MarkdownBlock[] = [];
+  let offset = 0;
+  if (previous && previous.blocks.length > 1 && content.startsWith(previous.content)) {
+    // The last block may have been started by an incomplete line (`-` before
+    // `- item`), so the boundary before it is not final either.
+    blocks = previous.blocks.slice(0, -2);
+    offset = previous.blocks[previous.blocks.length - 2].start;
+  }
+
+  let start = -1; // Start of the open block
+  let end = -1; // End of its last non-blank line
+  let isList = false;
+  let fence: string | null = null;
+  let inMath = false;
+  let sawBlank = false;
+
+  const close = () => {
+    if (start !== -1) blocks.push({ start, source: content.slice(start, end) });
+    start = -1;
+  };
+
+  while (offset < content.length) {
+    const newline = content.indexOf('\n', offset);
+    const lineEnd = newline === -1 ? content.length : newline;
+    const line = content.slice(offset, lineEnd);
+
+    if (fence || inMath) {
+      if (fence && line.trimStart().startsWith(fence)) fence = null;
+      else if (inMath && line.includes('$$')) inMath = false;
+      end = lineEnd;
+    } else if (!line.trim()) {
+      sawBlank = start !== -1;
+    } else {
+      const continues = sawBlank && (/^\s/.test(line) || (isList && LIST_ITEM.test(line)));
+      if (sawBlank && !continues) close();
+      sawBlank = false;
+      if (start === -1) {
+        start = offset;
+        isList = LIST_ITEM.test(line);
+      }
+      end = lineEnd;
+
+      const opening = line.match(FENCE);
+      if (opening) fence = opening[1];
+      else if (MATH_FENCE.test(line) && (line.match(/\$\$/g)?.length ?? 0) % 2 === 1) inMath = true; // Not $$x$$ on one line
+    }
+    offset = lineEnd + 1;
+  }
+  close();
+  return blocks;
+}
+
+// Merge each block holding definitions with the blocks that use their labels.
+// Matches inside code only merge more than needed, which renders the same.
+function mergeDefinitions(content: string, blocks: MarkdownBlock[]): MarkdownBlock[] {
+  // Ranges of block indexes to merge, one per definition
+  const ranges: [number, number][] = [];
+  blocks.forEach((block, i) => {
+    for (const [, label] of block.source.matchAll(DEFINITION)) {
+      const reference = `[${label.toLowerCase()}]`;
+      let first = i;
+      let last = i;
+      blocks.forEach((other, j) => {
+        if (j === i || !other.source.toLowerCase().includes(reference)) return;
+        first = Math.min(first, j);
+        last = Math.max(last, j);
+      });
+      if (first !== last) ranges.push([first, last]);
+    }
+  });
+  if (ranges.length === 0) return blocks;
+
+  ranges.sort((a, b) => a[0] - b[0]);
+  const merged: MarkdownBlock[] = [];
+  let next = 0;
+  for (let [first, last] of ranges) {
+    if (first < next) continue; // Inside a range already merged
+    for (const range of ranges) {
+      if (range[0] <= last) last = Math.max(last, range[1]);
+    }
+    merged.push(...blocks.slice(next, first));
+    const { start } = blocks[first];
+    const end = blocks[last].start + blocks[last].source.length;
+    merged.push({ start, source: content.slice(start, end) });
+    next = last + 1;
+  }
+  merged.push(...blocks.slice(next));
+  return merged;
+}
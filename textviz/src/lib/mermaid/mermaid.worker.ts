@@ -0,0 +1,22 @@
+// Validates Mermaid syntax off the main thread.
+//
+// Only parsing happens here; layout needs the DOM and stays on the main
+// thread. If Mermaid cannot run in a worker (it reaches for `window` or
+// `document`), the reply says so and the caller parses on the main thread.
+
+import mermaid from 'mermaid';
+import type { ValidateRequest, ValidateResponse } from './renderService';
+
+self.onmessage = async (event: MessageEvent<ValidateRequest>) => {
+  const { id, source } = event.data;
+  let response: ValidateResponse;
+  try {
+    await mermaid.parse(source);
+    response = { id, valid: true };
+  } catch (error) {
+    response = error instanceof ReferenceError
+      ? { id, valid: null } // Missing browser API, not a syntax error
+      : { id, valid: false, message: error instanceof Error ? error.message : String(error) };
+  }
+  self.postMessage(response);
+};
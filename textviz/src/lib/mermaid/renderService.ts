@@ -0,0 +1,150 @@
+// Renders Mermaid diagrams for the preview.
+//
+// - Rendered SVGs are kept in an LRU keyed by a hash of the source, so going
+//   back to a diagram (or undoing an edit) shows it without rendering again.
+// - Every render() starts a new generation; older renders stop at their next
+//   step and resolve as stale, so overlapping renders never race.
+// - Syntax is checked in a Web Worker first, so invalid input never reaches
+//   the main-thread layout. mermaid.render itself needs the DOM and runs on
+//   the main thread, one render at a time.
+//
+// Mermaid itself is loaded on the first render that needs it.
+
+import { LruCache } from '@/lib/documents/lruCache';
+import { hashString } from '@/lib/hash';
+
+type Mermaid = typeof import('mermaid').default;
+
+export type ValidateRequest = { id: number; source: string };
+export type ValidateResponse = { id: number; valid: boolean | null; message?: string };
+
+export type RenderResult =
+  | { status: 'rendered'; svg: string }
+  | { status: 'error'; message: string }
+  | { status: 'stale' };
+
+const svgCache = new LruCache<string, { source: string; svg: string }>({
+  maxEntries: 50,
+  maxSize: 20 * 1024 * 1024, // Characters of SVG
+  sizeOf: entry => entry.svg.length,
+});
+
+/** Strip a ```mermaid fence around the diagram, if present. */
+export const cleanMermaidSource = (content: string) =>
+  content.replace(/```mermaid/g, '').replace(/```/g, '').trim();
+
+class MermaidRenderService {
+  private generation = 0;
+  private renderCount = 0;
+  private mermaid: Promise<Mermaid> | null = null;
+  private queue: Promise<unknown> = Promise.resolve(); // Serializes mermaid.render
+  private worker: Worker | null = null;
+  private workerUnavailable = false;
+  private nextValidateId = 0;
+  private validations = new Map<number, (response: ValidateResponse) => void>();
+
+  /** Cached SVG for `content`, if it has been rendered before. */
+  peek(content: string): string | undefined {
+    const source = cleanMermaidSource(content);
+    const cached = svgCache.peek(hashString(source));
+    return cached?.source === source ? cached.svg : undefined;
+  }
+
+  async render(content: string): Promise<RenderResult> {
+    const generation = ++this.generation;
+    const isStale = () => generation !== this.generation;
+    const source = cleanMermaidSource(content);
+    if (!source) return { status: 'rendered', svg: '' };
+
+    const key = hashString(source);
+    const cached = svgCache.get(key);
+    if (cached?.source === source) return { status: 'rendered', svg: cached.svg };
+
+    const validation = await this.validate(source);
+    if (isStale()) return { status: 'stale' };
+    if (!validation.valid) return { status: 'error', message: validation.message ?? 'Syntax Error' };
+
+    const result = this.queue.then(async (): Promise<RenderResult> => {
+      if (isStale()) return { status: 'stale' };
+      const mermaid = await this.load();
+      if (isStale()) return { status: 'stale' };
+      const { svg } = await mermaid.render(`mermaid-${++this.renderCount}`, source);
+      svgCache.set(key, { source, svg });
+      return isStale() ? { status: 'stale' } : { status: 'rendered', svg };
+    });
+    this.queue = result.catch(() => undefined);
+    try {
+      return await result;
+    } catch (error) {
+      return isStale()
+        ? { status: 'stale' }
+        : { status: 'error', message: error instanceof Error ? error.message : 'Syntax Error' };
+    }
+  }
+
+  private load() {
+    this.mermaid ??= import('mermaid').then(({ default: mermaid }) => {
+      mermaid.initialize({
+        startOnLoad: false,
+        theme: 'default',
+        securityLevel: 'loose',
+      });
+      return mermaid;
+    });
+    this.mermaid.catch(() => {
+      this.mermaid = null; // Let the next render try again
+    });
+    return this.mermaid;
+  }
+
+  private async validate(source: string): Promise<{ valid: boolean; message?: string }> {
+    const worker = this.getWorker();
+    if (worker) {
+      const id = ++this.nextValidateId;
+      const response = await new Promise<ValidateResponse>(resolve => {
+        this.validations.set(id, resolve);
+        const request: ValidateRequest = { id, source };
+        worker.postMessage(request);
+      });
+      if (response.valid !== null) return { valid: response.valid, message: response.message };
+      this.disableWorker('Mermaid cannot parse in a worker here');
+    }
+
+    // Main-thread fallback
+    try {
+      const mermaid = await this.load();
+      await mermaid.parse(source);
+      return { valid: true };
+    } catch (error) {
+      return { valid: false, message: error instanceof Error ? error.message : 'Syntax Error' };
+    }
+  }
+
+  private getWorker() {
+    if (this.worker || this.workerUnavailable) return this.worker;
+    try {
+      this.worker = new Worker(new URL('./mermaid.worker.ts', import.meta.url), { type: 'module' });
+      this.worker.onmessage = (event: MessageEvent<ValidateResponse>) => {
+        const resolve = this.validations.get(event.data.id);
+        this.validations.delete(event.data.id);
+        resolve?.(event.data);
+      };
+      this.worker.onerror = (event) => this.disableWorker(event.message);
+    } catch (error) {
+      this.disableWorker(error);
+    }
+    return this.worker;
+  }
+
+  private disableWorker(reason: unknown) {
+    console.warn('[renderService] Validating Mermaid on the main thread:', reason);
+    this.worker?.terminate();
+    this.worker = null;
+    this.workerUnavailable = true;
+    // Anything still waiting on the worker is answered by the main-thread fallback
+    this.validations.forEach((resolve, id) => resolve({ id, valid: null }));
+    this.validations.clear();
+  }
+}
+
+export const mermaidRenderService = new MermaidRenderService();
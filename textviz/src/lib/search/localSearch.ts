@@ -0,0 +1,112 @@
+// Main-thread side of local (signed-out) search.
+//
+// The index is built the first time someone searches, from the documents in
+// IndexedDB. After that useDocumentStore reports additions, edits and
+// deletions here. Edits are batched for a moment before they go to the index,
+// so typing does not copy the document to the worker on every keystroke.
+
+import {
+  handleRequest,
+  SearchIndex,
+  type IndexedDocument,
+  type SearchHit,
+  type SearchRequest,
+  type SearchResponse,
+} from './searchIndex';
+
+const UPDATE_DELAY_MS = 300;
+
+class LocalSearch {
+  private worker: Worker | null = null;
+  private inThread: SearchIndex | null = null; // When Web Workers are unavailable
+  private ready: Promise<void> | null = null;
+  private pending = new Map<string, IndexedDocument>();
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  private nextRequestId = 0;
+  private waiting = new Map<number, (hits: SearchHit[]) => void>();
+
+  /** Build the index from `load()` unless it is already built or building. */
+  ensureIndexed(load: () => Promise<IndexedDocument[]>) {
+    this.ready ??= load().then(docs => this.post({ type: 'reset', docs }));
+    this.ready.catch(() => {
+      this.ready = null; // Try again on the next search
+    });
+    return this.ready;
+  }
+
+  /**
+   * Record an added or edited document; a no-op until the index exists.
+   * Fields left undefined keep what is already queued (as in SearchIndex.upsert).
+   */
+  update({ id, title, content }: IndexedDocument) {
+    if (!this.ready) return;
+    const queued = this.pending.get(id);
+    this.pending.set(id, { id, title: title ?? queued?.title, content: content ?? queued?.content });
+    if (!this.timer) this.timer = setTimeout(() => void this.flush(), UPDATE_DELAY_MS);
+  }
+
+  remove(id: string) {
+    if (!this.ready) return;
+    this.pending.delete(id);
+    void this.ready.then(() => this.post({ type: 'remove', ids: [id] }));
+  }
+
+  async search(query: string, limit = 50): Promise<SearchHit[]> {
+    if (!this.ready) return [];
+    await this.flush();
+    const requestId = ++this.nextRequestId;
+    return new Promise(resolve => {
+      this.waiting.set(requestId, resolve);
+      this.post({ type: 'search', requestId, query, limit });
+    });
+  }
+
+  /** Drop the index, e.g. when the signed-in user changes. */
+  clear() {
+    this.worker?.terminate();
+    this.worker = null;
+    this.inThread = null;
+    this.ready = null;
+    this.pending.clear();
+    if (this.timer) clearTimeout(this.timer);
+    this.timer = null;
+    this.waiting.forEach(resolve => resolve([]));
+    this.waiting.clear();
+  }
+
+  private async flush() {
+    if (this.timer) clearTimeout(this.timer);
+    this.timer = null;
+    await this.ready;
+    if (this.pending.size === 0) return;
+    const docs = [...this.pending.values()];
+    this.pending.clear();
+    this.post({ type: 'upsert', docs });
+  }
+
+  private post(request: SearchRequest) {
+    if (!this.worker && !this.inThread) {
+      try {
+        this.worker = new Worker(new URL('./search.worker.ts', import.meta.url), { type: 'module' });
+        this.worker.onmessage = (event: MessageEvent<SearchResponse>) => this.receive(event.data);
+      } catch (error) {
+        console.warn('[localSearch] Web Worker unavailable, indexing on the main thread:', error);
+        this.inThread = new SearchIndex();
+      }
+    }
+    if (this.worker) {
+      this.worker.postMessage(request);
+    } else {
+      const response = handleRequest(this.inThread!, request);
+      if (response) this.receive(response);
+    }
+  }
+
+  private receive(response: SearchResponse) {
+    const resolve = this.waiting.get(response.requestId);
+    this.waiting.delete(response.requestId);
+    resolve?.(response.hits);
+  }
+}
+
+export const localSearch = new LocalSearch();
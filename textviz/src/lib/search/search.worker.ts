@@ -0,0 +1,11 @@
+// Keeps the local search index off the main thread. Requests are applied in
+// order, so a search always sees every update posted before it.
+
+import { handleRequest, SearchIndex, type SearchRequest } from './searchIndex';
+
+const index = new SearchIndex();
+
+self.onmessage = (event: MessageEvent<SearchRequest>) => {
+  const response = handleRequest(index, event.data);
+  if (response) self.postMessage(response);
+};
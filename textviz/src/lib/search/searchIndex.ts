@@ -0,0 +1,234 @@
+// Incremental inverted index over document titles and content.
+//
+// Used from the search worker (see search.worker.ts), and in-thread where Web
+// Workers are unavailable. Words are split on Unicode letters and digits, so
+// Hangul and Latin text tokenize alike. Every query word matches as a prefix
+// ("학교" finds "학교에서", "mark" finds "markdown"). A document must match
+// all query words, and results are ranked with BM25 (title hits count
+// TITLE_WEIGHT times).
+
+export interface IndexedDocument {
+  id: string;
+  title?: string;
+  content?: string;
+}
+
+export interface SnippetPart {
+  text: string;
+  match: boolean;
+}
+
+export interface SearchHit {
+  id: string;
+  score: number;
+  snippet: SnippetPart[];
+}
+
+export type SearchRequest =
+  | { type: 'reset'; docs: IndexedDocument[] }
+  | { type: 'upsert'; docs: IndexedDocument[] }
+  | { type: 'remove'; ids: string[] }
+  | { type: 'search'; requestId: number; query: string; limit: number };
+
+export type SearchResponse = { type: 'result'; requestId: number; hits: SearchHit[] };
+
+const TOKEN_SOURCE = '[\\p{L}\\p{N}]+';
+const TOKEN_PATTERN = new RegExp(TOKEN_SOURCE, 'gu');
+const TITLE_WEIGHT = 3;
+const MAX_PREFIX_EXPANSION = 64; // Terms a single short prefix may expand to
+const SNIPPET_RADIUS = 60;
+const K1 = 1.2;
+const B = 0.75;
+
+export const tokenize = (text: string): string[] =>
+  (text.normalize('NFKC').toLowerCase().match(TOKEN_PATTERN) ?? []);
+
+export class SearchIndex {
+  private docs = new Map<string, { title: string; content: string }>();
+  private docTerms = new Map<string, Map<string, number>>();
+  private docLengths = new Map<string, number>();
+  private postings = new Map<string, Map<string, number>>();
+  private totalLength = 0;
+  private sortedTerms: string[] | null = null; // Rebuilt lazily after the vocabulary changes
+
+  get size() {
+    return this.docs.size;
+  }
+
+  reset(docs: IndexedDocument[]) {
+    this.docs.clear();
+    this.docTerms.clear();
+    this.docLengths.clear();
+    this.postings.clear();
+    this.totalLength = 0;
+    this.sortedTerms = null;
+    docs.forEach(doc => this.upsert(doc));
+  }
+
+  /** Add a document, or re-index it with whichever of title/content is given. */
+  upsert({ id, title, content }: IndexedDocument) {
+    const previous = this.docs.get(id);
+    const doc = {
+      title: title ?? previous?.title ?? '',
+      content: content ?? previous?.content ?? '',
+    };
+    this.remove(id);
+    this.docs.set(id, doc);
+
+    const terms = new Map<string, number>();
+    for (const token of tokenize(doc.title)) terms.set(token, (terms.get(token) ?? 0) + TITLE_WEIGHT);
+    for (const token of tokenize(doc.content)) terms.set(token, (terms.get(token) ?? 0) + 1);
+
+    let length = 0;
+    terms.forEach((tf, term) => {
+      length += tf;
+      let posting = this.postings.get(term);
+      if (!posting) {
+        posting = new Map();
+        this.postings.set(term, posting);
+        this.sortedTerms = null;
+      }
+      posting.set(id, tf);
+    });
+    this.docTerms.set(id, terms);
+    this.docLengths.set(id, length);
+    this.totalLength += length;
+  }
+
+  remove(id: string) {
+    const terms = this.docTerms.get(id);
+    if (!terms) return;
+    terms.forEach((_tf, term) => {
+      const posting = this.postings.get(term);
+      if (!posting) return;
+      posting.delete(id);
+      if (posting.size === 0) {
+        this.postings.delete(term);
+        this.sortedTerms = null;
+      }
+    });
+    this.totalLength -= this.docLengths.get(id) ?? 0;
+    this.docTerms.delete(id);
+    this.docLengths.delete(id);
+    this.docs.delete(id);
+  }
+
+  search(query: string, limit = 50): SearchHit[] {
+    const words = [...new Set(tokenize(query))];
+    if (words.length === 0 || this.docs.size === 0) return [];
+
+    const avgLength = this.totalLength / this.docs.size || 1;
+    let scores: Map<string, number> | null = null;
+
+    for (const word of words) {
+      // Sum over every indexed term the word is a prefix of.
+      const wordScores = new Map<string, number>();
+      for (const term of this.expand(word)) {
+        const posting = this.postings.get(term)!;
+        const idf = Math.log(1 + (this.docs.size - posting.size + 0.5) / (posting.size + 0.5));
+        posting.forEach((tf, id) => {
+          if (scores && !scores.has(id)) return; // Already failed an earlier word
+          const norm = tf + K1 * (1 - B + B * (this.docLengths.get(id)! / avgLength));
+          wordScores.set(id, (wordScores.get(id) ?? 0) + idf * (tf * (K1 + 1)) / norm);
+        });
+      }
+      if (scores) {
+        const previous: Map<string, number> = scores;
+        wordScores.forEach((score, id) => wordScores.set(id, score + previous.get(id)!));
+      }
+      scores = wordScores;
+      if (scores.size === 0) return [];
+    }
+
+    return [...scores!.entries()]
+      .sort((a, b) => b[1] - a[1])
+      .slice(0, limit)
+      .map(([id, score]) => ({ id, score, snippet: this.snippet(id, words) }));
+  }
+
+  /** Indexed terms starting with `prefix`, most frequent first when there are too many. */
+  private expand(prefix: string): string[] {
+    const terms = this.sortedTerms ??= [...this.postings.keys()].sort();
+    let lo = 0;
+    let hi = terms.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (terms[mid] < prefix) lo = mid + 1;
+      else hi = mid;
+    }
+    const matches: string[] = [];
+    for (let i = lo; i < terms.length && terms[i].startsWith(prefix); i++) matches.push(terms[i]);
+    if (matches.length <= MAX_PREFIX_EXPANSION) return matches;
+    return matches
+      .sort((a, b) => this.postings.get(b)!.size - this.postings.get(a)!.size)
+      .slice(0, MAX_PREFIX_EXPANSION);
+  }
+
+  /** Text around the first content match, split into matching and plain parts. */
+  private snippet(id: string, words: string[]): SnippetPart[] {
+    const doc = this.docs.get(id)!;
+    const isMatch = (token: string) => {
+      const lower = token.normalize('NFKC').toLowerCase();
+      return words.some(word => lower.startsWith(word));
+    };
+
+    const pattern = new RegExp(TOKEN_SOURCE, 'gu');
+    let first: RegExpExecArray | null = null;
+    for (let m = pattern.exec(doc.content); m; m = pattern.exec(doc.content)) {
+      if (isMatch(m[0])) {
+        first = m;
+        break;
+      }
+    }
+    if (!first) return highlight(doc.title, isMatch);
+
+    const start = Math.max(0, first.index - SNIPPET_RADIUS);
+    const end = Math.min(doc.content.length, first.index + first[0].length + SNIPPET_RADIUS * 2);
+    const parts = highlight(doc.content.slice(start, end).replace(/\s+/g, ' '), isMatch);
+    if (start > 0) parts.unshift({ text: '…', match: false });
+    if (end < doc.content.length) parts.push({ text: '…', match: false });
+    return parts;
+  }
+}
+
+const highlight = (text: string, isMatch: (token: string) => boolean): SnippetPart[] => {
+  const parts: SnippetPart[] = [];
+  const pattern = new RegExp(TOKEN_SOURCE, 'gu');
+  let last = 0;
+  for (let m = pattern.exec(text); m; m = pattern.exec(text)) {
+    if (!isMatch(m[0])) continue;
+    if (m.index > last) parts.push({ text: text.slice(last, m.index), match: false });
+    parts.push({ text: m[0], match: true });
+    last = m.index + m[0].length;
+  }
+  if (last < text.length) parts.push({ text: text.slice(last), match: false });
+  return parts;
+};
+
+/** Split a Postgres ts_headline marked with U+E000/U+E001 (see the search_documents function). */
+export const parseHeadline = (headline: string): SnippetPart[] =>
+  headline
+    .split('\uE000')
+    .flatMap((chunk, i) => {
+      if (i === 0) return [{ text: chunk, match: false }];
+      const [matched, rest = ''] = chunk.split('\uE001');
+      return [{ text: matched, match: true }, { text: rest, match: false }];
+    })
+    .filter(part => part.text);
+
+/** Apply one request; shared by the worker and the in-thread fallback. */
+export const handleRequest = (index: SearchIndex, request: SearchRequest): SearchResponse | null => {
+  switch (request.type) {
+    case 'reset':
+      index.reset(request.docs);
+      return null;
+    case 'upsert':
+      request.docs.forEach(doc => index.upsert(doc));
+      return null;
+    case 'remove':
+      request.ids.forEach(id => index.remove(id));
+      return null;
+    case 'search':
+      return { type: 'result', requestId: request.requestId, hits: index.search(request.query, request.limit) };
+  }
+};
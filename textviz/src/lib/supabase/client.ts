@@ -1,8 +1,20 @@
 import { createBrowserClient } from '@supabase/ssr'
 
+type BrowserClient = ReturnType<typeof createBrowserClient>
+
+// One client per tab, so every caller shares the same session and auth listeners.
+let browserClient: BrowserClient | undefined
+
 export function createClient() {
-    return createBrowserClient(
+    if (typeof window === 'undefined') {
+        return createBrowserClient(
+            process.env.NEXT_PUBLIC_SUPABASE_URL!,
+            process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY!
+        )
+    }
+    browserClient ??= createBrowserClient(
         process.env.NEXT_PUBLIC_SUPABASE_URL!,
         process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY!
     )
+    return browserClient
 }
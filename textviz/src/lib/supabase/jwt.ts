@@ -0,0 +1,149 @@
+// Verifies Supabase access tokens without a round trip to Supabase Auth.
+//
+// Tokens signed with an asymmetric key (ES256, RS256) are checked against the
+// project's JWKS, fetched once and cached; a token with an unknown `kid` (after
+// a key rotation) refetches it at most once per JWKS_REFETCH_MS. HS256 tokens
+// are checked with SUPABASE_JWT_SECRET when it is set. Only tokens that cannot
+// be checked locally go to the caller's fallback, and a token accepted either
+// way is remembered until it expires, so Supabase is asked once per token.
+
+import { LruCache } from '@/lib/documents/lruCache';
+
+export interface JwtClaims {
+  sub: string;
+  exp: number;
+  aud?: string | string[];
+  iss?: string;
+  role?: string;
+  email?: string;
+  session_id?: string;
+}
+
+type Verification = { status: 'valid'; claims: JwtClaims } | { status: 'invalid' } | { status: 'unverifiable' };
+
+const JWKS_TTL_MS = 10 * 60 * 1000;
+const JWKS_REFETCH_MS = 30 * 1000;
+
+const ALGORITHMS: Record<string, { import: HmacImportParams | EcKeyImportParams | RsaHashedImportParams; verify: AlgorithmIdentifier | EcdsaParams }> = {
+  HS256: { import: { name: 'HMAC', hash: 'SHA-256' }, verify: 'HMAC' },
+  ES256: { import: { name: 'ECDSA', namedCurve: 'P-256' }, verify: { name: 'ECDSA', hash: 'SHA-256' } },
+  RS256: { import: { name: 'RSASSA-PKCS1-v1_5', hash: 'SHA-256' }, verify: 'RSASSA-PKCS1-v1_5' },
+};
+
+const encoder = new TextEncoder();
+
+const base64UrlDecode = (value: string) => {
+  const base64 = value.replace(/-/g, '+').replace(/_/g, '/') + '='.repeat((4 - (value.length % 4)) % 4);
+  return Uint8Array.from(atob(base64), c => c.charCodeAt(0));
+};
+
+const decodeJson = <T>(segment: string): T => JSON.parse(new TextDecoder().decode(base64UrlDecode(segment)));
+
+// Accepted tokens, until they expire
+const acceptedTokens = new LruCache<string, JwtClaims>({ maxEntries: 1000 });
+
+let secretKey: Promise<CryptoKey> | null = null;
+let jwks: { keys: Map<string, JsonWebKey>; fetchedAt: number } | null = null;
+let jwksRequest: Promise<void> | null = null;
+const jwkKeys = new Map<string, Promise<CryptoKey>>();
+
+function getSecretKey() {
+  const secret = process.env.SUPABASE_JWT_SECRET;
+  if (!secret) return null;
+  secretKey ??= crypto.subtle.importKey('raw', encoder.encode(secret), ALGORITHMS.HS256.import, false, ['verify']);
+  return secretKey;
+}
+
+function refreshJwks() {
+  jwksRequest ??= (async () => {
+    try {
+      const response = await fetch(`${process.env.NEXT_PUBLIC_SUPABASE_URL}/auth/v1/.well-known/jwks.json`);
+      if (!response.ok) throw new Error(`JWKS request failed with ${response.status}`);
+      const { keys = [] } = (await response.json()) as { keys?: (JsonWebKey & { kid?: string })[] };
+      jwks = { keys: new Map(keys.filter(key => key.kid).map(key => [key.kid!, key])), fetchedAt: Date.now() };
+      jwkKeys.clear();
+    } catch (error) {
+      console.warn('[jwt] Could not fetch the JWKS:', error);
+      jwks = { keys: jwks?.keys ?? new Map(), fetchedAt: Date.now() }; // Keep any old keys; retry after JWKS_REFETCH_MS
+    } finally {
+      jwksRequest = null;
+    }
+  })();
+  return jwksRequest;
+}
+
+async function getJwk(kid: string, alg: string): Promise<CryptoKey | null> {
+  const age = jwks ? Date.now() - jwks.fetchedAt : Infinity;
+  if (age > JWKS_TTL_MS || (!jwks?.keys.has(kid) && age > JWKS_REFETCH_MS)) await refreshJwks();
+
+  const jwk = jwks?.keys.get(kid);
+  if (!jwk) return null;
+  let key = jwkKeys.get(kid);
+  if (!key) {
+    key = crypto.subtle.importKey('jwk', jwk, ALGORITHMS[alg].import, false, ['verify']);
+    jwkKeys.set(kid, key);
+  }
+  return key;
+}
+
+function checkClaims(claims: JwtClaims): boolean {
+  const now = Date.now() / 1000;
+  if (!claims.sub || !(claims.exp > now)) return false;
+  const audiences = Array.isArray(claims.aud) ? claims.aud : [claims.aud];
+  if (claims.aud !== undefined && !audiences.includes('authenticated')) return false;
+  return !claims.iss || claims.iss === `${process.env.NEXT_PUBLIC_SUPABASE_URL}/auth/v1`;
+}
+
+async function verifyLocally(token: string): Promise<Verification> {
+  const [headerPart, payloadPart, signaturePart] = token.split('.');
+  if (!headerPart || !payloadPart || !signaturePart) return { status: 'invalid' };
+
+  let header: { alg?: string; kid?: string };
+  let claims: JwtClaims;
+  try {
+    header = decodeJson(headerPart);
+    claims = decodeJson(payloadPart);
+  } catch {
+    return { status: 'invalid' };
+  }
+  if (!checkClaims(claims)) return { status: 'invalid' };
+
+  const alg = header.alg ?? '';
+  if (!ALGORITHMS[alg]) return { status: 'unverifiable' };
+  const key = alg === 'HS256' ? await getSecretKey() : header.kid ? await getJwk(header.kid, alg) : null;
+  if (!key) return { status: 'unverifiable' };
+
+  const valid = await crypto.subtle.verify(
+    ALGORITHMS[alg].verify,
+    key,
+    base64UrlDecode(signaturePart),
+    encoder.encode(`${headerPart}.${payloadPart}`),
+  );
+  return valid ? { status: 'valid', claims } : { status: 'invalid' };
+}
+
+/**
+ * Claims of `token` if it is a valid, unexpired access token, else null.
+ * `verifyRemotely` is called for tokens that cannot be checked locally
+ * (an HS256 project without SUPABASE_JWT_SECRET, or a key missing from the JWKS).
+ */
+export async function verifyAccessToken(token: string, verifyRemotely: () => Promise<boolean>): Promise<JwtClaims | null> {
+  const accepted = acceptedTokens.get(token);
+  if (accepted && accepted.exp > Date.now() / 1000) return accepted;
+
+  let result: Verification;
+  try {
+    result = await verifyLocally(token);
+  } catch (error) {
+    console.warn('[jwt] Local verification failed:', error);
+    result = { status: 'unverifiable' };
+  }
+  if (result.status === 'invalid') return null;
+
+  if (result.status === 'unverifiable') {
+    if (!(await verifyRemotely())) return null;
+    result = { status: 'valid', claims: decodeJson<JwtClaims>(token.split('.')[1]) };
+  }
+  acceptedTokens.set(token, result.claims);
+  return result.claims;
+}
@@ -1,7 +1,19 @@
 import { createServerClient } from '@supabase/ssr'
 import { NextResponse, type NextRequest } from 'next/server'
+import { verifyAccessToken } from './jwt'
+
+// Routes that require authentication. Keep the matcher in src/middleware.ts in sync.
+export const protectedRoutes = ['/json-builder', '/latex', '/mermaid', '/repository', '/settings'];
+
+const isProtectedRoute = (pathname: string) =>
+    protectedRoutes.some(route => pathname === route || pathname.startsWith(`${route}/`));
 
 export async function updateSession(request: NextRequest) {
+    // Public routes need no session check; the browser client refreshes its own tokens
+    if (!isProtectedRoute(request.nextUrl.pathname)) {
+        return NextResponse.next({ request })
+    }
+
     let supabaseResponse = NextResponse.next({
         request,
     })
@@ -30,18 +42,23 @@ export async function updateSession(request: NextRequest) {
     )
 
     // IMPORTANT: Avoid writing any logic between createServerClient and
-    // supabase.auth.getUser(). A simple mistake could make it very hard to debug
+    // supabase.auth.getSession(). A simple mistake could make it very hard to debug
     // issues with users being randomly logged out.
 
+    // getSession reads the session from the cookies. It only calls Supabase when
+    // the access token has expired, to refresh it (setAll then writes the new
+    // cookies). The cookies are not trusted as is: the access token's signature
+    // and expiry are verified locally.
     const {
-        data: { user },
-    } = await supabase.auth.getUser()
+        data: { session },
+    } = await supabase.auth.getSession()
 
-    // Protected routes that require authentication
-    const protectedRoutes = ['/json-builder', '/latex', '/mermaid', '/repository', '/settings'];
-    const isProtectedRoute = protectedRoutes.some(route => request.nextUrl.pathname.startsWith(route));
+    const claims = session && await verifyAccessToken(session.access_token, async () => {
+        const { data: { user } } = await supabase.auth.getUser(session.access_token)
+        return !!user
+    })
 
-    if (!user && isProtectedRoute) {
+    if (!claims) {
         // Redirect unauthenticated users to login page
         const url = request.nextUrl.clone();
         url.pathname = '/login';
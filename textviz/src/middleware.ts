@@ -6,14 +6,16 @@ export async function middleware(request: NextRequest) {
 }
 
 export const config = {
+    /*
+     * Only the protected routes (protectedRoutes in lib/supabase/middleware.ts),
+     * so public pages, /api/chat and static files skip the middleware entirely.
+     * `/latex/:path*` also matches `/latex` itself.
+     */
     matcher: [
-        /*
-         * Match all request paths except for the ones starting with:
-         * - _next/static (static files)
-         * - _next/image (image optimization files)
-         * - favicon.ico (favicon file)
-         * Feel free to modify this pattern to include more paths.
-         */
-        '/((?!_next/static|_next/image|favicon.ico|.*\\.(?:svg|png|jpg|jpeg|gif|webp)$).*)',
+        '/json-builder/:path*',
+        '/latex/:path*',
+        '/mermaid/:path*',
+        '/repository/:path*',
+        '/settings/:path*',
     ],
 }
@@ -1,11 +1,14 @@
 import { create } from 'zustand';
 import { persist, createJSONStorage } from 'zustand/middleware';
+import { DEFAULT_EXPORT_SCALE } from '@/lib/export/constants';
 
 interface AppState {
   isDarkMode: boolean;
   toggleDarkMode: () => void;
   sidebarOpen: boolean;
   toggleSidebar: () => void;
+  exportScale: number; // PNG pixels per CSS pixel
+  setExportScale: (scale: number) => void;
 }
 
 export const useAppStore = create<AppState>()(
@@ -15,6 +18,8 @@ export const useAppStore = create<AppState>()(
       toggleDarkMode: () => set((state) => ({ isDarkMode: !state.isDarkMode })),
       sidebarOpen: true,
       toggleSidebar: () => set((state) => ({ sidebarOpen: !state.sidebarOpen })),
+      exportScale: DEFAULT_EXPORT_SCALE,
+      setExportScale: (exportScale) => set({ exportScale }),
     }),
     {
       name: 'textviz-app-storage',
@@ -1,5 +1,13 @@
 import { create } from 'zustand';
 import { createClient } from '@/lib/supabase/client';
+import { WriteBehindQueue } from '@/lib/documents/writeBehind';
+import * as localDocuments from '@/lib/documents/localDocuments';
+import { LruCache } from '@/lib/documents/lruCache';
+import { countWords, makePreview } from '@/lib/documents/preview';
+import { syncInBatches, type SyncProgress } from '@/lib/documents/batchSync';
+import { localSearch } from '@/lib/search/localSearch';
+import { parseHeadline, type SearchHit } from '@/lib/search/searchIndex';
+import type { User } from '@supabase/supabase-js';
 import { v4 as uuidv4 } from 'uuid';
 
 export type DocumentType = 'markdown' | 'latex' | 'mermaid' | 'json-builder';
@@ -13,6 +21,11 @@ export interface Document {
   updatedAt: number;
   user_id?: string;
   isLocal?: boolean;
+  // Listings load metadata only: `content` is '' until loadDocumentContent runs,
+  // and `preview`/`wordCount` (stored with the row) stand in for it.
+  isContentLoaded?: boolean;
+  preview?: string;
+  wordCount?: number;
   metadata?: {
     language?: string; // 'ko', 'en'
     intent?: string; // 'report', 'blog', 'email', 'creative'
@@ -27,16 +40,23 @@ interface DocumentStore {
   activeDocumentId: string | null;
   isLoading: boolean;
   isInitialized: boolean;
+  hasMore: Record<DocumentType, boolean>;
 
   fetchDocuments: () => Promise<void>;
+  fetchMoreDocuments: (type?: DocumentType) => Promise<void>;
+  loadDocumentContent: (id: string) => Promise<void>;
+  readDocumentContent: (id: string) => Promise<string | null>;
   setIsInitialized: (isInitialized: boolean) => void;
   addDocument: (type: DocumentType) => Promise<Document | void>;
   deleteDocument: (id: string) => Promise<void>;
-  updateDocument: (id: string, updates: { content?: string; title?: string; metadata?: any }) => Promise<void>;
+  updateDocument: (id: string, updates: DocumentUpdates) => Promise<void>;
+  flushPendingWrites: () => Promise<void>;
   setActiveDocument: (id: string) => void;
   getActiveDocument: () => Document | null;
   getDocumentsByType: (type: DocumentType) => Document[];
-  syncLocalDocuments: () => Promise<number>; // Returns count of synced docs
+  searchDocuments: (query: string) => Promise<SearchHit[]>;
+  syncProgress: SyncProgress | null;
+  syncLocalDocuments: (onProgress?: (progress: SyncProgress) => void) => Promise<number>; // Returns count of synced docs
 }
 
 const defaultTemplates: Record<DocumentType, string> = {
@@ -82,8 +102,6 @@ $$ \prod_{i=1}^{n} i = n! $$`,
   'json-builder': '{"prompt":"","blocks":[]}',
 };
 
-const LOCAL_STORAGE_KEY = 'textviz-documents';
-
 const getDefaultTitle = (type: DocumentType, documents: Document[]): string => {
   const extension = type === 'markdown' ? 'md' : type === 'latex' ? 'tex' : type === 'mermaid' ? 'mmd' : 'json';
   const prefix = 'Untitled-';
@@ -99,23 +117,13 @@ const getDefaultTitle = (type: DocumentType, documents: Document[]): string => {
   return `${prefix}${maxNumber + 1}.${extension}`;
 };
 
-// Helper for LocalStorage
-const getLocalDocs = (): Document[] => {
-  if (typeof window === 'undefined') return [];
-  const stored = localStorage.getItem(LOCAL_STORAGE_KEY);
-  return stored ? JSON.parse(stored) : [];
-};
-
+// Local documents live in IndexedDB (see lib/documents/localDocuments.ts);
+// the active document id stays in LocalStorage.
 const getLocalActiveId = (): string | null => {
   if (typeof window === 'undefined') return null;
   return localStorage.getItem('textviz-active-doc');
 };
 
-const saveLocalDocs = (docs: Document[]) => {
-  if (typeof window === 'undefined') return;
-  localStorage.setItem(LOCAL_STORAGE_KEY, JSON.stringify(docs));
-};
-
 const saveLocalActiveId = (id: string | null) => {
   if (typeof window === 'undefined') return;
   if (id) {
@@ -125,50 +133,266 @@ const saveLocalActiveId = (id: string | null) => {
   }
 };
 
+// Auth identity cache. The user is read once from the locally stored session
+// (getSession, no network request) and then kept current by onAuthStateChange,
+// so document operations can pick local vs remote mode without an auth round trip.
+// The listener is registered at module load so it runs before any component's.
+let authUser: User | null | undefined; // undefined until the session has been read
+let authUserPromise: Promise<User | null> | null = null;
+
+const getAuthUser = (): Promise<User | null> => {
+  if (authUser !== undefined) return Promise.resolve(authUser);
+  authUserPromise ??= createClient().auth.getSession().then(({ data: { session } }) => {
+    if (authUser === undefined) authUser = session?.user ?? null;
+    return authUser;
+  });
+  return authUserPromise;
+};
+
+if (typeof window !== 'undefined') {
+  createClient().auth.onAuthStateChange((_event, session) => {
+    // Fires on INITIAL_SESSION, SIGNED_IN, SIGNED_OUT, TOKEN_REFRESHED and USER_UPDATED.
+    const user = session?.user ?? null;
+    if (authUser !== undefined && authUser?.id !== user?.id) {
+      contentCache.clear();
+      localSearch.clear();
+    }
+    authUser = user;
+  });
+}
+
+// Listing: per-type keyset pagination on (updated_at, id), metadata columns only.
+const DOCUMENT_TYPES: DocumentType[] = ['markdown', 'latex', 'mermaid', 'json-builder'];
+const PAGE_SIZE = 50;
+const LIST_COLUMNS = 'id, type, title, preview, word_count, metadata, created_at, updated_at, user_id';
+const NO_MORE: Record<DocumentType, boolean> = { markdown: false, latex: false, mermaid: false, 'json-builder': false };
+
+type PageCursor = { updatedAt: string; id: string }; // Raw updated_at, to keep its full precision
+const pageCursors: Partial<Record<DocumentType, PageCursor>> = {};
+
+const fromListRow = (row: any): Document => ({
+  id: row.id,
+  type: row.type as DocumentType,
+  title: row.title,
+  content: '',
+  isContentLoaded: false,
+  preview: row.preview ?? '',
+  wordCount: row.word_count ?? 0,
+  createdAt: new Date(row.created_at).getTime(),
+  updatedAt: new Date(row.updated_at).getTime(),
+  user_id: row.user_id,
+  isLocal: false,
+  metadata: row.metadata ?? undefined,
+});
+
+const fetchPage = async (type: DocumentType, cursor?: PageCursor) => {
+  let query = createClient()
+    .from('documents')
+    .select(LIST_COLUMNS)
+    .eq('type', type)
+    .order('updated_at', { ascending: false })
+    .order('id', { ascending: false })
+    .limit(PAGE_SIZE);
+  if (cursor) {
+    query = query.or(
+      `updated_at.lt."${cursor.updatedAt}",and(updated_at.eq."${cursor.updatedAt}",id.lt.${cursor.id})`
+    );
+  }
+
+  const { data, error } = await query;
+  if (error) throw error;
+
+  const last = data[data.length - 1];
+  pageCursors[type] = last ? { updatedAt: last.updated_at, id: last.id } : cursor;
+  return { documents: data.map(fromListRow), hasMore: data.length === PAGE_SIZE };
+};
+
+// Loaded content, most recently used first. Documents pushed out of the cache
+// are unloaded from the store again, which bounds how much content it holds.
+type CachedContent = { content: string; updatedAt: number };
+const contentCache = new LruCache<string, CachedContent>({
+  maxEntries: 20,
+  maxSize: 8 * 1024 * 1024, // characters
+  sizeOf: entry => entry.content.length,
+  onEvict: id => unloadContent(id),
+});
+const contentLoads = new Map<string, Promise<void>>();
+
+const unloadContent = (id: string) => {
+  const { documents, activeDocumentId } = useDocumentStore.getState();
+  if (id === activeDocumentId || writeQueue.hasPending(id)) return;
+  useDocumentStore.setState({
+    documents: documents.map(d => d.id === id && d.isContentLoaded !== false
+      ? { ...d, content: '', isContentLoaded: false, preview: makePreview(d.content), wordCount: countWords(d.content) }
+      : d),
+  });
+};
+
+// Keep content the store or cache already holds for a listed document, unless the listing is newer.
+const withLoadedContent = (doc: Document, previous?: Document): Document => {
+  if (previous && previous.isContentLoaded !== false && previous.updatedAt >= doc.updatedAt) {
+    return { ...doc, content: previous.content, isContentLoaded: true };
+  }
+  const cached = contentCache.peek(doc.id);
+  if (cached && cached.updatedAt >= doc.updatedAt) {
+    return { ...doc, content: cached.content, isContentLoaded: true };
+  }
+  contentCache.delete(doc.id);
+  return doc;
+};
+
+const fetchRemoteContent = async (id: string): Promise<string | null> => {
+  const { data, error } = await createClient()
+    .from('documents')
+    .select('content')
+    .eq('id', id)
+    .single();
+  if (error) {
+    console.error('[useDocumentStore] Error loading document content:', error);
+    return null;
+  }
+  return data.content;
+};
+
+type DocumentUpdates = { content?: string; title?: string; metadata?: any };
+type DocumentPatch = DocumentUpdates & { updatedAt: number };
+
+// Edits are applied to the store immediately and persisted in the background,
+// merged per document (see lib/documents/writeBehind.ts).
+const persistDocument = async (id: string, patch: DocumentPatch) => {
+  const doc = useDocumentStore.getState().documents.find(d => d.id === id);
+  if (!doc) return; // Deleted before the flush
+
+  const supabase = createClient();
+  const user = await getAuthUser();
+
+  if (!doc.isLocal && !user) {
+    // Signed out with a remote edit still queued; nothing we can write it to.
+    console.warn('[useDocumentStore] Dropping edit to remote document after sign-out:', id);
+    return;
+  }
+
+  if (user && !doc.isLocal) {
+    const dbUpdates: any = { updated_at: new Date(patch.updatedAt).toISOString() };
+    if (patch.content !== undefined) {
+      dbUpdates.content = patch.content;
+      dbUpdates.preview = makePreview(patch.content);
+      dbUpdates.word_count = countWords(patch.content);
+    }
+    if (patch.title !== undefined) dbUpdates.title = patch.title;
+    if (patch.metadata !== undefined) dbUpdates.metadata = patch.metadata;
+
+    const { error } = await supabase
+      .from('documents')
+      .update(dbUpdates)
+      .eq('id', id);
+
+    if (error) throw error; // Re-queued and retried by the queue
+  } else {
+    // Local Update: rewrites this document's records only
+    await localDocuments.update(id, patch);
+  }
+};
+
+const writeQueue = new WriteBehindQueue<DocumentPatch>(persistDocument);
+
+// Fetched rows must not clobber edits that have not been written yet.
+const withPendingEdits = (doc: Document): Document => {
+  const patch = writeQueue.peek(doc.id);
+  if (!patch) return doc;
+  return patch.content !== undefined ? { ...doc, ...patch, isContentLoaded: true } : { ...doc, ...patch };
+};
+
+// Guest documents are uploaded in multi-row upserts keyed on their client-generated
+// id, so a retry after a partial failure cannot create duplicates. Each uploaded
+// batch is removed from local storage right away, which is how later runs know to
+// skip it.
+let syncInFlight: Promise<number> | null = null;
+
+const syncLocal = async (onProgress?: (progress: SyncProgress) => void): Promise<number> => {
+  await writeQueue.flush(); // Make sure the latest local edits are in storage
+  const localDocs = await localDocuments.loadAll();
+  if (localDocs.length === 0) return 0;
+
+  const supabase = createClient();
+  const user = await getAuthUser();
+  if (!user) return 0;
+
+  const { synced, failed } = await syncInBatches(localDocs, {
+    upload: async (batch) => {
+      const { error } = await supabase
+        .from('documents')
+        .upsert(batch.map(doc => ({
+          id: doc.id,
+          user_id: user.id,
+          type: doc.type,
+          title: doc.title, // Keep title, duplicates allowed
+          content: doc.content,
+          preview: makePreview(doc.content),
+          word_count: countWords(doc.content),
+          metadata: doc.metadata ?? {},
+          created_at: new Date(doc.createdAt).toISOString(),
+          updated_at: new Date(doc.updatedAt).toISOString(),
+        })), { onConflict: 'id', ignoreDuplicates: true });
+      if (error) throw error;
+    },
+    onBatchDone: batch => localDocuments.removeMany(batch.map(doc => doc.id)),
+    onProgress: progress => {
+      useDocumentStore.setState({ syncProgress: progress });
+      onProgress?.(progress);
+    },
+    sizeOf: doc => doc.content.length + doc.title.length,
+  });
+
+  if (failed.length > 0) {
+    console.error('[useDocumentStore] Failed to sync', failed.length, 'documents; they stay local for the next attempt');
+  }
+  if (synced.length > 0) {
+    await useDocumentStore.getState().fetchDocuments(); // Refresh from server
+  }
+  return synced.length;
+};
+
 export const useDocumentStore = create<DocumentStore>((set, get) => ({
   documents: [],
   activeDocumentId: null,
   isLoading: false,
   isInitialized: false,
+  hasMore: NO_MORE,
+  syncProgress: null,
 
   setIsInitialized: (isInitialized: boolean) => set({ isInitialized }),
 
   fetchDocuments: async () => {
     set({ isLoading: true });
-    const supabase = createClient();
-    const { data: { user } } = await supabase.auth.getUser();
+    const user = await getAuthUser();
+    let listed: Document[];
+    let hasMore = NO_MORE;
 
     if (user) {
-      // Remote Mode
-      const { data, error } = await supabase
-        .from('documents')
-        .select('*')
-        .order('updated_at', { ascending: false });
-
-      if (error) {
+      // Remote Mode: first page of each type, so every editor finds its recent documents
+      try {
+        const pages = await Promise.all(DOCUMENT_TYPES.map(type => fetchPage(type)));
+        listed = pages.flatMap(page => page.documents);
+        hasMore = Object.fromEntries(
+          DOCUMENT_TYPES.map((type, i) => [type, pages[i].hasMore])
+        ) as Record<DocumentType, boolean>;
+      } catch (error) {
         console.error('Error fetching documents:', error);
         set({ isLoading: false, isInitialized: true });
         return;
       }
-
-      const documents: Document[] = data.map(doc => ({
-        id: doc.id,
-        type: doc.type as DocumentType,
-        title: doc.title,
-        content: doc.content,
-        createdAt: new Date(doc.created_at).getTime(),
-        updatedAt: new Date(doc.updated_at).getTime(),
-        user_id: doc.user_id,
-        isLocal: false,
-      }));
-
-      set({ documents, isLoading: false, isInitialized: true });
     } else {
       // Local Mode
-      const localDocs = getLocalDocs();
-      set({ documents: localDocs, isLoading: false, isInitialized: true });
+      listed = await localDocuments.listMeta();
     }
 
+    const previous = new Map(get().documents.map(d => [d.id, d]));
+    const documents = listed
+      .map(doc => withPendingEdits(withLoadedContent(doc, previous.get(doc.id))))
+      .sort((a, b) => b.updatedAt - a.updatedAt);
+    set({ documents, hasMore, isLoading: false, isInitialized: true });
+
     // Set active document if needed
     if (!get().activeDocumentId) {
       const savedActiveId = getLocalActiveId();
@@ -176,12 +400,74 @@ export const useDocumentStore = create<DocumentStore>((set, get) => ({
         set({ activeDocumentId: savedActiveId });
       }
     }
+    const activeId = get().activeDocumentId;
+    if (activeId) void get().loadDocumentContent(activeId);
+  },
+
+  fetchMoreDocuments: async (type?: DocumentType) => {
+    const user = await getAuthUser();
+    if (!user) return; // Local mode lists everything at once
+
+    const types = (type ? [type] : DOCUMENT_TYPES).filter(t => get().hasMore[t] && pageCursors[t]);
+    if (types.length === 0) return;
+
+    try {
+      const pages = await Promise.all(types.map(t => fetchPage(t, pageCursors[t])));
+      const known = new Set(get().documents.map(d => d.id));
+      const added = pages.flatMap(page => page.documents).filter(d => !known.has(d.id));
+      const hasMore = { ...get().hasMore };
+      types.forEach((t, i) => { hasMore[t] = pages[i].hasMore; });
+
+      set(state => ({
+        documents: [...state.documents, ...added.map(withPendingEdits)].sort((a, b) => b.updatedAt - a.updatedAt),
+        hasMore,
+      }));
+    } catch (error) {
+      console.error('Error fetching more documents:', error);
+    }
+  },
+
+  loadDocumentContent: (id: string) => {
+    const doc = get().documents.find(d => d.id === id);
+    if (!doc || doc.isContentLoaded !== false) return Promise.resolve();
+
+    let load = contentLoads.get(id);
+    if (!load) {
+      load = (async () => {
+        const cached = contentCache.get(id);
+        const content = cached && cached.updatedAt >= doc.updatedAt
+          ? cached.content
+          : doc.isLocal ? await localDocuments.getContent(id) : await fetchRemoteContent(id);
+        if (content === null) return;
+
+        contentCache.set(id, { content, updatedAt: doc.updatedAt });
+        // An edit that replaced the whole content while loading wins.
+        set(state => ({
+          documents: state.documents.map(d => d.id === id && d.isContentLoaded === false
+            ? { ...d, content, isContentLoaded: true }
+            : d),
+        }));
+      })().finally(() => contentLoads.delete(id));
+      contentLoads.set(id, load);
+    }
+    return load;
+  },
+
+  // For reading many documents (batch export): returns the content without
+  // loading it into the store, so it neither evicts nor is evicted by others.
+  readDocumentContent: async (id: string) => {
+    const doc = get().documents.find(d => d.id === id);
+    if (!doc) return null;
+    if (doc.isContentLoaded !== false) return doc.content;
+    const cached = contentCache.get(id);
+    if (cached && cached.updatedAt >= doc.updatedAt) return cached.content;
+    return doc.isLocal ? localDocuments.getContent(id) : fetchRemoteContent(id);
   },
 
   addDocument: async (type: DocumentType) => {
     console.log('[useDocumentStore] addDocument called with type:', type);
     const supabase = createClient();
-    const { data: { user } } = await supabase.auth.getUser();
+    const user = await getAuthUser();
     console.log('[useDocumentStore] User authenticated:', !!user);
 
     const documents = get().documents;
@@ -199,6 +485,8 @@ export const useDocumentStore = create<DocumentStore>((set, get) => ({
           type,
           title,
           content,
+          preview: makePreview(content),
+          word_count: countWords(content),
           metadata: {},
         })
         .select()
@@ -219,7 +507,9 @@ export const useDocumentStore = create<DocumentStore>((set, get) => ({
         updatedAt: new Date(data.updated_at).getTime(),
         user_id: data.user_id,
         isLocal: false,
+        isContentLoaded: true,
       };
+      contentCache.set(newDoc.id, { content: newDoc.content, updatedAt: newDoc.updatedAt });
 
       set({
         documents: [newDoc, ...documents],
@@ -237,16 +527,14 @@ export const useDocumentStore = create<DocumentStore>((set, get) => ({
         createdAt: Date.now(),
         updatedAt: Date.now(),
         isLocal: true,
+        isContentLoaded: true,
       };
 
       try {
-        // Ensure we have the latest local docs to avoid overwriting with stale state
-        const currentLocalDocs = getLocalDocs();
-        // Check if we already have this doc (unlikely but safe)
-        const exists = currentLocalDocs.some(d => d.id === newDoc.id);
-        const newDocuments = exists ? currentLocalDocs : [newDoc, ...currentLocalDocs];
-
-        saveLocalDocs(newDocuments);
+        await localDocuments.put(newDoc);
+        contentCache.set(newDoc.id, { content: newDoc.content, updatedAt: newDoc.updatedAt });
+        localSearch.update({ id: newDoc.id, title: newDoc.title, content: newDoc.content });
+        const newDocuments = [newDoc, ...get().documents];
         console.log('[useDocumentStore] Local document saved:', newDoc);
 
         set({
@@ -263,8 +551,9 @@ export const useDocumentStore = create<DocumentStore>((set, get) => ({
   },
 
   deleteDocument: async (id: string) => {
+    writeQueue.discard(id);
     const supabase = createClient();
-    const { data: { user } } = await supabase.auth.getUser();
+    const user = await getAuthUser();
 
     if (user) {
       // If it happens to be a lingering local doc (shouldn't happen in strict mode but possible),
@@ -287,101 +576,106 @@ export const useDocumentStore = create<DocumentStore>((set, get) => ({
     // Local delete (or UI update for remote)
     const documents = get().documents.filter(doc => doc.id !== id);
     if (!user) {
-      saveLocalDocs(documents); // Persist local delete
+      await localDocuments.remove(id); // Persist local delete
     }
+    contentCache.delete(id);
+    localSearch.remove(id);
 
     const activeDocumentId = get().activeDocumentId;
+    const nextActiveId = activeDocumentId === id ? (documents[0]?.id || null) : activeDocumentId;
 
     set({
       documents,
-      activeDocumentId: activeDocumentId === id ? (documents[0]?.id || null) : activeDocumentId,
+      activeDocumentId: nextActiveId,
     });
+    if (nextActiveId) void get().loadDocumentContent(nextActiveId);
   },
 
-  updateDocument: async (id: string, updates: { content?: string; title?: string; metadata?: any }) => {
+  updateDocument: async (id: string, updates: DocumentUpdates) => {
     // 1. Optimistic Update
     const currentDocuments = get().documents;
     const docIndex = currentDocuments.findIndex(d => d.id === id);
     if (docIndex === -1) return;
 
     const oldDoc = currentDocuments[docIndex];
+    // Editors echo content set from outside (e.g. once it has loaded); nothing to save then.
+    const keys = Object.keys(updates) as (keyof DocumentUpdates)[];
+    if (keys.every(key => updates[key] === oldDoc[key])) return;
+
     const newDoc = {
       ...oldDoc,
       ...updates,
       updatedAt: Date.now(),
     };
+    if (updates.content !== undefined) {
+      newDoc.isContentLoaded = true; // Replacing the content makes loading it moot
+      contentCache.set(id, { content: updates.content, updatedAt: newDoc.updatedAt });
+    }
 
     const newDocuments = [...currentDocuments];
     newDocuments[docIndex] = newDoc;
 
     set({ documents: newDocuments });
-
-    // 2. Persist
-    const supabase = createClient();
-    const { data: { user } } = await supabase.auth.getUser();
-
-    if (user && !newDoc.isLocal) {
-      const dbUpdates: any = { updated_at: new Date().toISOString() };
-      if (updates.content !== undefined) dbUpdates.content = updates.content;
-      if (updates.title !== undefined) dbUpdates.title = updates.title;
-      if (updates.metadata !== undefined) dbUpdates.metadata = updates.metadata;
-
-      const { error } = await supabase
-        .from('documents')
-        .update(dbUpdates)
-        .eq('id', id);
-
-      if (error) {
-        console.error('Error updating document:', error);
-        // Might want to revert optimistic update here in a real app
-      }
-    } else {
-      // Local Storage Update
-      saveLocalDocs(newDocuments);
+    if (newDoc.isLocal && (updates.title !== undefined || updates.content !== undefined)) {
+      localSearch.update({ id, title: updates.title, content: updates.content });
     }
-  },
 
-  syncLocalDocuments: async () => {
-    const localDocs = getLocalDocs();
-    if (localDocs.length === 0) return 0;
+    // 2. Persist (debounced and merged with other pending edits to this document)
+    writeQueue.enqueue(id, { ...updates, updatedAt: newDoc.updatedAt });
+  },
 
-    const supabase = createClient();
-    const { data: { user } } = await supabase.auth.getUser();
-    if (!user) return 0;
+  flushPendingWrites: () => writeQueue.flush(),
 
-    let syncedCount = 0;
+  searchDocuments: async (query: string) => {
+    if (!query.trim()) return [];
+    const user = await getAuthUser();
 
-    for (const doc of localDocs) {
-      const { error } = await supabase
-        .from('documents')
-        .insert({
-          user_id: user.id,
-          type: doc.type,
-          title: doc.title, // Keep title, duplicates allowed
-          content: doc.content,
+    if (!user) {
+      // Local Mode: inverted index in a Web Worker, built on first use
+      try {
+        await localSearch.ensureIndexed(async () => {
+          await writeQueue.flush();
+          return localDocuments.loadAll();
         });
-
-      if (!error) {
-        syncedCount++;
-      } else {
-        console.error('Failed to sync doc:', doc.title, error);
+        return await localSearch.search(query);
+      } catch (error) {
+        console.error('[useDocumentStore] Local search failed:', error);
+        return [];
       }
     }
 
-    if (syncedCount > 0) {
-      if (syncedCount === localDocs.length) {
-        localStorage.removeItem(LOCAL_STORAGE_KEY);
-      }
-
-      await get().fetchDocuments(); // Refresh from server
+    // Remote Mode: Postgres full-text search (search_documents function)
+    const { data, error } = await createClient().rpc('search_documents', { query, max_results: 50 });
+    if (error) {
+      console.error('[useDocumentStore] Search failed:', error);
+      return [];
+    }
+    const rows = data as any[];
+
+    // Hits may lie beyond the loaded pages; list them so they can be opened.
+    const known = new Set(get().documents.map(d => d.id));
+    const missing = rows.filter(row => !known.has(row.id)).map(fromListRow);
+    if (missing.length > 0) {
+      set(state => ({
+        documents: [...state.documents, ...missing].sort((a, b) => b.updatedAt - a.updatedAt),
+      }));
     }
+    return rows.map(row => ({ id: row.id, score: row.rank, snippet: parseHeadline(row.snippet ?? '') }));
+  },
 
-    return syncedCount;
+  syncLocalDocuments: (onProgress?: (progress: SyncProgress) => void) => {
+    // AuthButton can trigger this from two places at once; share one run.
+    syncInFlight ??= syncLocal(onProgress).finally(() => {
+      syncInFlight = null;
+      set({ syncProgress: null });
+    });
+    return syncInFlight;
   },
 
   setActiveDocument: (id: string) => {
     set({ activeDocumentId: id });
     saveLocalActiveId(id);
+    void get().loadDocumentContent(id);
   },
 
   getActiveDocument: () => {
@@ -0,0 +1,17 @@
+-- Metadata-only document listing.
+--
+-- The editors list documents without their content: each row carries a short
+-- preview and a word count (kept up to date by the client on every save), and
+-- pages are fetched per type with a keyset on (updated_at, id).
+
+alter table public.documents
+  add column if not exists preview text not null default '',
+  add column if not exists word_count integer not null default 0;
+
+update public.documents
+set
+  preview = left(content, 240),
+  word_count = coalesce(array_length(regexp_split_to_array(nullif(btrim(content), ''), '\s+'), 1), 0);
+
+create index if not exists documents_user_type_updated_idx
+  on public.documents (user_id, type, updated_at desc, id desc);
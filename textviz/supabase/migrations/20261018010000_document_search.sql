@@ -0,0 +1,54 @@
+-- Full-text search over documents for the repository page.
+--
+-- Uses the 'simple' configuration (no stemming), so Hangul and Latin words are
+-- both indexed as they are written. Every query word matches as a prefix,
+-- which lets "학교" find "학교에서" and "mark" find "markdown". Snippets
+-- mark matches with U+E000/U+E001, which the client splits on.
+
+alter table public.documents
+  add column if not exists search_vector tsvector
+  generated always as (
+    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(content, '')), 'B')
+  ) stored;
+
+create index if not exists documents_search_idx
+  on public.documents using gin (search_vector);
+
+create or replace function public.search_documents(query text, max_results integer default 50)
+returns table (
+  id uuid,
+  type text,
+  title text,
+  preview text,
+  word_count integer,
+  metadata jsonb,
+  created_at timestamptz,
+  updated_at timestamptz,
+  user_id uuid,
+  rank real,
+  snippet text
+)
+language sql
+stable
+security invoker -- row-level security still limits results to the caller's documents
+as $$
+  with q as (
+    select to_tsquery('simple', string_agg(quote_literal(lexeme) || ':*', ' & ')) as tsq
+    from unnest(tsvector_to_array(to_tsvector('simple', query))) as lexeme
+  ),
+  hits as (
+    select d.*, ts_rank(d.search_vector, q.tsq) as rank, q.tsq
+    from public.documents d, q
+    where q.tsq is not null and d.search_vector @@ q.tsq
+    order by rank desc, d.updated_at desc
+    limit max_results
+  )
+  select
+    h.id, h.type::text, h.title::text, h.preview, h.word_count, h.metadata::jsonb,
+    h.created_at, h.updated_at, h.user_id, h.rank::real,
+    ts_headline('simple', h.content, h.tsq,
+      format('StartSel=%s, StopSel=%s, MaxWords=30, MinWords=10, MaxFragments=1', chr(57344), chr(57345)))
+  from hits h
+  order by h.rank desc, h.updated_at desc;
+$$;
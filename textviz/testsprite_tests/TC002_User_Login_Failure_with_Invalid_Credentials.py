@@ -2,88 +2,61 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from harness import locators, waits
+from harness.runner import run_standalone
+
+
+async def run_test(context):
+    # The runner owns the browser and hands each test a fresh context
+    page = await context.new_page()
+    
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
     
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+    
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click the login button to navigate to the login page.
-        frame = context.pages[-1]
-        # Click the login button to go to the login page
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Enter invalid username/email and password, then click the login button.
-        frame = context.pages[-1]
-        # Enter invalid email in the email input field
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('jakeseol99@keduall.com')
-        
+    
+    # Interact with the page elements to simulate user flow
+    # -> Click the login button to navigate to the login page.
+    frame = context.pages[-1]
+    # Click the login button to go to the login page
+    elem = await locators.find(frame, 'header.login')
+    await waits.click(elem, timeout=5000)
+    
 
-        frame = context.pages[-1]
-        # Enter invalid password in the password input field
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
+    # -> Enter invalid username/email and password, then click the login button.
+    frame = context.pages[-1]
+    # Enter invalid email in the email input field
+    elem = await locators.find(frame, 'login.email')
+    await waits.fill(elem, 'jakeseol99@keduall.com')
+    
 
-        frame = context.pages[-1]
-        # Click the login button to attempt login with invalid credentials
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    frame = context.pages[-1]
+    # Enter invalid password in the password input field
+    elem = await locators.find(frame, 'login.password')
+    await waits.fill(elem, 'password123')
+    
 
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        await expect(frame.locator('text=invalid credentials').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+    frame = context.pages[-1]
+    # Click the login button to attempt login with invalid credentials
+    elem = await locators.find(frame, 'login.submit')
+    await waits.click(elem, timeout=5000)
     
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    await expect(frame.locator('text=invalid credentials').first).to_be_visible(timeout=30000)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
@@ -2,137 +2,87 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from harness import locators, waits
+from harness.runner import run_standalone
+
+# Starts from the cached login session instead of driving the login form.
+REQUIRES_AUTH = True
+
+
+async def run_test(context):
+    # The runner owns the browser and hands each test a fresh context
+    page = await context.new_page()
     
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+    
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+    
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click the Login button to log in.
-        frame = context.pages[-1]
-        # Click the Login button to start login process
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input email and password, then click the login button.
-        frame = context.pages[-1]
-        # Input email address
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('jakeseol99@keduall.com')
-        
-
-        frame = context.pages[-1]
-        # Input password
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
+    
+    # Interact with the page elements to simulate user flow
+    # -> Click the '마크다운' link to navigate to the Markdown Editor.
+    frame = context.pages[-1]
+    # Click the '마크다운' link to open the Markdown Editor
+    elem = await locators.find(frame, 'header.nav.markdown')
+    await waits.click(elem, timeout=5000)
+    
 
-        frame = context.pages[-1]
-        # Click the login button to submit credentials
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Create a new Markdown document by clicking the '지금 시작하기' button or equivalent to start editing.
+    frame = context.pages[-1]
+    # Click the '지금 시작하기' button to create a new Markdown document
+    elem = await locators.find(frame, 'home.get-started')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Click the '마크다운' link to navigate to the Markdown Editor.
-        frame = context.pages[-1]
-        # Click the '마크다운' link to open the Markdown Editor
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div/nav/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Focus the editable div with placeholder text and simulate typing Markdown content including headers, lists, and links.
+    frame = context.pages[-1]
+    # Focus the editable div with placeholder text 'Start typing here...' to prepare for input
+    elem = await locators.find(frame, 'markdown.editor')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Create a new Markdown document by clicking the '지금 시작하기' button or equivalent to start editing.
-        frame = context.pages[-1]
-        # Click the '지금 시작하기' button to create a new Markdown document
-        elem = frame.locator('xpath=html/body/div[3]/main/section/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    frame = context.pages[-1]
+    # Simulate typing Markdown content into the editable div
+    elem = await locators.find(frame, 'markdown.editor')
+    await waits.fill(elem, '# Header 1\n\n## Header 2\n\n- Item 1\n- Item 2\n- Item 3\n\n[OpenAI](https://openai.com)')
+    
 
-        # -> Focus the editable div with placeholder text and simulate typing Markdown content including headers, lists, and links.
-        frame = context.pages[-1]
-        # Focus the editable div with placeholder text 'Start typing here...' to prepare for input
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div[2]/div/div[2]/div/div/div/p').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Use the quick formatting toolbar to format text (bold, italic, code) and check if formatting applies correctly.
+    frame = context.pages[-1]
+    # Click the Bold (B) button on the quick formatting toolbar
+    elem = await locators.find(frame, 'markdown.bold')
+    await waits.click(elem, timeout=5000)
+    
 
-        frame = context.pages[-1]
-        # Simulate typing Markdown content into the editable div
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div[2]/div/div[2]/div/div/div/p').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('# Header 1\n\n## Header 2\n\n- Item 1\n- Item 2\n- Item 3\n\n[OpenAI](https://openai.com)')
-        
+    frame = context.pages[-1]
+    # Click the Italic (I) button on the quick formatting toolbar
+    elem = await locators.find(frame, 'markdown.italic')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Use the quick formatting toolbar to format text (bold, italic, code) and check if formatting applies correctly.
-        frame = context.pages[-1]
-        # Click the Bold (B) button on the quick formatting toolbar
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div[2]/div/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    frame = context.pages[-1]
+    # Click the Code button on the quick formatting toolbar
+    elem = await locators.find(frame, 'markdown.code')
+    await waits.click(elem, timeout=5000)
+    
 
-        frame = context.pages[-1]
-        # Click the Italic (I) button on the quick formatting toolbar
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div[2]/div/div/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Document saved successfully!').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: The test plan execution failed to verify that users can create, edit, and save Markdown documents with proper UI feedback. The expected success message 'Document saved successfully!' was not found on the page.")
 
-        frame = context.pages[-1]
-        # Click the Code button on the quick formatting toolbar
-        elem = frame.locator('xpath=html/body/div[3]/div/div[2]/div[2]/div/div/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
 
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Document saved successfully!').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test case failed: The test plan execution failed to verify that users can create, edit, and save Markdown documents with proper UI feedback. The expected success message 'Document saved successfully!' was not found on the page.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
@@ -2,130 +2,103 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from harness import locators, waits
+from harness.runner import run_standalone
+
+
+async def run_test(context):
+    # The runner owns the browser and hands each test a fresh context
+    page = await context.new_page()
+    
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
     
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+    
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click the 'Login' button to log in.
-        frame = context.pages[-1]
-        # Click the Login button to start login process
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input email and password, then click the login button.
-        frame = context.pages[-1]
-        # Input email address
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('jakeseol99@keduall.com')
-        
+    
+    # Interact with the page elements to simulate user flow
+    # -> Click the 'Login' button to log in.
+    frame = context.pages[-1]
+    # Click the Login button to start login process
+    elem = await locators.find(frame, 'header.login')
+    await waits.click(elem, timeout=5000)
+    
 
-        frame = context.pages[-1]
-        # Input password
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
+    # -> Input email and password, then click the login button.
+    frame = context.pages[-1]
+    # Input email address
+    elem = await locators.find(frame, 'login.email')
+    await waits.fill(elem, 'jakeseol99@keduall.com')
+    
 
-        frame = context.pages[-1]
-        # Click the login button to submit credentials
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    frame = context.pages[-1]
+    # Input password
+    elem = await locators.find(frame, 'login.password')
+    await waits.fill(elem, 'password123')
+    
 
-        # -> Click the LaTeX link to open LaTeX Studio.
-        frame = context.pages[-1]
-        # Click the LaTeX link to open LaTeX Studio
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div/nav/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    frame = context.pages[-1]
+    # Click the login button to submit credentials
+    elem = await locators.find(frame, 'login.submit')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Create a new LaTeX document by clicking the LaTeX tab or new document button, then insert LaTeX commands manually and via the symbol palette.
-        frame = context.pages[-1]
-        # Click the LaTeX tab to open the LaTeX Studio document editor
-        elem = frame.locator('xpath=html/body/div[3]/main/section[6]/div/div/div/div[2]/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Click the LaTeX link to open LaTeX Studio.
+    frame = context.pages[-1]
+    # Click the LaTeX link to open LaTeX Studio
+    elem = await locators.find(frame, 'header.nav.latex')
+    await waits.click(elem, timeout=5000)
+    
 
-        frame = context.pages[-1]
-        # Click the '지금 시작하기' (Start Now) button to create a new document or start editing
-        elem = frame.locator('xpath=html/body/div[3]/main/section[2]/div/div/div/img').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Create a new LaTeX document by clicking the LaTeX tab or new document button, then insert LaTeX commands manually and via the symbol palette.
+    frame = context.pages[-1]
+    # Click the LaTeX tab to open the LaTeX Studio document editor
+    elem = await locators.find(frame, 'home.recent.latex')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Re-login by inputting email and password, then click the login button to regain access.
-        frame = context.pages[-1]
-        # Input email address to re-login
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('jakeseol99@keduall.com')
-        
+    frame = context.pages[-1]
+    # Click the '지금 시작하기' (Start Now) button to create a new document or start editing
+    elem = await locators.find(frame, 'home.image.markdown')
+    await waits.click(elem, timeout=5000)
+    
 
-        frame = context.pages[-1]
-        # Input password to re-login
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
+    # -> Re-login by inputting email and password, then click the login button to regain access.
+    frame = context.pages[-1]
+    # Input email address to re-login
+    elem = await locators.find(frame, 'login.email')
+    await waits.fill(elem, 'jakeseol99@keduall.com')
+    
 
-        frame = context.pages[-1]
-        # Click the login button to submit credentials and regain session
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    frame = context.pages[-1]
+    # Input password to re-login
+    elem = await locators.find(frame, 'login.password')
+    await waits.fill(elem, 'password123')
+    
 
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=LaTeX Document Successfully Compiled').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test case failed: The LaTeX document editing, symbol palette usage, bibliography management, and PDF export functionality did not complete successfully as per the test plan.")
-        await asyncio.sleep(5)
+    frame = context.pages[-1]
+    # Click the login button to submit credentials and regain session
+    elem = await locators.find(frame, 'login.submit')
+    await waits.click(elem, timeout=5000)
     
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=LaTeX Document Successfully Compiled').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: The LaTeX document editing, symbol palette usage, bibliography management, and PDF export functionality did not complete successfully as per the test plan.")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
@@ -2,105 +2,62 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from harness import locators, waits
+from harness.runner import run_standalone
+
+# Starts from the cached login session instead of driving the login form.
+REQUIRES_AUTH = True
+
+
+async def run_test(context):
+    # The runner owns the browser and hands each test a fresh context
+    page = await context.new_page()
+    
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
     
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+    
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click on the '머메이드' (Mermaid) link to navigate to Mermaid Live.
-        frame = context.pages[-1]
-        # Click on the '머메이드' (Mermaid) link to go to Mermaid Live.
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div/nav/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input email and password, then click the login button.
-        frame = context.pages[-1]
-        # Input email address
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('jakeseol99@keduall.com')
-        
+    
+    # Interact with the page elements to simulate user flow
+    # -> Click on the '머메이드' (Mermaid) link to navigate to Mermaid Live.
+    frame = context.pages[-1]
+    # Click on the '머메이드' (Mermaid) link to go to Mermaid Live.
+    elem = await locators.find(frame, 'header.nav.mermaid')
+    await waits.click(elem, timeout=5000)
+    
 
-        frame = context.pages[-1]
-        # Input password
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
+    # -> Click on the '머메이드' (Mermaid) link to create a new Mermaid diagram.
+    frame = context.pages[-1]
+    # Click on the '머메이드' (Mermaid) link to create a new Mermaid diagram.
+    elem = await locators.find(frame, 'header.nav.mermaid')
+    await waits.click(elem, timeout=5000)
+    
 
-        frame = context.pages[-1]
-        # Click the login button to log in
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Click the '지금 시작하기' (Start Now) button to see if it leads to Mermaid diagram creation or related functionality.
+    frame = context.pages[-1]
+    # Click the '지금 시작하기' (Start Now) button to try alternative navigation to Mermaid Live.
+    elem = await locators.find(frame, 'home.get-started')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Click on the '머메이드' (Mermaid) link to create a new Mermaid diagram.
-        frame = context.pages[-1]
-        # Click on the '머메이드' (Mermaid) link to create a new Mermaid diagram.
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div/nav/a[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Diagram Export Successful').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test case failed: The test plan execution for creating diagrams with interactive zoom/pan, applying templates, and exporting diagrams as SVG and PNG has failed. The expected confirmation text 'Diagram Export Successful' was not found on the page, indicating the export or related functionality did not complete as expected.")
 
-        # -> Click the '지금 시작하기' (Start Now) button to see if it leads to Mermaid diagram creation or related functionality.
-        frame = context.pages[-1]
-        # Click the '지금 시작하기' (Start Now) button to try alternative navigation to Mermaid Live.
-        elem = frame.locator('xpath=html/body/div[3]/main/section/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
 
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Diagram Export Successful').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test case failed: The test plan execution for creating diagrams with interactive zoom/pan, applying templates, and exporting diagrams as SVG and PNG has failed. The expected confirmation text 'Diagram Export Successful' was not found on the page, indicating the export or related functionality did not complete as expected.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
@@ -2,172 +2,96 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from harness import locators, waits
+from harness.runner import run_standalone
+
+# Starts from the cached login session instead of driving the login form.
+REQUIRES_AUTH = True
+
+
+async def run_test(context):
+    # The runner owns the browser and hands each test a fresh context
+    page = await context.new_page()
     
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+    
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+    
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Click the Login button to start login process.
-        frame = context.pages[-1]
-        # Click the Login button to open login form.
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Input email and password, then click login button.
-        frame = context.pages[-1]
-        # Input email address for login.
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('jakeseol99@keduall.com')
-        
-
-        frame = context.pages[-1]
-        # Input password for login.
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-
-        frame = context.pages[-1]
-        # Click the login button to submit credentials.
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Open the global settings page to access theme settings.
-        frame = context.pages[-1]
-        # Click the user menu or profile button to find settings option.
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Click the 'Toggle theme' button to change the theme and verify immediate application.
-        frame = context.pages[-1]
-        # Click the 'Toggle theme' button to change the application theme.
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Reload the application to verify if the selected theme persists after reload.
-        await page.goto('http://localhost:3000/', timeout=10000)
-        await asyncio.sleep(3)
-        
+    
+    # Interact with the page elements to simulate user flow
+    # -> Open the global settings page to access theme settings.
+    frame = context.pages[-1]
+    # Click the user menu or profile button to find settings option.
+    elem = await locators.find(frame, 'header.logout')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Locate and open the global settings page to verify theme change option exists and can be changed from there.
-        frame = context.pages[-1]
-        # Click the 'Login' or user menu to find settings or profile options.
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Click the 'Toggle theme' button to change the theme and verify immediate application.
+    frame = context.pages[-1]
+    # Click the 'Toggle theme' button to change the application theme.
+    elem = await locators.find(frame, 'header.theme')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Locate and open the global settings page to verify theme change option exists and can be changed from there.
-        await page.mouse.wheel(0, 300)
-        
+    # -> Reload the application to verify if the selected theme persists after reload.
+    await page.goto('http://localhost:3000/', timeout=10000)
+    await waits.settle(page)
+    
 
-        frame = context.pages[-1]
-        # Click the '지금 시작하기' (Get Started) button to explore the application and find settings.
-        elem = frame.locator('xpath=html/body/div[3]/main/section/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Locate and open the global settings page to verify theme change option exists and can be changed from there.
+    frame = context.pages[-1]
+    # Click the 'Login' or user menu to find settings or profile options.
+    elem = await locators.find(frame, 'header.theme')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Reload the application homepage to recover from the error page and continue testing.
-        await page.goto('http://localhost:3000/', timeout=10000)
-        await asyncio.sleep(3)
-        
+    # -> Locate and open the global settings page to verify theme change option exists and can be changed from there.
+    await page.mouse.wheel(0, 300)
+    
 
-        # -> Try clicking the 'Login' button to log in again and check if settings become accessible after login.
-        frame = context.pages[-1]
-        # Click the 'Login' button to open login form for user authentication.
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    frame = context.pages[-1]
+    # Click the '지금 시작하기' (Get Started) button to explore the application and find settings.
+    elem = await locators.find(frame, 'home.get-started')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Input email and password, then click login button to authenticate.
-        frame = context.pages[-1]
-        # Input email address for login.
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('jakeseol99@keduall.com')
-        
+    # -> Reload the application homepage to recover from the error page and continue testing.
+    await page.goto('http://localhost:3000/', timeout=10000)
+    await waits.settle(page)
+    
 
-        frame = context.pages[-1]
-        # Input password for login.
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
+    # -> Try clicking the user email button (index 9) to check if it opens a dropdown or menu with settings options.
+    frame = context.pages[-1]
+    # Click the user email button to open user menu or settings dropdown.
+    elem = await locators.find(frame, 'header.theme')
+    await waits.click(elem, timeout=5000)
+    
 
-        frame = context.pages[-1]
-        # Click the login button to submit credentials.
-        elem = frame.locator('xpath=html/body/div[3]/div[3]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Try clicking the user email button (index 9) to open a dropdown or menu that might contain settings options.
+    frame = context.pages[-1]
+    # Click the user email button to open user menu or settings dropdown.
+    elem = await locators.find(frame, 'header.theme')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Try clicking the user email button (index 9) to check if it opens a dropdown or menu with settings options.
-        frame = context.pages[-1]
-        # Click the user email button to open user menu or settings dropdown.
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=Theme successfully changed to Solarized').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test plan failed: The application theme change did not apply immediately or persist after reload as expected.")
 
-        # -> Try clicking the user email button (index 9) to open a dropdown or menu that might contain settings options.
-        frame = context.pages[-1]
-        # Click the user email button to open user menu or settings dropdown.
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
 
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=Theme successfully changed to Solarized').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test plan failed: The application theme change did not apply immediately or persist after reload as expected.")
-        await asyncio.sleep(5)
-    
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
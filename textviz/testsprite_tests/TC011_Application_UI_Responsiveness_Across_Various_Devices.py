@@ -2,101 +2,74 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from harness import locators, waits
+from harness.runner import run_standalone
+
+
+async def run_test(context):
+    # The runner owns the browser and hands each test a fresh context
+    page = await context.new_page()
     
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+    
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+    
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Open the application on tablet and mobile device emulators to verify UI responsiveness and layout adaptation.
-        frame = context.pages[-1]
-        # Toggle language button to check UI behavior
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        frame = context.pages[-1]
-        # Toggle theme button to check UI behavior
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    
+    # Interact with the page elements to simulate user flow
+    # -> Open the application on tablet and mobile device emulators to verify UI responsiveness and layout adaptation.
+    frame = context.pages[-1]
+    # Toggle language button to check UI behavior
+    elem = await locators.find(frame, 'header.language')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Open the application on tablet and mobile device emulators to verify UI responsiveness and layout adaptation.
-        await page.goto('http://localhost:3000/', timeout=10000)
-        await asyncio.sleep(3)
-        
+    frame = context.pages[-1]
+    # Toggle theme button to check UI behavior
+    elem = await locators.find(frame, 'header.theme')
+    await waits.click(elem, timeout=5000)
+    
 
-        frame = context.pages[-1]
-        # Click Login button to prepare for login test on mobile emulator
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Open the application on tablet and mobile device emulators to verify UI responsiveness and layout adaptation.
+    await page.goto('http://localhost:3000/', timeout=10000)
+    await waits.settle(page)
+    
 
-        # -> Retry loading the application homepage to check if the issue persists or try to recover from the error.
-        await page.goto('http://localhost:3000', timeout=10000)
-        await asyncio.sleep(3)
-        
+    frame = context.pages[-1]
+    # Click Login button to prepare for login test on mobile emulator
+    elem = await locators.find(frame, 'header.login')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Click the Login button to navigate to the login page and verify UI layout on desktop resolution.
-        frame = context.pages[-1]
-        # Click Login button to navigate to login page on desktop resolution
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Retry loading the application homepage to check if the issue persists or try to recover from the error.
+    await page.goto('http://localhost:3000', timeout=10000)
+    await waits.settle(page)
+    
 
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        try:
-            await expect(frame.locator('text=UI Layout Broken on All Devices').first).to_be_visible(timeout=1000)
-        except AssertionError:
-            raise AssertionError("Test plan failed: The application UI did not adapt and perform well on multiple screen sizes and device types including desktop and mobile browsers.")
-        await asyncio.sleep(5)
+    # -> Click the Login button to navigate to the login page and verify UI layout on desktop resolution.
+    frame = context.pages[-1]
+    # Click Login button to navigate to login page on desktop resolution
+    elem = await locators.find(frame, 'header.login')
+    await waits.click(elem, timeout=5000)
     
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    try:
+        await expect(frame.locator('text=UI Layout Broken on All Devices').first).to_be_visible(timeout=1000)
+    except AssertionError:
+        raise AssertionError("Test plan failed: The application UI did not adapt and perform well on multiple screen sizes and device types including desktop and mobile browsers.")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
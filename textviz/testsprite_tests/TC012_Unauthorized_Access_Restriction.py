@@ -2,111 +2,84 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from harness import locators, waits
+from harness.runner import run_standalone
+
+
+async def run_test(context):
+    # The runner owns the browser and hands each test a fresh context
+    page = await context.new_page()
+    
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
     
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+    
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Attempt to access Markdown Editor URL directly to verify redirection to login page.
-        await page.goto('http://localhost:3000/markdown', timeout=10000)
-        await asyncio.sleep(3)
-        
-
-        # -> Attempt to access LaTeX Studio URL directly to verify redirection to login page.
-        await page.goto('http://localhost:3000/latex', timeout=10000)
-        await asyncio.sleep(3)
-        
+    
+    # Interact with the page elements to simulate user flow
+    # -> Attempt to access Markdown Editor URL directly to verify redirection to login page.
+    await page.goto('http://localhost:3000/markdown', timeout=10000)
+    await waits.settle(page)
+    
 
-        # -> Attempt to access JSON Prompt Builder URL directly to verify redirection to login page.
-        await page.goto('http://localhost:3000/json-prompt-builder', timeout=10000)
-        await asyncio.sleep(3)
-        
+    # -> Attempt to access LaTeX Studio URL directly to verify redirection to login page.
+    await page.goto('http://localhost:3000/latex', timeout=10000)
+    await waits.settle(page)
+    
 
-        # -> Navigate back to home page and then attempt to access Mermaid Live page URL directly to verify redirection to login page.
-        frame = context.pages[-1]
-        # Click 'Go Home' link to navigate back to home page
-        elem = frame.locator('xpath=html/body/div[3]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Attempt to access JSON Prompt Builder URL directly to verify redirection to login page.
+    await page.goto('http://localhost:3000/json-prompt-builder', timeout=10000)
+    await waits.settle(page)
+    
 
-        await page.goto('http://localhost:3000/mermaid-live', timeout=10000)
-        await asyncio.sleep(3)
-        
+    # -> Navigate back to home page and then attempt to access Mermaid Live page URL directly to verify redirection to login page.
+    frame = context.pages[-1]
+    # Click 'Go Home' link to navigate back to home page
+    elem = await locators.find(frame, 'notfound.home')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Use direct URL navigation to go to home page and then attempt to access Mermaid Live page URL directly.
-        await page.goto('http://localhost:3000/', timeout=10000)
-        await asyncio.sleep(3)
-        
+    await page.goto('http://localhost:3000/mermaid-live', timeout=10000)
+    await waits.settle(page)
+    
 
-        await page.goto('http://localhost:3000/mermaid-live', timeout=10000)
-        await asyncio.sleep(3)
-        
+    # -> Use direct URL navigation to go to home page and then attempt to access Mermaid Live page URL directly.
+    await page.goto('http://localhost:3000/', timeout=10000)
+    await waits.settle(page)
+    
 
-        # -> Attempt to access document repositories URLs directly to verify redirection to login page.
-        await page.goto('http://localhost:3000/document-repository-1', timeout=10000)
-        await asyncio.sleep(3)
-        
+    await page.goto('http://localhost:3000/mermaid-live', timeout=10000)
+    await waits.settle(page)
+    
 
-        # -> Conclude testing due to repeated errors and page not found issues on document repositories.
-        await page.goto('http://localhost:3000/', timeout=10000)
-        await asyncio.sleep(3)
-        
+    # -> Attempt to access document repositories URLs directly to verify redirection to login page.
+    await page.goto('http://localhost:3000/document-repository-1', timeout=10000)
+    await waits.settle(page)
+    
 
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        await expect(frame.locator('text=Login').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Login').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Login').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Login').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Login').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+    # -> Conclude testing due to repeated errors and page not found issues on document repositories.
+    await page.goto('http://localhost:3000/', timeout=10000)
+    await waits.settle(page)
     
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    await expect(frame.locator('text=Login').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Login').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Login').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Login').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Login').first).to_be_visible(timeout=30000)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
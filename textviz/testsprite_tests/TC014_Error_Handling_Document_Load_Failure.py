@@ -2,95 +2,68 @@ import asyncio
 from playwright import async_api
 from playwright.async_api import expect
 
-async def run_test():
-    pw = None
-    browser = None
-    context = None
+from harness import locators, waits
+from harness.runner import run_standalone
+
+
+async def run_test(context):
+    # The runner owns the browser and hands each test a fresh context
+    page = await context.new_page()
     
+    # Navigate to your target URL and wait until the network request is committed
+    await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+    
+    # Wait for the main page to reach DOMContentLoaded state (optional for stability)
     try:
-        # Start a Playwright session in asynchronous mode
-        pw = await async_api.async_playwright().start()
-        
-        # Launch a Chromium browser in headless mode with custom arguments
-        browser = await pw.chromium.launch(
-            headless=True,
-            args=[
-                "--window-size=1280,720",         # Set the browser window size
-                "--disable-dev-shm-usage",        # Avoid using /dev/shm which can cause issues in containers
-                "--ipc=host",                     # Use host-level IPC for better stability
-                "--single-process"                # Run the browser in a single process mode
-            ],
-        )
-        
-        # Create a new browser context (like an incognito window)
-        context = await browser.new_context()
-        context.set_default_timeout(5000)
-        
-        # Open a new page in the browser context
-        page = await context.new_page()
-        
-        # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
-        
-        # Wait for the main page to reach DOMContentLoaded state (optional for stability)
+        await page.wait_for_load_state("domcontentloaded", timeout=3000)
+    except async_api.Error:
+        pass
+    
+    # Iterate through all iframes and wait for them to load as well
+    for frame in page.frames:
         try:
-            await page.wait_for_load_state("domcontentloaded", timeout=3000)
+            await frame.wait_for_load_state("domcontentloaded", timeout=3000)
         except async_api.Error:
             pass
-        
-        # Iterate through all iframes and wait for them to load as well
-        for frame in page.frames:
-            try:
-                await frame.wait_for_load_state("domcontentloaded", timeout=3000)
-            except async_api.Error:
-                pass
-        
-        # Interact with the page elements to simulate user flow
-        # -> Use browser console or alternative method to corrupt local storage data for 'recentFiles_markdown'.
-        frame = context.pages[-1]
-        # Click '지금 시작하기' button to open editor and then attempt to corrupt local storage via console or script injection.
-        elem = frame.locator('xpath=html/body/div[3]/main/section/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
-
-        # -> Scroll down to find any input or console elements to inject script or find alternative ways to corrupt local storage.
-        await page.mouse.wheel(0, await page.evaluate('() => window.innerHeight'))
-        
+    
+    # Interact with the page elements to simulate user flow
+    # -> Use browser console or alternative method to corrupt local storage data for 'recentFiles_markdown'.
+    frame = context.pages[-1]
+    # Click '지금 시작하기' button to open editor and then attempt to corrupt local storage via console or script injection.
+    elem = await locators.find(frame, 'home.get-started')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Attempt to corrupt 'recentFiles_markdown' data in local storage using browser developer console or alternative method, then reload editor to test error handling.
-        frame = context.pages[-1]
-        # Click 'Login' button to see if login or user settings provide access to local storage or document management for corruption.
-        elem = frame.locator('xpath=html/body/div[3]/header/div/div[2]/nav/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Scroll down to find any input or console elements to inject script or find alternative ways to corrupt local storage.
+    await page.mouse.wheel(0, await page.evaluate('() => window.innerHeight'))
+    
 
-        # -> Attempt to load corrupted document in markdown editor by clicking on the corrupted document link or opening it.
-        frame = context.pages[-1]
-        # Click on the corrupted markdown document link titled '제목 없음' to attempt loading corrupted document.
-        elem = frame.locator('xpath=html/body/div[3]/main/section[6]/div/div/div/div[2]/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Attempt to corrupt 'recentFiles_markdown' data in local storage using browser developer console or alternative method, then reload editor to test error handling.
+    frame = context.pages[-1]
+    # Click 'Login' button to see if login or user settings provide access to local storage or document management for corruption.
+    elem = await locators.find(frame, 'header.login')
+    await waits.click(elem, timeout=5000)
+    
 
-        # -> Verify that the application remains stable and user can continue normal operations after loading corrupted document.
-        frame = context.pages[-1]
-        # Click '지금 시작하기' button to return to main editor interface and verify stability.
-        elem = frame.locator('xpath=html/body/div[3]/main/section/div/div/a/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+    # -> Attempt to load corrupted document in markdown editor by clicking on the corrupted document link or opening it.
+    frame = context.pages[-1]
+    # Click on the corrupted markdown document link titled '제목 없음' to attempt loading corrupted document.
+    elem = await locators.find(frame, 'home.recent.markdown')
+    await waits.click(elem, timeout=5000)
+    
 
-        # --> Assertions to verify final state
-        frame = context.pages[-1]
-        await expect(frame.locator('text=Welcome to Markdown Editor').first).to_be_visible(timeout=30000)
-        await expect(frame.locator('text=Start typing here...').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
+    # -> Verify that the application remains stable and user can continue normal operations after loading corrupted document.
+    frame = context.pages[-1]
+    # Click '지금 시작하기' button to return to main editor interface and verify stability.
+    elem = await locators.find(frame, 'home.get-started')
+    await waits.click(elem, timeout=5000)
     
-    finally:
-        if context:
-            await context.close()
-        if browser:
-            await browser.close()
-        if pw:
-            await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+    # --> Assertions to verify final state
+    frame = context.pages[-1]
+    await expect(frame.locator('text=Welcome to Markdown Editor').first).to_be_visible(timeout=30000)
+    await expect(frame.locator('text=Start typing here...').first).to_be_visible(timeout=30000)
+
+
+if __name__ == "__main__":
+    asyncio.run(run_standalone(run_test))
@@ -0,0 +1,19 @@
+"""Shared execution harness for the TestSprite TC scripts.
+
+Each ``TCxxx_*.py`` script exposes ``async def run_test(context)``. The harness
+owns the browser and hands every test a fresh ``BrowserContext``, so a full
+suite pays for one Chromium launch instead of one per test.
+
+Run the whole suite from ``testsprite_tests/``::
+
+    python -m harness --concurrency 4
+
+Tests that passed last time with unchanged inputs are skipped; use
+``--rerun-failed`` after a fix, ``--workers n`` to fan out over processes and
+``--shard i/n`` to split the suite across machines.
+
+Add ``--supabase-stub`` to serve the auth and ``documents`` endpoints from a
+local stand-in (see :mod:`harness.supabase_stub`) instead of the remote project.
+Textie's ``/api/chat`` replies are replayed from recorded streams by default
+(see :mod:`harness.chat_mock`); pass ``--chat live`` to call the real model.
+"""
@@ -0,0 +1,209 @@
+"""Offline stand-in for ``/api/chat`` that replays recorded Groq token streams.
+
+Fixtures in ``fixtures/chat/*.json`` hold the raw ``toDataStreamResponse``
+lines of a recorded reply (``f:`` message start, ``0:`` text parts, ``e:``/``d:``
+finish parts) plus ``match`` substrings. A request gets the first fixture, in
+file name order, whose ``match`` occurs in the last user message, else
+``default.json``.
+
+The runner routes each context's ``/api/chat`` requests to the mock, so the
+page sees the same URL and streaming protocol as with the real route. The mock
+records when every text part left the server, which lets a test separate the
+client's streaming render cost (:func:`render_lag`) from model latency, which
+the pacing replaces with a fixed profile.
+
+Record a new fixture from the live route with::
+
+    python -m harness.chat_mock record NAME "prompt" [--match WORD ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Sequence
+
+from playwright.async_api import BrowserContext, Page, Route
+
+from .stub_server import Request, Response, StubServer
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "chat"
+
+# (seconds before the first text part, seconds between text parts)
+PACINGS = {
+    "instant": (0.0, 0.0),
+    "realistic": (0.35, 0.025),  # roughly what kimi-k2 on Groq streams at
+    "slow": (1.5, 0.15),
+}
+
+_active: "ChatMock | None" = None
+
+
+def active() -> "ChatMock | None":
+    """The chat mock serving the current run, if any."""
+    return _active
+
+
+def _epoch_ms() -> float:
+    return time.time() * 1000
+
+
+@dataclass
+class Fixture:
+    name: str
+    stream: list[str]
+    match: list[str] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "".join(json.loads(line[2:]) for line in self.stream if line.startswith("0:"))
+
+
+def load_fixtures(directory: Path = FIXTURES_DIR) -> list[Fixture]:
+    fixtures = []
+    for path in sorted(directory.glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        fixtures.append(Fixture(path.stem, data["stream"], data.get("match", [])))
+    return fixtures
+
+
+def pick(fixtures: Sequence[Fixture], prompt: str) -> Fixture:
+    prompt = prompt.lower()
+    for fixture in fixtures:
+        if any(word.lower() in prompt for word in fixture.match):
+            return fixture
+    for fixture in fixtures:
+        if fixture.name == "default":
+            return fixture
+    raise LookupError(f"no chat fixture matches {prompt!r} and there is no default.json")
+
+
+@dataclass
+class StreamTiming:
+    """Epoch-millisecond timestamps of one replayed reply, as sent by the mock."""
+
+    test_id: str
+    fixture: str
+    requested_at: float
+    token_times: list[float] = field(default_factory=list)
+    finished_at: float | None = None
+
+    @property
+    def first_token_ms(self) -> float | None:
+        return self.token_times[0] - self.requested_at if self.token_times else None
+
+    @property
+    def last_token_at(self) -> float | None:
+        return self.token_times[-1] if self.token_times else None
+
+
+class ChatMock(StubServer):
+    def __init__(self, pacing: str = "instant", fixtures: list[Fixture] | None = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        super().__init__(host, port)
+        if pacing not in PACINGS:
+            raise ValueError(f"unknown pacing {pacing!r}; expected one of {', '.join(PACINGS)}")
+        self.pacing = pacing
+        self.fixtures = fixtures if fixtures is not None else load_fixtures()
+        self.timings: list[StreamTiming] = []
+        self.route("POST", "/api/chat", self._chat)
+
+    async def start(self) -> "ChatMock":
+        global _active
+        await super().start()
+        _active = self
+        return self
+
+    async def stop(self) -> None:
+        global _active
+        await super().stop()
+        if _active is self:
+            _active = None
+
+    async def install(self, context: BrowserContext, test_id: str = "") -> None:
+        """Send ``context``'s chat requests to the mock, tagged with ``test_id``."""
+        async def handle(route: Route) -> None:
+            headers = {**route.request.headers, "x-harness-test": test_id}
+            await route.continue_(url=f"{self.url}/api/chat", headers=headers)
+
+        await context.route("**/api/chat", handle)
+
+    def timings_for(self, test_id: str) -> list[StreamTiming]:
+        return [t for t in self.timings if t.test_id == test_id]
+
+    async def _chat(self, request: Request) -> Response:
+        body = request.json() or {}
+        user_messages = [m for m in body.get("messages", []) if m.get("role") == "user"]
+        prompt = user_messages[-1].get("content", "") if user_messages else ""
+        fixture = pick(self.fixtures, prompt if isinstance(prompt, str) else json.dumps(prompt))
+        timing = StreamTiming(request.headers.get("x-harness-test", ""), fixture.name, _epoch_ms())
+        self.timings.append(timing)
+        return Response(
+            200,
+            {"Content-Type": "text/plain; charset=utf-8", "X-Vercel-AI-Data-Stream": "v1"},
+            stream=self._replay(fixture, timing),
+        )
+
+    async def _replay(self, fixture: Fixture, timing: StreamTiming) -> AsyncIterator[bytes]:
+        first_delay, token_delay = PACINGS[self.pacing]
+        for line in fixture.stream:
+            if line.startswith("0:"):
+                delay = token_delay if timing.token_times else first_delay
+                if delay:
+                    await asyncio.sleep(delay)
+                timing.token_times.append(_epoch_ms())
+            yield (line + "\n").encode("utf-8")
+        timing.finished_at = _epoch_ms()
+
+
+async def render_lag(page: Page, text: str, timeout: float = 10000) -> float | None:
+    """Milliseconds between the mock sending the last part of a reply and ``text`` showing up.
+
+    Waits for ``text`` (a fragment of the fixture reply) to be visible, then
+    reads the page clock. Returns None when no mock stream has finished.
+    """
+    await page.get_by_text(text).first.wait_for(state="visible", timeout=timeout)
+    shown_at = await page.evaluate("Date.now()")
+    mock = active()
+    finished = [t.last_token_at for t in (mock.timings if mock else []) if t.last_token_at]
+    return shown_at - max(finished) if finished else None
+
+
+def record(name: str, prompt: str, match: Sequence[str], base_url: str) -> Path:
+    """Post ``prompt`` to the live /api/chat route and save its stream as a fixture."""
+    payload = json.dumps({"messages": [{"role": "user", "content": prompt}],
+                          "userProfile": {}, "currentContext": {}}).encode("utf-8")
+    request = urllib.request.Request(f"{base_url}/api/chat", payload,
+                                     {"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        lines = [line.rstrip("\n") for line in response.read().decode("utf-8").splitlines() if line]
+    path = FIXTURES_DIR / f"{name}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"match": list(match), "stream": lines}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    return path
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m harness.chat_mock")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rec = commands.add_parser("record", help="record a fixture from the running app")
+    rec.add_argument("name")
+    rec.add_argument("prompt")
+    rec.add_argument("--match", nargs="*", default=[])
+    rec.add_argument("--base-url", default="http://localhost:3000")
+    args = parser.parse_args(argv)
+
+    path = record(args.name, args.prompt, args.match, args.base_url)
+    print(f"saved {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+"""Named UI targets for the TC scripts.
+
+Scripts ask for ``locators.get(page, "textie.input")`` instead of spelling out
+absolute XPaths such as ``html/body/div[2]/div[3]/form/input``, which break
+whenever a portal or wrapper div is added above them. Most targets resolve to
+``data-testid`` attributes set in the components (Header, AuthButton,
+TextieChat, DocumentSidebar, EditorHeader, the login and landing pages); the
+rest use an accessible role and name, or CSS for editor internals.
+
+Names are looked up in a dict, and :func:`find` waits only
+:data:`FAIL_FAST_TIMEOUT_MS` for the element, so a missing target fails the
+test right away with the name, selector and URL instead of stalling until the
+suite timeout.
+"""
+
+from __future__ import annotations
+
+import difflib
+from dataclasses import dataclass
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import Locator, Page
+
+from . import waits
+
+FAIL_FAST_TIMEOUT_MS = 5000
+
+
+class LocatorNotFound(AssertionError):
+    pass
+
+
+@dataclass(frozen=True)
+class Target:
+    testid: str | None = None
+    role: str | None = None
+    name: str | None = None  # accessible name, matched exactly
+    css: str | None = None   # for third-party markup we cannot tag
+
+    def resolve(self, page: Page) -> Locator:
+        if self.testid:
+            return page.get_by_test_id(self.testid)
+        if self.css:
+            return page.locator(self.css)
+        return page.get_by_role(self.role, name=self.name, exact=True)
+
+    def describe(self) -> str:
+        if self.testid:
+            return f'[data-testid="{self.testid}"]'
+        if self.css:
+            return self.css
+        return f'role={self.role}[name="{self.name}"]'
+
+
+REGISTRY: dict[str, Target] = {
+    # Header
+    "header.home": Target("header-home"),
+    "header.nav.markdown": Target("header-nav-markdown"),
+    "header.nav.latex": Target("header-nav-latex"),
+    "header.nav.mermaid": Target("header-nav-mermaid"),
+    "header.nav.json-builder": Target("header-nav-json-builder"),
+    "header.nav.repository": Target("header-nav-repository"),
+    "header.export": Target("header-export"),
+    "header.language": Target("header-language-toggle"),
+    "header.theme": Target("header-theme-toggle"),
+    # AuthButton
+    "header.login": Target("auth-login"),
+    "header.logout": Target("auth-logout"),
+    "header.user": Target("auth-user"),
+    # /login
+    "login.email": Target("login-email"),
+    "login.password": Target("login-password"),
+    "login.submit": Target("login-submit"),
+    # Landing page
+    "home.get-started": Target("home-get-started"),
+    "home.get-started-bottom": Target("home-get-started-bottom"),
+    "home.recent.markdown": Target("recent-file-markdown"),
+    "home.recent.latex": Target("recent-file-latex"),
+    "home.recent.mermaid": Target("recent-file-mermaid"),
+    "home.image.markdown": Target(role="img", name="Markdown Editor"),
+    # TextieChat
+    "textie.open": Target("textie-open"),
+    "textie.close": Target("textie-close"),
+    "textie.history": Target("textie-history"),
+    "textie.new-chat": Target("textie-new-chat"),
+    "textie.input": Target("textie-input"),
+    "textie.send": Target("textie-send"),
+    # DocumentSidebar
+    "sidebar.new-doc": Target("sidebar-new-doc"),
+    "sidebar.collapse": Target("sidebar-collapse"),
+    "sidebar.doc": Target("sidebar-doc"),
+    "sidebar.load-more": Target("sidebar-load-more"),
+    # EditorHeader
+    "editor.title": Target("editor-title"),
+    "editor.title-input": Target("editor-title-input"),
+    # Milkdown toolbar
+    "markdown.bold": Target(role="button", name="B"),
+    "markdown.italic": Target(role="button", name="I"),
+    "markdown.code": Target(role="button", name="Code"),
+    "markdown.editor": Target(css=".milkdown .ProseMirror"),
+    # not-found page
+    "notfound.home": Target(role="link", name="Go Home"),
+}
+
+
+def target(name: str) -> Target:
+    try:
+        return REGISTRY[name]
+    except KeyError:
+        close = difflib.get_close_matches(name, REGISTRY, n=3)
+        hint = f"; did you mean {', '.join(close)}?" if close else ""
+        raise KeyError(f"no locator named {name!r}{hint}") from None
+
+
+def get(page: Page, name: str) -> Locator:
+    """Locator for a registered target (first match)."""
+    return target(name).resolve(page).first
+
+
+async def find(page: Page, name: str, timeout: float = FAIL_FAST_TIMEOUT_MS) -> Locator:
+    """Like :func:`get`, but wait for the element to be visible and fail fast if it is not."""
+    locator = get(page, name)
+    try:
+        await waits.actionable(locator, name, timeout)
+    except PlaywrightError as exc:
+        raise LocatorNotFound(
+            f"{name} ({target(name).describe()}) not visible on {page.url} "
+            f"after {timeout / 1000:.0f}s"
+        ) from exc
+    return locator
+
+
+async def click(page: Page, name: str, timeout: float = FAIL_FAST_TIMEOUT_MS) -> None:
+    await waits.click(await find(page, name, timeout), name, timeout=timeout)
+
+
+async def fill(page: Page, name: str, value: str, timeout: float = FAIL_FAST_TIMEOUT_MS) -> None:
+    await waits.fill(await find(page, name, timeout), value, name, timeout=timeout)
@@ -0,0 +1,266 @@
+"""Per-step performance traces and per-route budgets.
+
+An init script installed in every test context keeps PerformanceObserver
+totals (LCP, CLS, long tasks) and, for each client-side route, the time from
+entering it until its preview signal (:data:`waits.ROUTE_SIGNALS`) is in the
+DOM. After every wait helper the harness samples those values together with
+Navigation Timing and the CDP JS heap size into the running test's
+:class:`PerfTrace`. The runner writes all traces to ``tmp/perf_trace.json``
+and fails a test whose pages exceed :data:`ROUTE_BUDGETS`.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+from urllib.parse import urlparse
+
+from playwright.async_api import BrowserContext, CDPSession, Page
+from playwright.async_api import Error as PlaywrightError
+
+TMP_DIR = Path(__file__).resolve().parent.parent / "tmp"
+ARTIFACT_PATH = TMP_DIR / "perf_trace.json"
+
+
+@dataclass(frozen=True)
+class Budget:
+    """Upper bounds for one route; None leaves a metric unchecked."""
+
+    interactive_ms: float | None = None  # route entered -> preview signal attached
+    lcp_ms: float | None = 2500          # Web Vitals "good" thresholds
+    cls: float | None = 0.1
+    long_task_ms: float | None = None
+
+
+# Longest matching prefix wins; "/" covers every route without its own entry.
+ROUTE_BUDGETS = {
+    "/": Budget(),
+    "/latex": Budget(interactive_ms=2000),
+    "/markdown": Budget(interactive_ms=2500),
+    "/mermaid": Budget(interactive_ms=2500),
+}
+
+
+def budget_for(path: str) -> Budget:
+    matches = [p for p in ROUTE_BUDGETS if path == p or path.startswith(p.rstrip("/") + "/")]
+    return ROUTE_BUDGETS[max(matches, key=len)] if matches else Budget()
+
+
+def init_script(signals: dict[str, str]) -> str:
+    return """
+(() => {
+  if (window.__harnessPerf) return;
+  const signals = %s;
+  const perf = window.__harnessPerf = { lcp: null, cls: 0, longTasks: 0, longTaskMs: 0, routes: {} };
+  const observe = (type, onEntry) => {
+    try {
+      new PerformanceObserver((list) => list.getEntries().forEach(onEntry)).observe({ type, buffered: true });
+    } catch (e) { /* entry type not supported */ }
+  };
+  observe('largest-contentful-paint', (e) => {
+    perf.lcp = { time: e.startTime, url: e.url || null, element: e.element ? e.element.tagName.toLowerCase() : null };
+  });
+  observe('layout-shift', (e) => { if (!e.hadRecentInput) perf.cls += e.value; });
+  observe('longtask', (e) => { perf.longTasks += 1; perf.longTaskMs += e.duration; });
+
+  // Client-side navigations do not create a new document, so track routes ourselves.
+  const enter = () => {
+    const path = location.pathname;
+    if (!perf.routes[path]) perf.routes[path] = { start: performance.now(), interactive: null };
+    check();
+  };
+  const check = () => {
+    const path = location.pathname;
+    const route = perf.routes[path];
+    const prefix = Object.keys(signals).find((p) => path.startsWith(p));
+    if (route && prefix && route.interactive === null && document.querySelector(signals[prefix])) {
+      route.interactive = performance.now() - route.start;
+    }
+  };
+  for (const name of ['pushState', 'replaceState']) {
+    const original = history[name];
+    history[name] = function (...args) { const result = original.apply(this, args); enter(); return result; };
+  }
+  addEventListener('popstate', enter);
+  const start = () => {
+    perf.routes[location.pathname] = { start: 0, interactive: null };
+    new MutationObserver(check).observe(document.documentElement, { childList: true, subtree: true });
+    check();
+  };
+  if (document.documentElement) start(); else addEventListener('DOMContentLoaded', start);
+})();
+""" % json.dumps(signals)
+
+
+SAMPLE_JS = """
+() => {
+  const nav = performance.getEntriesByType('navigation')[0];
+  return {
+    url: location.href,
+    timeOrigin: performance.timeOrigin,
+    perf: window.__harnessPerf || null,
+    nav: nav ? {
+      ttfb: nav.responseStart,
+      domInteractive: nav.domInteractive,
+      domContentLoaded: nav.domContentLoadedEventEnd,
+      load: nav.loadEventEnd,
+      transferSize: nav.transferSize,
+    } : null,
+  };
+}
+"""
+
+
+@dataclass
+class Step:
+    label: str
+    kind: str
+    ok: bool
+    duration_ms: float
+    url: str
+    heap_used_mb: float | None
+    long_task_ms: float  # long-task time added since the previous step on this document
+
+
+@dataclass
+class DocumentVitals:
+    """Latest observed values for one loaded document (one ``performance.timeOrigin``)."""
+
+    url: str
+    navigation: dict | None = None
+    lcp: dict | None = None
+    cls: float = 0.0
+    long_tasks: int = 0
+    long_task_ms: float = 0.0
+    routes: dict[str, dict] = field(default_factory=dict)
+
+
+@dataclass
+class PerfTrace:
+    test_id: str
+    steps: list[Step] = field(default_factory=list)
+    documents: dict[str, DocumentVitals] = field(default_factory=dict)
+    _cdp: dict[Page, CDPSession] = field(default_factory=dict, repr=False)
+
+    def violations(self) -> list[str]:
+        found = []
+        for doc in self.documents.values():
+            path = urlparse(doc.url).path or "/"
+            budget = budget_for(path)
+            if budget.lcp_ms is not None and doc.lcp and doc.lcp["time"] > budget.lcp_ms:
+                found.append(f"{path} LCP {doc.lcp['time']:.0f}ms > {budget.lcp_ms:.0f}ms"
+                             f" ({doc.lcp.get('url') or doc.lcp.get('element')})")
+            if budget.cls is not None and doc.cls > budget.cls:
+                found.append(f"{path} CLS {doc.cls:.3f} > {budget.cls}")
+            if budget.long_task_ms is not None and doc.long_task_ms > budget.long_task_ms:
+                found.append(f"{path} long tasks {doc.long_task_ms:.0f}ms > {budget.long_task_ms:.0f}ms")
+            for route, timing in doc.routes.items():
+                limit = budget_for(route).interactive_ms
+                if limit is not None and timing.get("interactive") is not None \
+                        and timing["interactive"] > limit:
+                    found.append(f"{route} interactive {timing['interactive']:.0f}ms > {limit:.0f}ms")
+        return found
+
+    def to_json(self) -> dict:
+        return {
+            "test_id": self.test_id,
+            "steps": [asdict(s) for s in self.steps],
+            "documents": [asdict(d) for d in self.documents.values()],
+            "violations": self.violations(),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "PerfTrace":
+        """Rebuild a trace a worker process serialized with :meth:`to_json`."""
+        return cls(
+            data["test_id"],
+            [Step(**s) for s in data["steps"]],
+            {str(i): DocumentVitals(**d) for i, d in enumerate(data["documents"])},
+        )
+
+    async def _heap_used_mb(self, page: Page) -> float | None:
+        cdp = self._cdp.get(page)
+        if cdp is None:
+            cdp = self._cdp[page] = await page.context.new_cdp_session(page)
+            await cdp.send("Performance.enable")
+        metrics = (await cdp.send("Performance.getMetrics"))["metrics"]
+        used = next((m["value"] for m in metrics if m["name"] == "JSHeapUsedSize"), None)
+        return used / 2**20 if used is not None else None
+
+    async def sample(self, page: Page, label: str, kind: str, ok: bool, duration: float) -> None:
+        try:
+            data = await page.evaluate(SAMPLE_JS)
+            heap = await self._heap_used_mb(page)
+        except PlaywrightError:
+            # The page navigated or closed mid-sample; the next step will catch up.
+            return
+
+        doc = self.documents.setdefault(str(data["timeOrigin"]), DocumentVitals(data["url"]))
+        previous_long_task_ms = doc.long_task_ms
+        doc.navigation = data["nav"]
+        observed = data["perf"]
+        if observed:
+            doc.lcp = observed["lcp"]
+            doc.cls = observed["cls"]
+            doc.long_tasks = observed["longTasks"]
+            doc.long_task_ms = observed["longTaskMs"]
+            doc.routes = observed["routes"]
+        self.steps.append(Step(label, kind, ok, duration * 1000, data["url"], heap,
+                               doc.long_task_ms - previous_long_task_ms))
+
+
+_trace: ContextVar[PerfTrace | None] = ContextVar("perf_trace", default=None)
+
+
+def start_trace(test_id: str) -> PerfTrace:
+    """Bind a fresh trace to the current task and return it."""
+    trace = PerfTrace(test_id)
+    _trace.set(trace)
+    return trace
+
+
+def current_trace() -> PerfTrace | None:
+    return _trace.get()
+
+
+@contextmanager
+def paused() -> Iterator[None]:
+    """Keep steps taken inside the block (e.g. the shared login) out of the current trace."""
+    token = _trace.set(None)
+    try:
+        yield
+    finally:
+        _trace.reset(token)
+
+
+async def install(context: BrowserContext, signals: dict[str, str]) -> None:
+    await context.add_init_script(init_script(signals))
+
+
+async def sample(page: Page, label: str, kind: str, ok: bool, duration: float) -> None:
+    """Record a step in the running test's trace; a no-op outside the runner."""
+    trace = current_trace()
+    if trace is not None:
+        await trace.sample(page, label, kind, ok, duration)
+
+
+def write_artifact(traces: Iterable[PerfTrace], path: Path = ARTIFACT_PATH) -> Path:
+    """Write ``traces`` into the artifact, keeping entries of tests this run did not execute."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            tests = json.load(f)["tests"]
+    except (OSError, ValueError, KeyError):
+        tests = {}
+    tests.update((t.test_id, t.to_json()) for t in traces)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "tests": dict(sorted(tests.items())),
+        }, f, indent=2)
+    return path
@@ -0,0 +1,109 @@
+"""Saved outcomes of harness runs, used to skip unchanged tests and rerun failures.
+
+Each test's record carries a hash of everything that can change its outcome:
+the script itself, the harness (code and fixtures), the login config, and the
+app build (``.next/BUILD_ID``, or the ``src/`` tree when running ``next dev``,
+which writes no build id). A test that passed with the same hash is skipped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Mapping
+
+HARNESS_DIR = Path(__file__).resolve().parent
+TESTS_DIR = HARNESS_DIR.parent
+APP_DIR = TESTS_DIR.parent
+TMP_DIR = TESTS_DIR / "tmp"
+RESULTS_PATH = TMP_DIR / "harness_results.json"
+# Written by TestSprite itself: one record per test with "title": "TC001-...".
+TESTSPRITE_RESULTS_PATH = TMP_DIR / "test_results.json"
+
+
+@dataclass
+class Record:
+    test_id: str
+    status: str
+    duration: float
+    error: str
+    input_hash: str
+    finished_at: str
+
+
+def _hash_files(digest, paths: Iterable[Path], root: Path) -> None:
+    for path in sorted(paths):
+        digest.update(str(path.relative_to(root)).encode("utf-8"))
+        digest.update(path.read_bytes())
+
+
+def build_id(app_dir: Path = APP_DIR) -> str:
+    try:
+        return (app_dir / ".next" / "BUILD_ID").read_text(encoding="utf-8").strip()
+    except OSError:
+        digest = hashlib.sha256()
+        _hash_files(digest, (p for p in (app_dir / "src").rglob("*") if p.is_file()), app_dir)
+        return "src-" + digest.hexdigest()
+
+
+def harness_hash() -> str:
+    digest = hashlib.sha256()
+    _hash_files(digest, [*HARNESS_DIR.rglob("*.py"), *HARNESS_DIR.rglob("*.json")], HARNESS_DIR)
+    config = TMP_DIR / "config.json"
+    if config.exists():
+        digest.update(config.read_bytes())
+    return digest.hexdigest()
+
+
+def input_hash(script: Path, build: str, harness: str) -> str:
+    digest = hashlib.sha256(script.read_bytes())
+    digest.update(build.encode("utf-8"))
+    digest.update(harness.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def load_records(path: Path = RESULTS_PATH) -> dict[str, Record]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {r["test_id"]: Record(**r) for r in json.load(f)}
+    except (OSError, ValueError, TypeError):
+        return {}
+
+
+def save_records(records: Iterable[Record], path: Path = RESULTS_PATH) -> Path:
+    """Merge ``records`` into the file, so shards run separately add up."""
+    merged = load_records(path)
+    merged.update((r.test_id, r) for r in records)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump([asdict(r) for _, r in sorted(merged.items())], f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def failed_ids(path: Path = RESULTS_PATH, testsprite_path: Path = TESTSPRITE_RESULTS_PATH) -> set[str]:
+    """Ids that failed last time; falls back to TestSprite's report before our first run."""
+    records = load_records(path)
+    if records:
+        return {r.test_id for r in records.values() if r.status != "PASSED"}
+    try:
+        with open(testsprite_path, encoding="utf-8") as f:
+            return {r["title"].split("-", 1)[0] for r in json.load(f) if r.get("testStatus") != "PASSED"}
+    except (OSError, ValueError, KeyError):
+        return set()
+
+
+def unchanged_passes(hashes: Mapping[str, str], path: Path = RESULTS_PATH) -> set[str]:
+    """Ids whose last run passed with the same input hash."""
+    records = load_records(path)
+    return {tid for tid, h in hashes.items()
+            if tid in records and records[tid].status == "PASSED" and records[tid].input_hash == h}
+
+
+def now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S%z")
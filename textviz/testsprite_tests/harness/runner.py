@@ -0,0 +1,388 @@
+"""Run TC scripts concurrently against a single shared Chromium instance.
+
+Tests that passed last time with unchanged inputs are skipped (see
+:mod:`harness.results`); ``--shard i/n`` runs one slice of the suite and
+``--workers n`` spreads it over n processes, each with its own Chromium.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Awaitable, Callable, Iterable, Sequence
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+from . import chat_mock, perf, results, session, supabase_stub, waits
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+BASE_URL = "http://localhost:3000"
+
+# Same flags the generated scripts used, minus ``--single-process``: a
+# single-process Chromium cannot host several live contexts reliably.
+BROWSER_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--ipc=host",
+]
+DEFAULT_TIMEOUT_MS = 5000
+DEFAULT_TEST_TIMEOUT_S = 300.0
+
+RunTest = Callable[[BrowserContext], Awaitable[None]]
+
+
+@dataclass
+class TestResult:
+    test_id: str
+    path: Path
+    status: str  # "PASSED" | "FAILED"
+    duration: float
+    error: str = ""
+    wait_log: waits.WaitLog = field(default_factory=waits.WaitLog)
+    trace: perf.PerfTrace | None = None
+
+    @property
+    def passed(self) -> bool:
+        return self.status == "PASSED"
+
+    def to_json(self) -> dict:
+        return {
+            "test_id": self.test_id,
+            "path": str(self.path),
+            "status": self.status,
+            "duration": self.duration,
+            "error": self.error,
+            "wait_log": self.wait_log.to_json(),
+            "trace": self.trace.to_json() if self.trace else None,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "TestResult":
+        return cls(
+            data["test_id"], Path(data["path"]), data["status"], data["duration"], data["error"],
+            waits.WaitLog([waits.WaitRecord(**r) for r in data["wait_log"]]),
+            perf.PerfTrace.from_json(data["trace"]) if data["trace"] else None,
+        )
+
+
+def test_id(path: Path) -> str:
+    """``TC003_Markdown_Editor_...py`` -> ``TC003``."""
+    return path.stem.split("_", 1)[0]
+
+
+def discover_tests(selectors: Iterable[str] = ()) -> list[Path]:
+    """Return TC scripts in id order, optionally filtered by id or name fragment."""
+    paths = sorted(TESTS_DIR.glob("TC*.py"))
+    selectors = [s.lower() for s in selectors]
+    if not selectors:
+        return paths
+    return [p for p in paths if any(s in p.stem.lower() for s in selectors)]
+
+
+def parse_shard(spec: str) -> tuple[int, int]:
+    """``"2/4"`` -> ``(2, 4)``."""
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/n, got {spec!r}") from None
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {spec} out of range")
+    return index, count
+
+
+def shard(paths: Sequence[Path], index: int, count: int) -> list[Path]:
+    """Round-robin slice ``index`` (1-based) of ``count``, so slow TCs do not pile up in one shard."""
+    return list(paths[index - 1::count])
+
+
+def load_test(path: Path) -> ModuleType:
+    """Import a TC script without running it and return the module."""
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load test script {path}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not hasattr(module, "run_test"):
+        raise ImportError(f"{path.name} does not define run_test(context)")
+    return module
+
+
+async def launch_browser(pw: Playwright, headless: bool = True) -> Browser:
+    return await pw.chromium.launch(headless=headless, args=BROWSER_ARGS)
+
+
+async def new_context(browser: Browser, **kwargs) -> BrowserContext:
+    """Create an isolated context with the suite-wide default action timeout and perf probes."""
+    context = await browser.new_context(**kwargs)
+    context.set_default_timeout(DEFAULT_TIMEOUT_MS)
+    await perf.install(context, waits.ROUTE_SIGNALS)
+    return context
+
+
+async def context_options(browser: Browser, module: ModuleType) -> dict:
+    """``new_context`` keyword arguments a test module asks for through its flags."""
+    options = {}
+    if getattr(module, "REQUIRES_AUTH", False):
+        options["storage_state"] = await session.storage_state(browser)
+    return options
+
+
+async def run_one(
+    browser: Browser,
+    path: Path,
+    semaphore: asyncio.Semaphore,
+    timeout: float = DEFAULT_TEST_TIMEOUT_S,
+    chat: chat_mock.ChatMock | None = None,
+    budgets: bool = True,
+) -> TestResult:
+    async with semaphore:
+        # Each gather() task runs in its own copy of the context, so this log
+        # and trace only ever see the waits of this test.
+        log = waits.start_log()
+        trace = perf.start_trace(test_id(path))
+        start = time.perf_counter()
+        context = None
+        status, error = "PASSED", ""
+        try:
+            module = load_test(path)
+            context = await new_context(browser, **await context_options(browser, module))
+            if chat:
+                await chat.install(context, test_id(path))
+            await asyncio.wait_for(module.run_test(context), timeout)
+            violations = trace.violations()
+            if budgets and violations:
+                status, error = "FAILED", "Performance budget exceeded: " + "; ".join(violations)
+        except asyncio.TimeoutError:
+            status, error = "FAILED", f"Test execution timed out after {timeout:.0f}s"
+        except Exception as exc:
+            status = "FAILED"
+            error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+        finally:
+            if context:
+                await context.close()
+        return TestResult(test_id(path), path, status, time.perf_counter() - start, error, log, trace)
+
+
+async def run_suite(
+    paths: Sequence[Path],
+    concurrency: int = 4,
+    headless: bool = True,
+    timeout: float = DEFAULT_TEST_TIMEOUT_S,
+    stub_port: int | None = None,
+    chat_pacing: str = "instant",
+    budgets: bool = True,
+) -> list[TestResult]:
+    """Launch Chromium once and run ``paths`` with at most ``concurrency`` live contexts.
+
+    With ``stub_port`` the Supabase stand-in is served on that port for the
+    duration of the run, seeded with the login user from ``tmp/config.json``.
+    ``/api/chat`` is answered by the replaying mock at ``chat_pacing`` unless
+    that is ``"live"``. With ``budgets`` off, perf traces are recorded but
+    never fail a test.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    stub = chat = None
+    try:
+        if stub_port is not None:
+            stub = await start_stub(stub_port)
+        if chat_pacing != "live":
+            chat = await chat_mock.ChatMock(chat_pacing).start()
+        async with async_playwright() as pw:
+            browser = await launch_browser(pw, headless=headless)
+            try:
+                return list(await asyncio.gather(
+                    *(run_one(browser, path, semaphore, timeout, chat, budgets) for path in paths)
+                ))
+            finally:
+                await browser.close()
+    finally:
+        if stub:
+            await stub.stop()
+        if chat:
+            await chat.stop()
+
+
+async def start_stub(port: int) -> supabase_stub.SupabaseStub:
+    """Serve the Supabase stand-in on ``port``, seeded with the login user from ``tmp/config.json``."""
+    stub = await supabase_stub.SupabaseStub(port=port).start()
+    config = session.load_config()
+    stub.add_user(config["loginUser"], config["loginPassword"])
+    print(f"Supabase stub on {stub.url} (start the app with NEXT_PUBLIC_SUPABASE_URL={stub.url}"
+          f" SUPABASE_JWT_SECRET={supabase_stub.JWT_SECRET})")
+    return stub
+
+
+async def run_workers(
+    paths: Sequence[Path],
+    workers: int,
+    worker_args: Sequence[str],
+    stub_port: int | None = None,
+) -> list[TestResult]:
+    """Spread ``paths`` round-robin over ``workers`` ``python -m harness`` processes.
+
+    The parent hosts the Supabase stub, if any, and refreshes the shared login
+    before spawning, so workers neither fight over the stub port nor race to
+    rewrite the storage-state file.
+    """
+    chunks = [chunk for chunk in (list(paths[i::workers]) for i in range(workers)) if chunk]
+    env = dict(os.environ)
+    stub = None
+    try:
+        if stub_port is not None:
+            stub = await start_stub(stub_port)
+            env[supabase_stub.EXTERNAL_STUB_ENV] = stub.url
+        if any(getattr(load_test(p), "REQUIRES_AUTH", False) for p in paths):
+            async with async_playwright() as pw:
+                browser = await launch_browser(pw)
+                try:
+                    await session.storage_state(browser)
+                finally:
+                    await browser.close()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            outputs = [Path(tmp) / f"worker-{i}.json" for i in range(len(chunks))]
+            procs = [
+                await asyncio.create_subprocess_exec(
+                    sys.executable, "-m", "harness", *map(test_id, chunk),
+                    "--worker-output", str(output), *worker_args,
+                    cwd=TESTS_DIR, env=env, stdout=asyncio.subprocess.DEVNULL,
+                )
+                for chunk, output in zip(chunks, outputs)
+            ]
+            await asyncio.gather(*(proc.wait() for proc in procs))
+
+            collected = []
+            for chunk, output, proc in zip(chunks, outputs, procs):
+                try:
+                    collected += [TestResult.from_json(r) for r in json.loads(output.read_text("utf-8"))]
+                except (OSError, ValueError):
+                    collected += [TestResult(test_id(p), p, "FAILED", 0.0,
+                                             f"worker exited with code {proc.returncode} before reporting")
+                                  for p in chunk]
+    finally:
+        if stub:
+            await stub.stop()
+    return sorted(collected, key=lambda r: r.test_id)
+
+
+async def run_standalone(run_test: RunTest, headless: bool = True) -> None:
+    """Entry point used by ``python TCxxx_*.py``: one browser, one context, one test."""
+    module = sys.modules[run_test.__module__]
+    async with chat_mock.ChatMock() as chat, async_playwright() as pw:
+        browser = await launch_browser(pw, headless=headless)
+        try:
+            context = await new_context(browser, **await context_options(browser, module))
+            await chat.install(context, test_id(Path(module.__file__)))
+            trace = perf.start_trace(test_id(Path(module.__file__)))
+            try:
+                await run_test(context)
+            finally:
+                await context.close()
+            violations = trace.violations()
+            if violations:
+                raise AssertionError("Performance budget exceeded: " + "; ".join(violations))
+        finally:
+            await browser.close()
+
+
+def print_summary(results: Sequence[TestResult], wall_time: float, cached: Sequence[str] = ()) -> None:
+    if cached:
+        print(f"CACHED {', '.join(cached)} (passed last time, inputs unchanged)")
+    for result in results:
+        print(f"{result.status:<6} {result.test_id} {result.duration:6.1f}s "
+              f"(waiting {result.wait_log.total:5.1f}s)  {result.path.name}")
+        if result.error:
+            print(f"       {result.error.splitlines()[0]}")
+    passed = sum(r.passed for r in results)
+    print(f"\n{passed}/{len(results)} passed in {wall_time:.1f}s wall time")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m harness", description=__doc__)
+    parser.add_argument("tests", nargs="*", help="test ids or name fragments (default: all)")
+    parser.add_argument("-j", "--concurrency", type=int, default=4,
+                        help="number of browser contexts running at once (default: 4)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TEST_TIMEOUT_S,
+                        help="per-test timeout in seconds (default: %(default)s)")
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--supabase-stub", type=int, nargs="?", const=supabase_stub.DEFAULT_PORT,
+                        metavar="PORT", dest="stub_port",
+                        help="serve a local Supabase stand-in during the run "
+                             f"(default port: {supabase_stub.DEFAULT_PORT})")
+    parser.add_argument("--chat", choices=[*chat_mock.PACINGS, "live"], default="instant",
+                        help="token pacing of the replayed /api/chat streams, or 'live' "
+                             "to call the real model (default: %(default)s)")
+    parser.add_argument("--no-budgets", dest="budgets", action="store_false",
+                        help="record perf traces without failing tests on budget overruns")
+    parser.add_argument("--shard", type=parse_shard, metavar="I/N",
+                        help="run only the I-th of N round-robin slices of the selected tests")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="number of worker processes, each with its own browser (default: 1)")
+    parser.add_argument("--rerun-failed", action="store_true",
+                        help="run only tests that failed last time (falls back to tmp/test_results.json)")
+    parser.add_argument("--no-cache", dest="cache", action="store_false",
+                        help="run tests even if they passed last time with unchanged inputs")
+    parser.add_argument("--worker-output", type=Path, help=argparse.SUPPRESS)
+    return parser
+
+
+def worker_args(args: argparse.Namespace) -> list[str]:
+    """Options a parent passes on to its workers; selection and caching stay with the parent."""
+    forwarded = ["--concurrency", str(args.concurrency), "--timeout", str(args.timeout),
+                 "--chat", args.chat, "--no-cache"]
+    if args.headed:
+        forwarded.append("--headed")
+    if not args.budgets:
+        forwarded.append("--no-budgets")
+    return forwarded
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    paths = discover_tests(args.tests)
+    if args.shard:
+        paths = shard(paths, *args.shard)
+    if args.rerun_failed:
+        failed = results.failed_ids()
+        paths = [p for p in paths if test_id(p) in failed]
+    if not paths:
+        print("no tests matched")
+        return 0 if args.rerun_failed else 1
+
+    build, harness = results.build_id(), results.harness_hash()
+    hashes = {test_id(p): results.input_hash(p, build, harness) for p in paths}
+    cached = sorted(results.unchanged_passes(hashes)) if args.cache else []
+    paths = [p for p in paths if test_id(p) not in cached]
+
+    start = time.perf_counter()
+    if not paths:
+        outcome = []
+    elif args.workers > 1 and not args.worker_output:
+        outcome = asyncio.run(run_workers(paths, args.workers, worker_args(args), args.stub_port))
+    else:
+        outcome = asyncio.run(run_suite(paths, args.concurrency, not args.headed, args.timeout,
+                                         args.stub_port, args.chat, args.budgets))
+    exit_code = 0 if all(r.passed for r in outcome) else 1
+
+    if args.worker_output:
+        args.worker_output.write_text(json.dumps([r.to_json() for r in outcome]), "utf-8")
+        return exit_code
+
+    print_summary(outcome, time.perf_counter() - start, cached)
+    results.save_records(
+        results.Record(r.test_id, r.status, r.duration, r.error, hashes[r.test_id], results.now())
+        for r in outcome
+    )
+    if outcome:
+        print(f"perf traces: {perf.write_artifact(r.trace for r in outcome if r.trace)}")
+    return exit_code
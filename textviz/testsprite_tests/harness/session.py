@@ -0,0 +1,119 @@
+"""Log in once per suite run and share the Supabase session as Playwright storage state.
+
+Tests that set ``REQUIRES_AUTH = True`` get a context created from the cached
+state instead of driving the login form themselves. The state file is reused
+across runs until the session stored in the Supabase auth cookie expires.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import time
+from pathlib import Path
+
+from playwright.async_api import Browser
+
+from . import locators, perf, supabase_stub, waits
+
+TMP_DIR = Path(__file__).resolve().parent.parent / "tmp"
+CONFIG_PATH = TMP_DIR / "config.json"
+STATE_PATH = TMP_DIR / "storage_state.json"
+# Sessions issued by the local stand-in are signed with a different key and
+# live under a different cookie name, so they are cached separately.
+STUB_STATE_PATH = TMP_DIR / "storage_state.stub.json"
+
+# Refresh a little before the access token actually expires so a test that
+# starts right at the boundary does not get bounced to /login halfway through.
+EXPIRY_MARGIN_S = 60
+
+_lock = asyncio.Lock()
+
+
+def load_config(path: Path = CONFIG_PATH) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _auth_cookies(state: dict) -> list[dict]:
+    """Supabase auth cookies (``sb-<ref>-auth-token`` plus ``.0``/``.1`` chunks), in chunk order."""
+    cookies = [c for c in state.get("cookies", []) if c["name"].startswith("sb-")
+               and "-auth-token" in c["name"] and not c["name"].endswith("-code-verifier")]
+    return sorted(cookies, key=lambda c: c["name"])
+
+
+def session_expiry(state: dict) -> float | None:
+    """Return the session's ``expires_at`` (epoch seconds), or None when there is no session."""
+    cookies = _auth_cookies(state)
+    if not cookies:
+        return None
+
+    raw = "".join(c["value"] for c in cookies)
+    if raw.startswith("base64-"):
+        encoded = raw[len("base64-"):]
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)).decode("utf-8")
+        except ValueError:
+            raw = ""
+    try:
+        expires_at = json.loads(raw).get("expires_at")
+    except (ValueError, AttributeError):
+        expires_at = None
+    if expires_at:
+        return float(expires_at)
+
+    # Undecodable value: fall back to the cookie's own lifetime (-1 = session cookie).
+    lifetimes = [c.get("expires", -1) for c in cookies]
+    return min(lifetimes) if all(e > 0 for e in lifetimes) else None
+
+
+def is_fresh(state: dict, now: float | None = None) -> bool:
+    expires_at = session_expiry(state)
+    now = time.time() if now is None else now
+    return expires_at is not None and expires_at - EXPIRY_MARGIN_S > now
+
+
+def read_state(path: Path = STATE_PATH) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+async def login(browser: Browser, path: Path = STATE_PATH) -> dict:
+    """Drive the /login page once and save the resulting storage state to ``path``."""
+    config = load_config()
+    context = await browser.new_context()
+    try:
+        page = await context.new_page()
+        await page.goto(f"{config['localEndpoint']}/login")
+        await locators.fill(page, "login.email", config["loginUser"])
+        await locators.fill(page, "login.password", config["loginPassword"])
+        await locators.click(page, "login.submit")
+        async with waits.timed("login redirect", "signal"):
+            await page.wait_for_url(lambda url: "/login" not in url)
+
+        state = await context.storage_state(path=str(path))
+        if not _auth_cookies(state):
+            raise RuntimeError(f"login as {config['loginUser']} did not produce a Supabase auth cookie")
+        return state
+    finally:
+        await context.close()
+
+
+async def storage_state(browser: Browser, path: Path | None = None) -> str:
+    """Path of a storage-state file holding a live session, logging in only when needed.
+
+    Concurrent callers share a single login: the first one through the lock
+    refreshes the file, the rest find it fresh.
+    """
+    if path is None:
+        path = STUB_STATE_PATH if supabase_stub.in_use() else STATE_PATH
+    async with _lock:
+        state = read_state(path)
+        if state is None or not is_fresh(state):
+            with perf.paused():
+                await login(browser, path)
+    return str(path)
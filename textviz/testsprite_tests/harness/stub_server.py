@@ -0,0 +1,217 @@
+"""Minimal in-process asyncio HTTP/1.1 server for backend stand-ins.
+
+Only what the app's clients actually send is supported: fixed-length request
+bodies, keep-alive, CORS preflights, and either fixed or chunked (streamed)
+responses. Handlers are plain coroutines registered per method and path.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable
+from urllib.parse import parse_qs, urlsplit
+
+REASONS = {
+    200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 401: "Unauthorized",
+    403: "Forbidden", 404: "Not Found", 406: "Not Acceptable", 409: "Conflict",
+    500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: dict[str, list[str]]
+    headers: dict[str, str]
+    body: bytes = b""
+
+    def json(self):
+        return json.loads(self.body or b"null")
+
+    def param(self, name: str, default: str | None = None) -> str | None:
+        values = self.query.get(name)
+        return values[0] if values else default
+
+
+@dataclass
+class Response:
+    status: int = 200
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+    # When set, the body is sent with chunked transfer encoding as the
+    # iterator yields, which lets handlers pace a streamed response.
+    stream: AsyncIterator[bytes] | None = None
+
+    @classmethod
+    def json(cls, data, status: int = 200, headers: dict[str, str] | None = None) -> "Response":
+        return cls(status, {"Content-Type": "application/json", **(headers or {})},
+                   json.dumps(data).encode("utf-8"))
+
+
+Handler = Callable[[Request], Awaitable[Response]]
+
+
+@dataclass
+class Fault:
+    """Replace or delay responses for requests whose path starts with ``path``."""
+
+    path: str
+    method: str | None = None
+    status: int | None = None
+    delay: float = 0.0
+    times: int | None = None  # None: apply to every matching request
+    body: dict = field(default_factory=lambda: {"message": "injected fault"})
+
+    def matches(self, request: Request) -> bool:
+        if self.times is not None and self.times <= 0:
+            return False
+        return request.path.startswith(self.path) and self.method in (None, request.method)
+
+
+@dataclass
+class Hit:
+    method: str
+    path: str
+    status: int
+    duration: float
+
+
+class StubServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.routes: list[tuple[str, str, Handler]] = []
+        self.faults: list[Fault] = []
+        self.hits: list[Hit] = []
+        self._server: asyncio.AbstractServer | None = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def route(self, method: str, path: str, handler: Handler) -> None:
+        """Register ``handler`` for ``method`` on ``path`` (exact match, or prefix when ending in ``*``)."""
+        self.routes.append((method, path, handler))
+
+    def inject(self, path: str, **kwargs) -> Fault:
+        fault = Fault(path, **kwargs)
+        self.faults.append(fault)
+        return fault
+
+    def clear_faults(self) -> None:
+        self.faults.clear()
+
+    async def start(self) -> "StubServer":
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "StubServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    def _find(self, request: Request) -> Handler | None:
+        for method, path, handler in self.routes:
+            if method != request.method:
+                continue
+            if path == request.path or (path.endswith("*") and request.path.startswith(path[:-1])):
+                return handler
+        return None
+
+    async def dispatch(self, request: Request) -> Response:
+        if request.method == "OPTIONS":
+            return Response(204)
+
+        for fault in self.faults:
+            if fault.matches(request):
+                if fault.times is not None:
+                    fault.times -= 1
+                if fault.delay:
+                    await asyncio.sleep(fault.delay)
+                if fault.status is not None:
+                    return Response.json(fault.body, fault.status)
+                break
+
+        handler = self._find(request)
+        if handler is None:
+            return Response.json({"message": f"no stub for {request.method} {request.path}"}, 404)
+        return await handler(request)
+
+    def _cors(self, request: Request) -> dict[str, str]:
+        return {
+            "Access-Control-Allow-Origin": request.headers.get("origin", "*"),
+            "Access-Control-Allow-Credentials": "true",
+            "Access-Control-Allow-Methods": "GET, POST, PATCH, PUT, DELETE, OPTIONS",
+            "Access-Control-Allow-Headers": request.headers.get("access-control-request-headers", "*"),
+            "Access-Control-Expose-Headers": "Content-Range, X-Vercel-AI-Data-Stream",
+        }
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Request | None:
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+        headers: dict[str, str] = {}
+        while True:
+            raw = await reader.readline()
+            if raw in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = raw.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", 0))
+        body = await reader.readexactly(length) if length else b""
+        parts = urlsplit(target)
+        return Request(method.upper(), parts.path, parse_qs(parts.query, keep_blank_values=True),
+                       headers, body)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                start = time.perf_counter()
+                response = await self.dispatch(request)
+                await self._write(writer, request, response)
+                self.hits.append(Hit(request.method, request.path, response.status,
+                                     time.perf_counter() - start))
+                if request.headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _write(self, writer: asyncio.StreamWriter, request: Request, response: Response) -> None:
+        headers = {**self._cors(request), **response.headers}
+        if response.stream is not None:
+            headers["Transfer-Encoding"] = "chunked"
+        else:
+            headers["Content-Length"] = str(len(response.body))
+        head = f"HTTP/1.1 {response.status} {REASONS.get(response.status, 'Unknown')}\r\n"
+        head += "".join(f"{k}: {v}\r\n" for k, v in headers.items()) + "\r\n"
+        writer.write(head.encode("latin-1"))
+
+        if response.stream is None:
+            writer.write(response.body)
+            await writer.drain()
+            return
+
+        async for chunk in response.stream:
+            if chunk:
+                writer.write(f"{len(chunk):X}\r\n".encode("ascii") + chunk + b"\r\n")
+                await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
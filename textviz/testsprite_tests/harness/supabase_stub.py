@@ -0,0 +1,445 @@
+"""In-process stand-in for the Supabase auth and PostgREST endpoints the app uses.
+
+Covers what ``@supabase/ssr`` and ``useDocumentStore`` actually call:
+
+* ``POST /auth/v1/token`` (``grant_type=password`` and ``refresh_token``),
+  ``GET /auth/v1/user``, ``POST /auth/v1/logout``, ``POST /auth/v1/signup``
+* ``GET /auth/v1/.well-known/jwks.json``, empty like a project that signs
+  with a shared HS256 secret
+* ``/rest/v1/documents`` with ``select``, ``order``, ``limit``/``offset``, the
+  ``eq``/``neq``/``lt``/``lte``/``gt``/``gte``/``in``/``is`` filters and
+  ``or``/``and`` trees of them, ``Prefer: return=representation``, upserts
+  (``resolution=merge-duplicates`` or ``ignore-duplicates``) and ``.single()``
+* ``POST /rest/v1/rpc/search_documents``, a plain prefix-match version of the
+  Postgres full-text search function
+
+Rows are scoped to the caller's ``sub`` like the real row-level security
+policy. Start the Next.js app with ``NEXT_PUBLIC_SUPABASE_URL`` pointing at
+:attr:`SupabaseStub.url` (any non-empty ``NEXT_PUBLIC_SUPABASE_ANON_KEY``
+works) and every backend round trip stays on loopback. With
+``SUPABASE_JWT_SECRET`` set to :data:`JWT_SECRET` the middleware verifies
+access tokens itself; without it, it falls back to ``GET /auth/v1/user``.
+Faults injected with :meth:`StubServer.inject` apply to the whole run;
+:meth:`SupabaseStub.fault` scopes one to a single browser context so
+concurrent tests are unaffected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import time
+import uuid
+from datetime import datetime, timezone
+
+from playwright.async_api import BrowserContext, Route
+
+from .stub_server import Request, Response, StubServer
+
+DEFAULT_PORT = 54321  # same port as `supabase start`, so existing .env.local files need no edit
+JWT_SECRET = "textviz-harness-stub-secret-at-least-32-chars"
+ACCESS_TOKEN_TTL_S = 3600
+
+# Set for worker processes when the parent runner hosts the stub for them.
+EXTERNAL_STUB_ENV = "HARNESS_SUPABASE_STUB"
+
+_active: "SupabaseStub | None" = None
+
+
+def active() -> "SupabaseStub | None":
+    """The stub started by the runner for this suite, if any."""
+    return _active
+
+
+def in_use() -> bool:
+    """Whether the app under test talks to a stub, in this process or the parent runner."""
+    return _active is not None or bool(os.environ.get(EXTERNAL_STUB_ENV))
+
+
+def _now() -> str:
+    # Same shape as the client's Date.toISOString(), so timestamps order as strings.
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def sign_jwt(claims: dict, secret: str = JWT_SECRET) -> str:
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}).encode())
+    payload = _b64url(json.dumps(claims).encode())
+    signature = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+    return f"{header}.{payload}.{_b64url(signature)}"
+
+
+def verify_jwt(token: str, secret: str = JWT_SECRET) -> dict | None:
+    """Claims of a valid, unexpired HS256 token, else None."""
+    try:
+        header, payload, signature = token.split(".")
+        expected = hmac.new(secret.encode(), f"{header}.{payload}".encode(), hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64url_decode(signature)):
+            return None
+        claims = json.loads(_b64url_decode(payload))
+    except ValueError:
+        return None
+    return claims if claims.get("exp", 0) > time.time() else None
+
+
+def _auth_error(status: int, code: str, msg: str) -> Response:
+    # GoTrue's current error shape; supabase-js maps error_code onto AuthApiError.code.
+    return Response.json({"code": status, "error_code": code, "msg": msg}, status)
+
+
+def _rest_error(status: int, code: str, message: str) -> Response:
+    return Response.json({"code": code, "details": None, "hint": None, "message": message}, status)
+
+
+def _as_text(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _match(row: dict, column: str, expr: str) -> bool:
+    op, _, operand = expr.partition(".")
+    value = row.get(column)
+    if op == "is":
+        return _as_text(value) == operand
+    if op == "in":
+        return _as_text(value) in [v.strip().strip('"') for v in operand.strip("()").split(",")]
+    if value is None:
+        return False
+    left = _as_text(value)
+    if op == "eq":
+        return left == operand
+    if op == "neq":
+        return left != operand
+    # ISO timestamps of the same shape compare correctly as strings.
+    if op == "lt":
+        return left < operand
+    if op == "lte":
+        return left <= operand
+    if op == "gt":
+        return left > operand
+    if op == "gte":
+        return left >= operand
+    raise ValueError(f"unsupported filter operator {op!r}")
+
+
+def _split_terms(expr: str) -> list[str]:
+    """Split a logic-tree operand on top-level commas, respecting parentheses and quotes."""
+    terms, depth, quoted, start = [], 0, False, 0
+    for i, ch in enumerate(expr):
+        if ch == '"':
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            terms.append(expr[start:i])
+            start = i + 1
+    terms.append(expr[start:])
+    return [t.strip() for t in terms if t.strip()]
+
+
+def _match_tree(row: dict, combinator: str, operand: str) -> bool:
+    """``or=(a.eq.1,and(b.lt.2,c.gt.3))``, as sent by keyset pagination."""
+    results = []
+    for term in _split_terms(operand.strip()[1:-1]):
+        if term.startswith(("and(", "or(")):
+            name, _, rest = term.partition("(")
+            results.append(_match_tree(row, name, "(" + rest))
+        else:
+            column, _, expr = term.partition(".")
+            op, _, value = expr.partition(".")
+            results.append(_match(row, column, f"{op}.{value.strip(chr(34))}"))
+    return any(results) if combinator == "or" else all(results)
+
+
+class SupabaseStub(StubServer):
+    RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+        super().__init__(host, port)
+        self.users: dict[str, dict] = {}          # email -> user record (with password)
+        self.refresh_tokens: dict[str, str] = {}  # refresh token -> email
+        self.revoked: set[str] = set()            # session ids ended by /logout
+        self.documents: dict[str, dict] = {}
+
+        self.route("POST", "/auth/v1/token", self._token)
+        self.route("GET", "/auth/v1/user", self._user)
+        self.route("POST", "/auth/v1/logout", self._logout)
+        self.route("POST", "/auth/v1/signup", self._signup)
+        self.route("GET", "/auth/v1/.well-known/jwks.json", self._jwks)
+        for method in ("GET", "HEAD", "POST", "PATCH", "DELETE"):
+            self.route(method, "/rest/v1/documents", self._documents)
+        self.route("POST", "/rest/v1/rpc/search_documents", self._search)
+
+    async def start(self) -> "SupabaseStub":
+        global _active
+        await super().start()
+        _active = self
+        return self
+
+    async def stop(self) -> None:
+        global _active
+        await super().stop()
+        if _active is self:
+            _active = None
+
+    # -- seeding -----------------------------------------------------------
+
+    def add_user(self, email: str, password: str) -> dict:
+        now = _now()
+        user = {
+            "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"textviz-stub:{email}")),
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": email,
+            "email_confirmed_at": now,
+            "app_metadata": {"provider": "email", "providers": ["email"]},
+            "user_metadata": {},
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.users[email] = {**user, "password": password}
+        return user
+
+    def add_document(self, user_id: str, **fields) -> dict:
+        now = _now()
+        row = {"id": str(uuid.uuid4()), "user_id": user_id, "title": "Untitled", "content": "",
+               "type": "markdown", "created_at": now, "updated_at": now, **fields}
+        self.documents[row["id"]] = row
+        return row
+
+    def user_id(self, email: str) -> str:
+        return self.users[email]["id"]
+
+    # -- per-context faults --------------------------------------------------
+
+    async def fault(self, context: BrowserContext, path: str, method: str | None = None,
+                    status: int | None = None, delay: float = 0.0, times: int | None = None) -> None:
+        """Delay or fail browser requests to ``path`` made from ``context`` only."""
+        remaining = [times]
+
+        async def handle(route: Route) -> None:
+            request = route.request
+            if method not in (None, request.method) or remaining[0] == 0 or request.method == "OPTIONS":
+                await route.continue_()
+                return
+            if remaining[0] is not None:
+                remaining[0] -= 1
+            if delay:
+                await asyncio.sleep(delay)
+            if status is None:
+                await route.continue_()
+            else:
+                await route.fulfill(status=status, json={"message": "injected fault"},
+                                    headers={"Access-Control-Allow-Origin": "*"})
+
+        await context.route(f"{self.url}{path}**", handle)
+
+    # -- auth ----------------------------------------------------------------
+
+    def _public_user(self, email: str) -> dict:
+        return {k: v for k, v in self.users[email].items() if k != "password"}
+
+    def _session(self, email: str) -> dict:
+        user = self._public_user(email)
+        now = int(time.time())
+        claims = {
+            "sub": user["id"], "email": email, "aud": "authenticated", "role": "authenticated",
+            "iat": now, "exp": now + ACCESS_TOKEN_TTL_S, "session_id": str(uuid.uuid4()),
+        }
+        refresh_token = secrets.token_urlsafe(24)
+        self.refresh_tokens[refresh_token] = email
+        return {
+            "access_token": sign_jwt(claims),
+            "token_type": "bearer",
+            "expires_in": ACCESS_TOKEN_TTL_S,
+            "expires_at": claims["exp"],
+            "refresh_token": refresh_token,
+            "user": user,
+        }
+
+    def _claims(self, request: Request) -> dict | None:
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer":
+            return None
+        claims = verify_jwt(token)
+        if claims is None or claims.get("session_id") in self.revoked:
+            return None
+        return claims
+
+    async def _token(self, request: Request) -> Response:
+        body = request.json() or {}
+        grant = request.param("grant_type")
+        if grant == "password":
+            user = self.users.get(body.get("email", ""))
+            if user is None or user["password"] != body.get("password"):
+                return _auth_error(400, "invalid_credentials", "Invalid login credentials")
+            return Response.json(self._session(user["email"]))
+        if grant == "refresh_token":
+            # Refresh tokens are single use, as in GoTrue.
+            email = self.refresh_tokens.pop(body.get("refresh_token", ""), None)
+            if email is None:
+                return _auth_error(400, "refresh_token_not_found", "Invalid Refresh Token: Refresh Token Not Found")
+            return Response.json(self._session(email))
+        return _auth_error(400, "validation_failed", f"unsupported grant_type {grant!r}")
+
+    async def _user(self, request: Request) -> Response:
+        claims = self._claims(request)
+        if claims is None or claims.get("email") not in self.users:
+            return _auth_error(401, "bad_jwt", "invalid JWT: unable to parse or verify signature")
+        return Response.json(self._public_user(claims["email"]))
+
+    async def _jwks(self, request: Request) -> Response:
+        return Response.json({"keys": []})  # Tokens are HS256; there are no public keys
+
+    async def _logout(self, request: Request) -> Response:
+        claims = self._claims(request)
+        if claims is not None:
+            self.revoked.add(claims["session_id"])
+        return Response(204)
+
+    async def _signup(self, request: Request) -> Response:
+        body = request.json() or {}
+        email, password = body.get("email", ""), body.get("password", "")
+        if email in self.users:
+            return _auth_error(422, "user_already_exists", "User already registered")
+        if len(password) < 6:
+            return _auth_error(422, "weak_password", "Password should be at least 6 characters.")
+        self.add_user(email, password)
+        # Behaves like a project with email confirmation turned off.
+        return Response.json(self._session(email))
+
+    # -- PostgREST -----------------------------------------------------------
+
+    def _filtered(self, request: Request, user_id: str) -> list[dict]:
+        rows = [r for r in self.documents.values() if r.get("user_id") == user_id]
+        for column, values in request.query.items():
+            if column in self.RESERVED_PARAMS:
+                continue
+            for expr in values:
+                if column in ("or", "and"):
+                    rows = [r for r in rows if _match_tree(r, column, expr)]
+                else:
+                    rows = [r for r in rows if _match(r, column, expr)]
+        return rows
+
+    def _shape(self, request: Request, rows: list[dict]) -> Response:
+        """Apply order, paging, ``select`` and the ``Prefer``/``Accept`` headers to ``rows``."""
+        for term in reversed((request.param("order") or "").split(",")):
+            if not term:
+                continue
+            column, *mods = term.split(".")
+            rows.sort(key=lambda r: (r.get(column) is None, _as_text(r.get(column))),
+                      reverse="desc" in mods)
+        offset = int(request.param("offset") or 0)
+        limit = request.param("limit")
+        rows = rows[offset:offset + int(limit) if limit else None]
+
+        select = request.param("select") or "*"
+        if select != "*":
+            columns = [c.strip() for c in select.split(",")]
+            rows = [{c: r.get(c) for c in columns} for r in rows]
+
+        if "vnd.pgrst.object" in request.headers.get("accept", ""):
+            if len(rows) != 1:
+                return _rest_error(406, "PGRST116", "JSON object requested, multiple (or no) rows returned")
+            return Response.json(rows[0])
+        return Response.json(rows, headers={"Content-Range": f"{offset}-{offset + len(rows) - 1}/*"})
+
+    async def _search(self, request: Request) -> Response:
+        """``search_documents``: every query word must prefix a word of the title or content."""
+        claims = self._claims(request)
+        if claims is None:
+            return Response.json([])
+        body = request.json() or {}
+        words = re.findall(r"\w+", body.get("query", "").lower())
+        hits = []
+        for row in self.documents.values():
+            if row.get("user_id") != claims["sub"]:
+                continue
+            text = f"{row.get('title', '')} {row.get('content', '')}"
+            tokens = re.findall(r"\w+", text.lower())
+            if words and all(any(t.startswith(w) for t in tokens) for w in words):
+                rank = sum(t.startswith(w) for t in tokens for w in words) / len(tokens)
+                snippet = " ".join(f"\ue000{t}\ue001" if any(t.startswith(w) for w in words) else t
+                                   for t in tokens[:30])
+                hits.append({**{k: v for k, v in row.items() if k != "content"},
+                             "rank": rank, "snippet": snippet})
+        hits.sort(key=lambda h: (-h["rank"], h["updated_at"]))
+        return Response.json(hits[:int(body.get("max_results", 50))])
+
+    async def _documents(self, request: Request) -> Response:
+        claims = self._claims(request)
+        if claims is None:
+            # Anonymous requests see nothing under the row-level security policy.
+            return Response.json([]) if request.method in ("GET", "HEAD") else \
+                _rest_error(401, "42501", "new row violates row-level security policy")
+        user_id = claims["sub"]
+        prefer = request.headers.get("prefer", "")
+        representation = "return=representation" in prefer
+
+        try:
+            if request.method in ("GET", "HEAD"):
+                return self._shape(request, self._filtered(request, user_id))
+
+            if request.method == "POST":
+                body = request.json()
+                merge = "resolution=merge-duplicates" in prefer
+                ignore = "resolution=ignore-duplicates" in prefer
+                written = []
+                for item in body if isinstance(body, list) else [body]:
+                    if item.get("user_id", user_id) != user_id:
+                        return _rest_error(403, "42501", "new row violates row-level security policy")
+                    existing = self.documents.get(item.get("id", ""))
+                    if existing is not None and ignore:
+                        continue
+                    if existing is not None and not merge:
+                        return _rest_error(409, "23505", "duplicate key value violates unique constraint")
+                    if existing is not None:
+                        # The row is someone else's: the upsert's UPDATE cannot see it under
+                        # row-level security, which Postgres reports as a policy violation.
+                        if existing.get("user_id") != user_id:
+                            return _rest_error(403, "42501", "new row violates row-level security policy")
+                        existing.update(item)
+                        written.append(existing)
+                    else:
+                        written.append(self.add_document(user_id, **item))
+                if not representation:
+                    return Response(201)
+                request.query.pop("order", None)
+                response = self._shape(request, written)
+                response.status = 201 if response.status == 200 else response.status
+                return response
+
+            rows = self._filtered(request, user_id)
+            if request.method == "PATCH":
+                changes = request.json() or {}
+                if changes.get("user_id", user_id) != user_id:
+                    return _rest_error(403, "42501", "new row violates row-level security policy")
+                for row in rows:
+                    row.update(changes)
+            else:  # DELETE
+                for row in rows:
+                    del self.documents[row["id"]]
+            return self._shape(request, rows) if representation else Response(204)
+        except ValueError as exc:
+            return _rest_error(400, "PGRST100", str(exc))
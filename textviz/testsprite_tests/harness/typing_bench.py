@@ -0,0 +1,230 @@
+"""Keystroke-to-paint latency benchmark for the editor routes.
+
+For every route and document size the benchmark seeds one document through
+the local Supabase stand-in, opens the route with the cached login session,
+puts the caret at the end of the document and types ``--keystrokes``
+characters one at a time. An init script timestamps each ``keydown`` and
+posts a message from the next ``requestAnimationFrame`` callback, which runs
+right after that frame is painted; the difference is the keystroke-to-paint
+latency, covering the editor's change handler, ``updateDocument`` and the
+re-render of the page and preview.
+
+Results go to ``tmp/typing_bench.json``. ``--save-baseline`` stores them as
+``benchmarks/typing_baseline.json``; later runs are compared against it and
+exit non-zero when a case's p95 regresses by more than ``--tolerance``.
+
+Start the app with ``NEXT_PUBLIC_SUPABASE_URL`` pointing at the stub (port
+54321 by default), then run from ``testsprite_tests/``::
+
+    python -m harness.typing_bench --routes latex --sizes 100KB
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Sequence
+
+from playwright.async_api import Browser, async_playwright
+
+from . import runner, session, supabase_stub, waits
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+RESULTS_PATH = TESTS_DIR / "tmp" / "typing_bench.json"
+BASELINE_PATH = TESTS_DIR / "benchmarks" / "typing_baseline.json"
+
+SIZES = {"1KB": 1024, "100KB": 100 * 1024, "1MB": 1024 * 1024}
+# route -> (document type, element that takes the caret)
+ROUTES = {
+    "markdown": ("markdown", ".milkdown .ProseMirror"),
+    "latex": ("latex", ".monaco-editor .view-lines"),
+    "mermaid": ("mermaid", ".monaco-editor .view-lines"),
+}
+TYPED_TEXT = "the quick brown fox jumps over the lazy dog "
+WARMUP_KEYSTROKES = 5
+# Differences below this are frame-timing noise, whatever the percentage.
+NOISE_FLOOR_MS = 2.0
+
+PAINT_PROBE = """
+(() => {
+  const samples = window.__typingSamples = [];
+  addEventListener('keydown', (event) => {
+    const start = event.timeStamp;
+    requestAnimationFrame(() => {
+      const channel = new MessageChannel();
+      channel.port1.onmessage = () => samples.push(performance.now() - start);
+      channel.port2.postMessage(null);
+    });
+  }, true);
+})();
+"""
+
+
+def synthetic_document(doc_type: str, size: int) -> str:
+    """A document of ``size`` bytes built from blocks the route's renderer handles."""
+    if doc_type == "latex":
+        block = ("\\section{{Section {n}}}\n\nInline $a_{n}^2 + b_{n}^2 = c_{n}^2$ and display:\n"
+                 "$$ \\sum_{{k=1}}^{{{n}}} \\frac{{1}}{{k^2}} \\le \\frac{{\\pi^2}}{{6}} $$\n\n")
+    elif doc_type == "mermaid":
+        block = "  N{n}[Step {n}] --> N{m}\n"
+    else:
+        block = ("## Heading {n}\n\nParagraph {n} with **bold**, *italic* and `code` text "
+                 "that wraps over a reasonably long line of prose.\n\n- item {n}\n- item {m}\n\n")
+    parts = ["graph TD\n"] if doc_type == "mermaid" else []
+    length = sum(len(p) for p in parts)
+    n = 0
+    while length < size:
+        n += 1
+        part = block.format(n=n, m=n + 1)
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)[:size]
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+@dataclass
+class CaseResult:
+    samples: int
+    mean: float
+    p50: float
+    p90: float
+    p95: float
+    p99: float
+    max: float
+
+    @classmethod
+    def from_samples(cls, samples: Sequence[float]) -> "CaseResult":
+        return cls(len(samples), sum(samples) / len(samples), percentile(samples, 50),
+                   percentile(samples, 90), percentile(samples, 95), percentile(samples, 99),
+                   max(samples))
+
+
+async def measure(browser: Browser, stub: supabase_stub.SupabaseStub, user_id: str, route: str,
+                  size: int, keystrokes: int, base_url: str) -> CaseResult:
+    doc_type, editor = ROUTES[route]
+    stub.documents.clear()
+    stub.add_document(user_id, type=doc_type, title=f"typing-bench-{size}",
+                      content=synthetic_document(doc_type, size))
+
+    context = await browser.new_context(storage_state=await session.storage_state(browser))
+    context.set_default_timeout(60000)  # 1 MB documents take a while to lay out
+    try:
+        await context.add_init_script(PAINT_PROBE)
+        page = await context.new_page()
+        await page.goto(f"{base_url}/{route}")
+        await waits.network_idle(page)
+        await page.locator(editor).first.click()
+        await page.keyboard.press("Control+End")
+
+        total = WARMUP_KEYSTROKES + keystrokes
+        for i in range(total):
+            await page.keyboard.type(TYPED_TEXT[i % len(TYPED_TEXT)])
+            # One keystroke in flight at a time, like a person typing steadily.
+            await page.wait_for_function("n => window.__typingSamples.length >= n", arg=i + 1)
+        samples = await page.evaluate("window.__typingSamples")
+    finally:
+        await context.close()
+    return CaseResult.from_samples(samples[WARMUP_KEYSTROKES:])
+
+
+def compare(results: dict[str, CaseResult], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    regressions = []
+    for case, result in results.items():
+        before = baseline.get(case)
+        if before is None:
+            continue
+        limit = max(before["p95"] * (1 + tolerance), before["p95"] + NOISE_FLOOR_MS)
+        if result.p95 > limit:
+            regressions.append(f"{case}: p95 {result.p95:.1f}ms vs baseline {before['p95']:.1f}ms")
+    return regressions
+
+
+def read_baseline(path: Path = BASELINE_PATH) -> dict[str, dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["cases"]
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def write_results(results: dict[str, CaseResult], keystrokes: int, path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "keystrokes": keystrokes,
+            "cases": {case: asdict(r) for case, r in results.items()},
+        }, f, indent=2)
+        f.write("\n")
+    return path
+
+
+async def run_bench(routes: Sequence[str], sizes: Sequence[str], keystrokes: int,
+                    headless: bool = True, stub_port: int = supabase_stub.DEFAULT_PORT,
+                    base_url: str = runner.BASE_URL) -> dict[str, CaseResult]:
+    config = session.load_config()
+    results = {}
+    async with supabase_stub.SupabaseStub(port=stub_port) as stub, async_playwright() as pw:
+        user_id = stub.add_user(config["loginUser"], config["loginPassword"])["id"]
+        browser = await runner.launch_browser(pw, headless=headless)
+        try:
+            for route in routes:
+                for size in sizes:
+                    case = f"{route}/{size}"
+                    results[case] = await measure(browser, stub, user_id, route, SIZES[size],
+                                                  keystrokes, base_url)
+                    r = results[case]
+                    print(f"{case:<16} p50 {r.p50:6.1f}ms  p95 {r.p95:6.1f}ms  "
+                          f"p99 {r.p99:6.1f}ms  max {r.max:6.1f}ms")
+        finally:
+            await browser.close()
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m harness.typing_bench",
+                                     description="Keystroke-to-paint latency of the editors.")
+    parser.add_argument("--routes", nargs="+", choices=list(ROUTES), default=list(ROUTES))
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--keystrokes", type=int, default=60,
+                        help="measured keystrokes per case, after warm-up (default: %(default)s)")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative p95 increase over the baseline (default: %(default)s)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"store this run as {BASELINE_PATH.relative_to(TESTS_DIR)}")
+    parser.add_argument("--stub-port", type=int, default=supabase_stub.DEFAULT_PORT)
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    results = asyncio.run(run_bench(args.routes, args.sizes, args.keystrokes,
+                                    not args.headed, args.stub_port))
+    print(f"results: {write_results(results, args.keystrokes, RESULTS_PATH)}")
+    if args.save_baseline:
+        print(f"baseline: {write_results(results, args.keystrokes, BASELINE_PATH)}")
+        return 0
+
+    baseline = read_baseline()
+    if not baseline:
+        print("no baseline to compare against; rerun with --save-baseline to create one")
+        return 0
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
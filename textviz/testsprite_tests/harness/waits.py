@@ -0,0 +1,150 @@
+"""Condition-based waits that replace the fixed sleeps in the generated scripts.
+
+Every helper waits for a real readiness signal (actionability, network idle,
+or an app-specific DOM marker) and records how long the wait actually took in
+the :class:`WaitLog` of the running test. The runner gives each test its own
+log through a context variable, so concurrent tests never mix records. When a
+page is known, each wait is also a step in the test's performance trace.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator
+from urllib.parse import urlparse
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import Locator, Page
+
+from . import perf
+
+DEFAULT_SETTLE_TIMEOUT_MS = 10000
+
+# DOM markers that mean "the editor preview has finished rendering".
+ROUTE_SIGNALS = {
+    "/mermaid": "#mermaid-preview svg",
+    "/latex": "#latex-preview .katex",
+    "/markdown": ".milkdown .ProseMirror",
+}
+
+
+@dataclass
+class WaitRecord:
+    label: str
+    kind: str
+    duration: float
+    ok: bool = True
+
+
+@dataclass
+class WaitLog:
+    records: list[WaitRecord] = field(default_factory=list)
+
+    @property
+    def total(self) -> float:
+        return sum(r.duration for r in self.records)
+
+    def slowest(self, n: int = 5) -> list[WaitRecord]:
+        return sorted(self.records, key=lambda r: r.duration, reverse=True)[:n]
+
+    def to_json(self) -> list[dict]:
+        return [asdict(r) for r in self.records]
+
+
+_log: ContextVar[WaitLog | None] = ContextVar("wait_log", default=None)
+
+
+def start_log() -> WaitLog:
+    """Bind a fresh log to the current task and return it."""
+    log = WaitLog()
+    _log.set(log)
+    return log
+
+
+def current_log() -> WaitLog:
+    log = _log.get()
+    return log if log is not None else start_log()
+
+
+@asynccontextmanager
+async def timed(label: str, kind: str, page: Page | None = None) -> AsyncIterator[WaitRecord]:
+    """Time the enclosed block and append it to the current log, even on failure.
+
+    With ``page`` the block is also sampled as a step of the running perf trace.
+    """
+    record = WaitRecord(label, kind, 0.0)
+    start = time.perf_counter()
+    try:
+        yield record
+    except BaseException:
+        record.ok = False
+        raise
+    finally:
+        record.duration = time.perf_counter() - start
+        current_log().records.append(record)
+        if page is not None:
+            await perf.sample(page, label, kind, record.ok, record.duration)
+
+
+def _describe(locator: Locator) -> str:
+    return getattr(locator, "_selector", None) or repr(locator)
+
+
+async def click(locator: Locator, label: str | None = None, **kwargs) -> None:
+    """Click once the element is actionable (attached, visible, stable, enabled)."""
+    async with timed(label or _describe(locator), "click", locator.page):
+        await locator.click(**kwargs)
+
+
+async def fill(locator: Locator, value: str, label: str | None = None, **kwargs) -> None:
+    """Fill once the element is an editable, visible input."""
+    async with timed(label or _describe(locator), "fill", locator.page):
+        await locator.fill(value, **kwargs)
+
+
+async def actionable(locator: Locator, label: str | None = None, timeout: float | None = None) -> None:
+    async with timed(label or _describe(locator), "visible", locator.page):
+        await locator.wait_for(state="visible", timeout=timeout)
+
+
+async def network_idle(page: Page, timeout: float = DEFAULT_SETTLE_TIMEOUT_MS) -> bool:
+    """Wait for no network activity for 500 ms. Returns False on timeout instead of raising."""
+    async with timed(page.url, "networkidle", page) as record:
+        try:
+            await page.wait_for_load_state("networkidle", timeout=timeout)
+        except PlaywrightError:
+            record.ok = False
+    return record.ok
+
+
+async def selector(page: Page, css: str, label: str | None = None,
+                   timeout: float = DEFAULT_SETTLE_TIMEOUT_MS) -> bool:
+    """Wait for an app-specific marker to be attached. Returns False on timeout."""
+    async with timed(label or css, "signal", page) as record:
+        try:
+            await page.wait_for_selector(css, state="attached", timeout=timeout)
+        except PlaywrightError:
+            record.ok = False
+    return record.ok
+
+
+async def mermaid_rendered(page: Page, timeout: float = DEFAULT_SETTLE_TIMEOUT_MS) -> bool:
+    return await selector(page, ROUTE_SIGNALS["/mermaid"], "mermaid svg", timeout)
+
+
+async def katex_rendered(page: Page, timeout: float = DEFAULT_SETTLE_TIMEOUT_MS) -> bool:
+    return await selector(page, ROUTE_SIGNALS["/latex"], "katex nodes", timeout)
+
+
+async def settle(page: Page, timeout: float = DEFAULT_SETTLE_TIMEOUT_MS) -> bool:
+    """Wait for network idle, then for the preview signal of the current route, if any."""
+    ok = await network_idle(page, timeout)
+    path = urlparse(page.url).path
+    for prefix, css in ROUTE_SIGNALS.items():
+        if path.startswith(prefix):
+            ok = await selector(page, css, f"{prefix} preview", timeout) and ok
+            break
+    return ok